@@ -0,0 +1,827 @@
+"""
+Benchmark suite untuk Aplikasi Manajemen Skripsi.
+
+Membuat database thesis_management.db sintetis di beberapa skala (10^2 - 10^6 baris),
+file skripsi PDF/DOCX sintetis, serta server HTTP lokal pengganti API Groq dan WhatsApp
+sehingga seluruh pengukuran berjalan tanpa jaringan.
+
+Contoh:
+    python benchmark.py --scales 100,1000,10000 --output bench_results.json
+    python benchmark.py --compare bench_results_lama.json --output bench_results.json
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import finalAI
+import server
+
+DEFAULT_SCALES = [100, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 5
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_REGRESSION_THRESHOLD = 1.25  # 25% lebih lambat dianggap regresi
+PDF_MAX_ROWS = 100_000  # render PDF di atas skala ini memakan waktu menit
+THESIS_PAGES = [20, 100]
+ATTACHMENT_MB = [8, 64]  # ukuran file lampiran sintetis (PDF anotasi dosen)
+SERVER_ROWS = 1_000  # ukuran database untuk uji beban server API
+SERVER_THESIS_PAGES = 20
+# Campuran request per klien uji beban: (jenis, bobot)
+SERVER_REQUEST_MIX = [("chapters", 3), ("progress", 3), ("consultations", 2), ("add_consultation", 1), ("chat", 1)]
+
+LECTURERS = ["Dr. Budi", "Dr. Sari", "Prof. Andi", "Dr. Rina", "Dr. Wahyu", "Dr. Lestari"]
+REVISION_NOTES = [
+    "Perbaiki rumusan masalah.",
+    "Tambahkan referensi terbaru.",
+    "Lengkapi diagram alur.",
+    "Perjelas hasil pengujian.",
+    "Konsistenkan format sitasi.",
+    "Ringkas latar belakang.",
+]
+THESIS_WORDS = (
+    "penelitian sistem informasi metode data analisis hasil pengujian pengguna aplikasi "
+    "model evaluasi akurasi implementasi perancangan kebutuhan basis teori kerangka "
+    "responden kuesioner variabel signifikan regresi algoritma klasifikasi dataset"
+).split()
+THESIS_CHAPTERS = [
+    ("BAB I", "PENDAHULUAN"),
+    ("BAB II", "TINJAUAN PUSTAKA"),
+    ("BAB III", "METODOLOGI PENELITIAN"),
+    ("BAB IV", "HASIL DAN PEMBAHASAN"),
+    ("BAB V", "KESIMPULAN DAN SARAN"),
+]
+CITATION_AUTHORS = ["Sutanto", "Pratama", "Wijaya", "Nugroho", "Santoso", "Hidayat", "Kurniawan", "Saputra"]
+
+GROQ_STUB_PATH = "/openai/v1/chat/completions"
+WA_STUB_PATH = "/api/whatsapp"
+WA_DOC_STUB_PATH = "/api/whatsapp/document"
+
+
+# --- Server HTTP lokal pengganti Groq dan WhatsApp ---
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Handler pengganti endpoint WA dan Groq (format OpenAI chat completions)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        with stub.lock:
+            stub.hits[self.path] = stub.hits.get(self.path, 0) + 1
+            hit = stub.hits[self.path]
+
+        if self.path.startswith(GROQ_STUB_PATH):
+            if stub.rate_limit_every and hit % stub.rate_limit_every == 0:
+                with stub.lock:
+                    stub.rate_limited += 1
+                self._send_json(429, {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                                {"retry-after": str(stub.retry_after)})
+                return
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError:
+                request = {}
+            prompt_chars = sum(len(m.get("content") or "") for m in request.get("messages", []))
+            usage = {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(stub.reply) // 4,
+                "total_tokens": prompt_chars // 4 + len(stub.reply) // 4,
+            }
+            if request.get("stream"):
+                self._send_stream(hit, stub.reply, usage)
+                return
+            self._send_json(200, {
+                "id": f"chatcmpl-bench-{hit}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": finalAI.GROQ_MODEL,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": stub.reply},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+        elif self.path.startswith(WA_STUB_PATH):
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, hit, reply, usage):
+        # Format streaming OpenAI/Groq: server-sent events per kata, diakhiri [DONE]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = reply.split(" ")
+        for idx, word in enumerate(words):
+            last = idx == len(words) - 1
+            chunk = {
+                "id": f"chatcmpl-bench-{hit}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": finalAI.GROQ_MODEL,
+                "choices": [{"index": 0, "delta": {"content": word if last else word + " "},
+                             "finish_reason": "stop" if last else None}],
+            }
+            if last:
+                chunk["x_groq"] = {"id": f"req-bench-{hit}", "usage": usage}
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # backlog bawaan (5) memicu retransmisi SYN saat uji paralel
+
+
+class StubServer:
+    """Server lokal di thread terpisah; `url` dipakai sebagai base URL pengganti."""
+
+    def __init__(self, latency_ms=0, reply="Jawaban AI sintetis untuk benchmark.",
+                 rate_limit_every=0, retry_after=1):
+        self.latency = latency_ms / 1000.0
+        self.reply = reply
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.hits = {}
+        self.rate_limited = 0
+        self.lock = threading.Lock()
+        self.httpd = _StubHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.httpd.stub = self
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def point_app_to_stub(stub):
+    """Arahkan konstanta endpoint finalAI ke server lokal."""
+    finalAI.WA_API_URL = stub.url + WA_STUB_PATH
+    finalAI.WA_API_DOC_URL = stub.url + WA_DOC_STUB_PATH
+    finalAI.GROQ_API_KEY = "bench-key"
+    os.environ["GROQ_BASE_URL"] = stub.url
+    # Client Groq terikat ke base URL saat dibuat; kuota dibuat longgar agar yang diukur adalah throughput
+    finalAI._ai_scheduler = finalAI.AIScheduler(requests_per_minute=10 ** 6, tokens_per_minute=10 ** 12,
+                                                workers=finalAI.AI_SCHEDULER_WORKERS)
+
+
+# --- Data sintetis ---
+
+class AppStub(finalAI.ThesisDatabase):
+    """Pengganti ThesisApp tanpa jendela Tk: operasi data yang sama (ThesisDatabase) untuk jalur yang diukur."""
+
+    def __init__(self, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        super().__init__(conn)
+
+
+def generate_database(db_path, rows, notify_ratio, seed=0):
+    """
+    Membuat database sintetis: `rows` konsultasi dan `rows` revisi,
+    serta max(5, rows // 10) bab. Sebagian kecil bab (notify_ratio) jatuh tempo
+    H-3 atau sudah lewat sehingga check_chapter_deadlines mengirim notifikasi.
+    """
+    rng = random.Random(seed)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    app = AppStub(db_path)
+    app.create_tables()
+    # Buang data dummy bawaan agar jumlah baris sesuai skala
+    app.cursor.execute("DELETE FROM chapters")
+    app.conn.commit()
+
+    today = date.today()
+    n_chapters = max(5, rows // 10)
+    n_notify = int(n_chapters * notify_ratio)
+    chapters = []
+    for i in range(n_chapters):
+        if i < n_notify:
+            target = today + timedelta(days=3 if i % 2 == 0 else -rng.randint(1, 30))
+            status = "Belum Selesai"
+        else:
+            target = today + timedelta(days=rng.randint(4, 365))
+            status = "Selesai" if rng.random() < 0.5 else "Belum Selesai"
+        chapters.append((f"Bab {i + 1} {rng.choice(THESIS_WORDS).title()}", target.isoformat(), status))
+    app.cursor.executemany(
+        "INSERT INTO chapters (chapter_name, target_date, status) VALUES (?, ?, ?)", chapters
+    )
+    app.cursor.execute("SELECT MIN(id), MAX(id) FROM chapters")
+    first_id, last_id = app.cursor.fetchone()
+
+    start = today - timedelta(days=3 * 365)
+    app.cursor.executemany(
+        "INSERT INTO consultations (date, lecturer, chapter_id) VALUES (?, ?, ?)",
+        ((
+            (start + timedelta(days=rng.randint(0, 3 * 365))).isoformat(),
+            rng.choice(LECTURERS),
+            rng.randint(first_id, last_id),
+        ) for _ in range(rows))
+    )
+    app.cursor.executemany(
+        "INSERT INTO revisions (notes, date, chapter_id) VALUES (?, ?, ?)",
+        ((
+            f"{rng.choice(REVISION_NOTES)} {' '.join(rng.choices(THESIS_WORDS, k=6))}",
+            (start + timedelta(days=rng.randint(0, 3 * 365))).isoformat(),
+            rng.randint(first_id, last_id),
+        ) for _ in range(rows))
+    )
+    app.conn.commit()
+    return app
+
+
+def generate_thesis_text(pages, seed=0):
+    """Teks skripsi sintetis dengan heading BAB, sitasi (Penulis, Tahun) dan Daftar Pustaka."""
+    rng = random.Random(seed)
+    words_per_page = 350
+    pages_per_chapter = max(1, pages // len(THESIS_CHAPTERS))
+    references = sorted({(a, rng.randint(2010, 2024)) for a in CITATION_AUTHORS})
+    parts = []
+    for bab, title in THESIS_CHAPTERS:
+        parts.append(f"{bab}\n{title}\n")
+        for _ in range(pages_per_chapter * words_per_page // 70):
+            sentence = " ".join(rng.choices(THESIS_WORDS, k=70))
+            author, year = rng.choice(references)
+            parts.append(f"{sentence.capitalize()} ({author}, {year}).\n")
+    parts.append("DAFTAR PUSTAKA\n")
+    for author, year in references:
+        parts.append(f"{author}, A. ({year}). {' '.join(rng.choices(THESIS_WORDS, k=6)).title()}. Jurnal Sintetis.\n")
+    return "".join(parts)
+
+
+def write_thesis_pdf(path, text):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    import textwrap
+
+    c = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    y = height - 50
+    c.setFont("Helvetica", 10)
+    for paragraph in text.split("\n"):
+        for line in textwrap.wrap(paragraph, 95) or [""]:
+            c.drawString(50, y, line)
+            y -= 13
+            if y < 50:
+                c.showPage()
+                c.setFont("Helvetica", 10)
+                y = height - 50
+    c.save()
+
+
+def write_thesis_docx(path, text):
+    import docx
+
+    doc = docx.Document()
+    for paragraph in text.split("\n"):
+        doc.add_paragraph(paragraph)
+    doc.save(path)
+
+
+# --- Pengukuran ---
+
+def time_call(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def summarize(name, scale, runs, **extra):
+    ordered = sorted(runs)
+    result = {
+        "name": name,
+        "scale": scale,
+        "runs": runs,
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+    }
+    result.update(extra)
+    print(f"  {name:<32} scale={scale:<9} median={result['median'] * 1000:10.2f} ms")
+    return result
+
+
+def bench_database(scale, workdir, repeat, notify_ratio):
+    results = []
+    db_path = os.path.join(workdir, f"thesis_management_{scale}.db")
+    start = time.perf_counter()
+    app = generate_database(db_path, scale, notify_ratio)
+    print(f"[db] {scale} baris dibuat dalam {time.perf_counter() - start:.1f} s")
+    try:
+        for name, sql, params in (
+            ("refresh.chapters", finalAI.SQL_REFRESH_CHAPTERS, (finalAI.WORKSPACE,)),
+            ("refresh.consultations", finalAI.SQL_REFRESH_CONSULTATIONS, ()),
+            ("refresh.revisions", finalAI.SQL_REFRESH_REVISIONS, ()),
+            ("statistics.progress_aggregate", finalAI.SQL_PROGRESS_AGGREGATE, ()),
+        ):
+            runs = time_call(lambda: app.cursor.execute(sql, params).fetchall(), repeat)
+            results.append(summarize(name, scale, runs))
+        runs = time_call(app.load_progress, repeat)
+        results.append(summarize("statistics.progress_counters", scale, runs))
+        runs = time_call(lambda: app.check_progress_counters(repair=False), repeat)
+        results.append(summarize("statistics.check_counters", scale, runs))
+
+        today = date.today()
+        runs = time_call(lambda: app.load_consultation_month(today.year, today.month), repeat)
+        results.append(summarize("consultations.calendar_month", scale, runs))
+        runs = time_call(lambda: app.find_consultation_conflict(LECTURERS[0], today.isoformat()), repeat)
+        results.append(summarize("consultations.conflict_check", scale, runs))
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            runs = time_call(app.check_chapter_deadlines, repeat)
+        results.append(summarize("check_chapter_deadlines", scale, runs))
+
+        results.append(bench_backup(app, db_path, scale, workdir))
+
+        if scale <= PDF_MAX_ROWS:
+            pdf_path = os.path.join(workdir, f"report_{scale}.pdf")
+            runs = time_call(lambda: app.render_pdf_report(pdf_path), max(1, repeat // 2))
+            results.append(summarize("print_pdf_report", scale, runs,
+                                     bytes=os.path.getsize(pdf_path)))
+    finally:
+        app.close()
+    return results
+
+
+def bench_backup(app, db_path, scale, workdir):
+    """
+    Backup online di thread background sementara thread utama terus menulis (seperti
+    pengguna yang menyimpan data saat backup terjadwal berjalan). Mencatat durasi backup
+    dan latensi tulis terburuk; gagal jika backup tidak selesai.
+    """
+    backup_dir = os.path.join(workdir, f"backups_{scale}")
+    outcome = {}
+
+    def run():
+        start = time.perf_counter()
+        outcome["path"] = finalAI.backup_database(db_path, backup_dir, keep=1)
+        outcome["elapsed"] = time.perf_counter() - start
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    write_latencies = []
+    while thread.is_alive():
+        start = time.perf_counter()
+        app.cursor.execute("UPDATE chapters SET status = status WHERE id = (SELECT MIN(id) FROM chapters)")
+        app.conn.commit()
+        write_latencies.append(time.perf_counter() - start)
+        time.sleep(0.01)
+    thread.join()
+    assert "path" in outcome, "Backup tidak selesai"
+    return summarize("backup.online", scale, [outcome["elapsed"]], bytes=os.path.getsize(outcome["path"]),
+                     writes_during_backup=len(write_latencies),
+                     max_write_ms=round(max(write_latencies, default=0) * 1000, 3))
+
+
+def bench_documents(workdir, repeat):
+    results = []
+    for pages in THESIS_PAGES:
+        text = generate_thesis_text(pages)
+        for ext, writer in ((".pdf", write_thesis_pdf), (".docx", write_thesis_docx)):
+            path = os.path.join(workdir, f"skripsi_{pages}{ext}")
+            writer(path, text)
+            runs = time_call(lambda: finalAI.extract_text_from_file(path), max(1, repeat // 2))
+            results.append(summarize(f"extract_text_from_file{ext}", pages, runs,
+                                     bytes=os.path.getsize(path)))
+        runs = time_call(
+            lambda: finalAI.build_bab_prompt("Bab 2 Tinjauan Pustaka", text, "Apakah sitasi saya konsisten?"),
+            repeat
+        )
+        prompt = finalAI.build_bab_prompt("Bab 2 Tinjauan Pustaka", text, "Apakah sitasi saya konsisten?")
+        results.append(summarize("do_ai.prompt", pages, runs, prompt_chars=len(prompt)))
+
+        # Prompt berbasis ringkasan (ringkasan dibuat sekali per upload, ~200-250 kata)
+        question = "Apakah metode penelitian saya sudah tepat?"
+        document_summary = " ".join(text.split()[:250])
+        chapter_summary = " ".join(text.split()[250:450])
+
+        def summary_prompt():
+            passages = finalAI.select_passages(text, question)
+            return finalAI.build_summary_prompt("Bab 3 Metodologi", document_summary, chapter_summary, passages, question)
+
+        runs = time_call(summary_prompt, repeat)
+        results.append(summarize("do_ai.prompt_summary", pages, runs, prompt_chars=len(summary_prompt())))
+
+        runs = time_call(lambda: finalAI.check_citations(text), repeat)
+        report = finalAI.check_citations(text)
+        results.append(summarize("check_citations", pages, runs, citations=report["citations"],
+                                 references=report["references"]))
+
+        runs = time_call(lambda: finalAI.segment_chapters(text), repeat)
+        sections = finalAI.segment_chapters(text)
+        results.append(summarize("segment_chapters", pages, runs, sections=len(sections)))
+        revised = text.replace("BAB III\n", "BAB III\nParagraf revisi sintetis.\n", 1)
+        old_sections = [{"key": finalAI.section_key(s["heading"]), "heading": s["heading"],
+                         "hash": finalAI.text_hash(text[s["start"]:s["end"]]), "text": text[s["start"]:s["end"]]}
+                        for s in sections]
+        new_sections = [{"key": finalAI.section_key(s["heading"]), "heading": s["heading"],
+                         "hash": finalAI.text_hash(revised[s["start"]:s["end"]]), "text": revised[s["start"]:s["end"]]}
+                        for s in finalAI.segment_chapters(revised)]
+        runs = time_call(lambda: finalAI.diff_document_sections(old_sections, new_sections), repeat)
+        diff_text = finalAI.format_section_diff(finalAI.diff_document_sections(old_sections, new_sections))
+        results.append(summarize("diff_document_sections", pages, runs, diff_chars=len(diff_text)))
+
+        chapter = next((s for s in sections if s["number"] == 2), None)
+        if chapter:
+            prompt = finalAI.build_bab_prompt("Bab 2 Tinjauan Pustaka", text, "Apakah sitasi saya konsisten?",
+                                              chapter_text=text[chapter["start"]:chapter["end"]])
+            results.append(summarize("do_ai.prompt_chapter", pages, [0.0], prompt_chars=len(prompt)))
+    return results
+
+
+def bench_attachments(workdir, repeat):
+    """
+    Upload lampiran ke AttachmentStore: upload pertama menyalin file, upload ulang file
+    yang sama hanya di-hash (tanpa tulis). Ukuran folder store harus tetap satu salinan.
+    """
+    results = []
+    for size_mb in ATTACHMENT_MB:
+        path = os.path.join(workdir, f"lampiran_{size_mb}mb.pdf")
+        with open(path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1024 * 1024))
+        store = finalAI.AttachmentStore(os.path.join(workdir, f"attachments_{size_mb}"))
+        start = time.perf_counter()
+        digest, _, _ = store.put(path)
+        results.append(summarize("attachment.put_new", size_mb, [time.perf_counter() - start]))
+        runs = time_call(lambda: store.put(path), repeat)
+        stored = sum(os.path.getsize(os.path.join(root, name))
+                     for root, _, names in os.walk(store.directory) for name in names)
+        results.append(summarize("attachment.put_duplicate", size_mb, runs, stored_bytes=stored))
+        export_path = os.path.join(workdir, f"lampiran_{size_mb}mb_export.pdf")
+        runs = time_call(lambda: store.export(digest, export_path), repeat)
+        results.append(summarize("attachment.export_mmap", size_mb, runs))
+
+    # Hapus bab -> konsultasinya (ON DELETE CASCADE) -> lampirannya; blob dihapus dari disk
+    # hanya setelah perujuk terakhirnya hilang
+    db_path = os.path.join(workdir, "attachments_gc.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    app = AppStub(db_path)
+    try:
+        app.create_tables()
+        app.attachment_store = finalAI.AttachmentStore(os.path.join(workdir, "attachments_gc"))
+        chapter_ids = [chapter_id for chapter_id, _ in app.chapter_store.chapter_list()[:2]]
+        consultation_ids = []
+        for chapter_id in chapter_ids:
+            app.cursor.execute("INSERT INTO consultations (date, lecturer, chapter_id) VALUES (?, ?, ?)",
+                               (date.today().isoformat(), LECTURERS[0], chapter_id))
+            consultation_ids.append(app.cursor.lastrowid)
+        app.conn.commit()
+        digest, size, _ = app.attachment_store.put(path)
+        app.add_attachments("consultation", consultation_ids, [(os.path.basename(path), digest, size)])
+
+        app.chapter_store.delete(chapter_ids[:1])
+        assert app.attachment_store.has_blob(digest), "Blob yang masih dirujuk ikut terhapus"
+        start = time.perf_counter()
+        app.chapter_store.delete(chapter_ids[1:])
+        results.append(summarize("attachment.delete_last_referrer", 1, [time.perf_counter() - start]))
+        assert not app.attachment_store.has_blob(digest), "Blob tanpa perujuk tidak dihapus dari disk"
+    finally:
+        app.close()
+    return results
+
+
+class ServerThread:
+    """Menjalankan server.ThesisServer di thread + event loop sendiri (seperti proses terpisah)."""
+
+    def __init__(self, db_path, pool_size):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.port = None
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=lambda: asyncio.run(self._main()), daemon=True)
+
+    async def _main(self):
+        # Hanya loopback, jadi tanpa token meskipun SKRIPSI_SERVER_TOKEN diset di lingkungan
+        api = server.ThesisServer(self.db_path, self.pool_size, token=None)
+        self.port = await api.start("127.0.0.1", 0)
+        self.loop = asyncio.get_running_loop()
+        self.stopped = self.loop.create_future()
+        self.ready.set()
+        try:
+            await self.stopped
+        finally:
+            await api.close()
+
+    def __enter__(self):
+        self.thread.start()
+        self.ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self.loop.call_soon_threadsafe(self.stopped.set_result, None)
+        self.thread.join()
+
+
+async def api_request(reader, writer, method, path, payload=None):
+    """
+    Satu request HTTP/1.1 keep-alive ke server API. Mengembalikan (status, badan, detik_potongan_pertama);
+    badan chunked (stream chat) dikembalikan sebagai list baris NDJSON.
+    """
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    start = time.perf_counter()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ", 2)[1])
+    headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in head[1:] if line)}
+    if headers.get("transfer-encoding") == "chunked":
+        lines, first_chunk = [], None
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            if size == 0:
+                await reader.readline()
+                return status, lines, first_chunk
+            lines.append(json.loads(await reader.readexactly(size)))
+            await reader.readexactly(2)
+            if first_chunk is None and "delta" in lines[-1]:
+                first_chunk = time.perf_counter() - start
+    data = await reader.readexactly(int(headers.get("content-length") or 0))
+    return status, json.loads(data or b"null"), None
+
+
+async def run_api_clients(port, clients, requests_per_client, chapter_ids, seed=0):
+    latencies = {kind: [] for kind, _ in SERVER_REQUEST_MIX}
+    first_delta = []
+    errors = []
+    kinds = [kind for kind, weight in SERVER_REQUEST_MIX for _ in range(weight)]
+    month = date.today().strftime("%Y-%m")
+
+    async def client(client_id):
+        rng = random.Random(seed + client_id)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            for _ in range(requests_per_client):
+                kind = rng.choice(kinds)
+                chapter_id = rng.choice(chapter_ids)
+                request = {
+                    "chapters": ("GET", "/api/chapters", None),
+                    "progress": ("GET", "/api/progress", None),
+                    "consultations": ("GET", f"/api/consultations?month={month}", None),
+                    "add_consultation": ("POST", "/api/consultations", {
+                        "date": date.today().isoformat(), "lecturer": rng.choice(LECTURERS),
+                        "chapter_id": chapter_id, "force": True}),
+                    "chat": ("POST", "/api/chat", {
+                        "chapter_id": chapter_id, "message": "Apakah metode penelitian saya sudah tepat?"}),
+                }[kind]
+                start = time.perf_counter()
+                status, body, first_chunk = await api_request(reader, writer, *request)
+                latencies[kind].append(time.perf_counter() - start)
+                if status >= 400 or (kind == "chat" and not any(line.get("done") for line in body)):
+                    errors.append((kind, status, body))
+                if first_chunk is not None:
+                    first_delta.append(first_chunk)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return time.perf_counter() - start, latencies, first_delta, errors
+
+
+def bench_server(workdir, clients, requests_per_client, pool_size=server.SERVER_POOL_SIZE):
+    """
+    Uji beban server API: `clients` koneksi keep-alive bersamaan, masing-masing
+    `requests_per_client` request campuran (baca, tulis, dan chat streaming ke pengganti Groq).
+    """
+    db_path = os.path.join(workdir, "server_api.db")
+    app = generate_database(db_path, SERVER_ROWS, 0)
+    try:
+        app.save_uploaded_document("skripsi_server.txt", generate_thesis_text(SERVER_THESIS_PAGES))
+        chapter_ids = [row[0] for row in app.cursor.execute("SELECT id FROM chapters ORDER BY id LIMIT 20")]
+    finally:
+        app.close()
+
+    with ServerThread(db_path, pool_size) as api:
+        elapsed, latencies, first_delta, errors = asyncio.run(
+            run_api_clients(api.port, clients, requests_per_client, chapter_ids)
+        )
+    total = sum(len(runs) for runs in latencies.values())
+    print(f"[server] {clients} klien, {total} request dalam {elapsed:.2f} s ({total / elapsed:.0f} req/s), "
+          f"{len(errors)} error")
+    assert not errors, f"Request server gagal: {errors[:3]}"
+    results = [summarize(f"server.{kind}", clients, runs, pool_size=pool_size)
+               for kind, runs in latencies.items() if runs]
+    if first_delta:
+        results.append(summarize("server.chat_first_delta", clients, first_delta))
+    results.append(summarize("server.load_test", clients, [elapsed], requests=total,
+                             requests_per_second=round(total / elapsed, 1)))
+    return results
+
+
+def bench_http(stub, requests_total, workers):
+    results = []
+    # Pertanyaan dibuat berbeda agar tidak digabung scheduler sebagai prompt identik
+    questions = itertools.count()
+    calls = (
+        ("http.wa_notification", lambda: finalAI.send_wa_notification("Bab 1 Pendahuluan", 3)),
+        ("http.groq_chat", lambda: finalAI.ask_groq_ai(f"Jelaskan rumusan masalah saya ({next(questions)}).", [])),
+    )
+    for name, fn in calls:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(fn) for _ in range(requests_total)]:
+                future.result()
+        elapsed = time.perf_counter() - start
+        results.append(summarize(name, requests_total, [elapsed],
+                                 workers=workers, requests_per_second=requests_total / elapsed))
+    return results
+
+
+def bench_scheduler(requests_total, workers, rate_limit_every=5, retry_after=1):
+    """
+    Throughput AIScheduler terhadap server pengganti yang mengembalikan 429 + retry-after
+    setiap `rate_limit_every` request. Gagal (AssertionError) jika ada jawaban yang hilang
+    atau retry-after tidak dihormati.
+    """
+    with StubServer(rate_limit_every=rate_limit_every, retry_after=retry_after) as stub:
+        point_app_to_stub(stub)
+        scheduler = finalAI.AIScheduler(requests_per_minute=60_000, tokens_per_minute=10 ** 9, workers=workers)
+        start = time.perf_counter()
+        futures = [scheduler.submit([{"role": "user", "content": f"Pertanyaan {i}"}]) for i in range(requests_total)]
+        duplicate = scheduler.submit([{"role": "user", "content": f"Pertanyaan {requests_total - 1}"}])
+        replies = [future.result(timeout=120).choices[0].message.content for future in futures]
+        elapsed = time.perf_counter() - start
+        # Diuji setelah pengukuran agar request yang dibatalkan tidak "mencuri" 429 dari batch di atas
+        cancelled = scheduler.submit([{"role": "user", "content": "Jendela ditutup"}],
+                                     priority=finalAI.AI_PRIORITY_BACKGROUND, owner="jendela-chat")
+        scheduler.cancel_owner("jendela-chat")
+
+        # Jendela ditutup tepat setelah response diterima tapi sebelum hasilnya diset:
+        # worker tidak boleh mati dan request berikutnya tetap dilayani
+        call = scheduler._call
+
+        def call_then_cancel(messages, future):
+            set_result = future.set_result
+
+            def cancel_then_set(result):
+                scheduler.cancel_owner("jendela-balapan")
+                set_result(result)
+
+            future.set_result = cancel_then_set
+            return call(messages, future)
+
+        scheduler._call = call_then_cancel
+        raced = scheduler.submit([{"role": "user", "content": "Ditutup saat menjawab"}], owner="jendela-balapan")
+        scheduler._queue.join()
+        scheduler._call = call
+        after_race = scheduler.submit([{"role": "user", "content": "Setelah balapan"}])
+
+        assert raced.cancelled(), "Permintaan yang dibatalkan saat menjawab tidak berstatus batal"
+        assert after_race.result(timeout=120).choices[0].message.content == stub.reply, \
+            "Scheduler tidak melayani request setelah pembatalan bersamaan"
+        for thread in scheduler._threads:
+            thread.join(timeout=0.05)  # beri waktu worker yang error untuk benar-benar berhenti
+        assert all(thread.is_alive() for thread in scheduler._threads), "Worker scheduler mati"
+        assert all(reply == stub.reply for reply in replies), "Ada jawaban AI yang hilang"
+        assert stub.rate_limited > 0, "Server pengganti tidak pernah mengembalikan 429"
+        assert cancelled.cancelled(), "Permintaan owner yang ditutup tidak dibatalkan"
+        # Setiap 429 memaksa jeda retry-after sebelum request berikutnya
+        assert elapsed >= retry_after, "Header retry-after tidak dihormati"
+        return [summarize("scheduler.groq_rate_limited", requests_total, [elapsed],
+                          workers=workers, requests_per_second=requests_total / elapsed,
+                          rate_limited=stub.rate_limited, coalesced=duplicate is futures[-1])]
+
+
+def bench_batch_review(chapters, latency_ms):
+    """Review semua bab: konkurensi 1 (setara pemanggilan serial) dibanding BATCH_REVIEW_CONCURRENCY."""
+    import asyncio
+
+    results = []
+    jobs = [(chapter_id, f"Review bab {chapter_id}") for chapter_id in range(chapters)]
+    with StubServer(latency_ms=latency_ms) as stub:
+        point_app_to_stub(stub)
+        for name, concurrency in (("batch_review.serial", 1),
+                                  ("batch_review.concurrent", finalAI.BATCH_REVIEW_CONCURRENCY)):
+            start = time.perf_counter()
+            reviews = asyncio.run(finalAI.review_chapters_async(jobs, concurrency=concurrency))
+            elapsed = time.perf_counter() - start
+            assert all(review for _, review, _ in reviews), "Ada review bab yang gagal"
+            results.append(summarize(name, chapters, [elapsed], concurrency=concurrency, latency_ms=latency_ms))
+    return results
+
+
+# --- Perbandingan hasil ---
+
+def compare_results(baseline_path, current, threshold):
+    """Bandingkan median dengan file hasil versi sebelumnya. Mengembalikan jumlah regresi."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["name"], r["scale"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nPerbandingan terhadap {baseline_path} (ambang {threshold:.2f}x):")
+    for result in current:
+        old = baseline.get((result["name"], result["scale"]))
+        if not old or not old["median"]:
+            continue
+        ratio = result["median"] / old["median"]
+        flag = "REGRESI" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"  {result['name']:<32} scale={result['scale']:<9} {ratio:6.2f}x {flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Aplikasi Manajemen Skripsi")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="Daftar jumlah baris per tabel, dipisah koma")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--notify-ratio", type=float, default=0.001,
+                        help="Proporsi bab yang memicu notifikasi WA")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Latensi buatan pada server pengganti Groq/WA")
+    parser.add_argument("--http-requests", type=int, default=200)
+    parser.add_argument("--http-workers", type=int, default=8)
+    parser.add_argument("--scheduler-requests", type=int, default=50)
+    parser.add_argument("--server-clients", type=int, default=50,
+                        help="Jumlah klien bersamaan pada uji beban server API")
+    parser.add_argument("--server-requests", type=int, default=20, help="Request per klien server API")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", help="File hasil versi sebelumnya untuk deteksi regresi")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    parser.add_argument("--workdir", help="Folder data sintetis (default: folder sementara)")
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    workdir = args.workdir or tempfile.mkdtemp(prefix="skripsi_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+
+    with StubServer(latency_ms=args.latency_ms) as stub:
+        point_app_to_stub(stub)
+        for scale in scales:
+            results.extend(bench_database(scale, workdir, args.repeat, args.notify_ratio))
+        results.extend(bench_documents(workdir, args.repeat))
+        results.extend(bench_attachments(workdir, args.repeat))
+        results.extend(bench_http(stub, args.http_requests, args.http_workers))
+        results.extend(bench_server(workdir, args.server_clients, args.server_requests))
+    results.extend(bench_scheduler(args.scheduler_requests, args.http_workers))
+    results.extend(bench_batch_review(len(THESIS_CHAPTERS), max(args.latency_ms, 200)))
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "argv": sys.argv[1:] if argv is None else argv,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil disimpan di {args.output}")
+
+    if args.compare:
+        return 1 if compare_results(args.compare, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
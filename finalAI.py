@@ -4,15 +4,30 @@ from datetime import datetime, date
 import sqlite3
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
-from tkcalendar import DateEntry
+from tkcalendar import Calendar, DateEntry
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 import requests
 import json
+import hashlib
+import re
+import math
+import mmap
+from collections import Counter
+from concurrent.futures import Future, CancelledError, InvalidStateError, ProcessPoolExecutor, as_completed
+import queue
+import random
+import itertools
+import asyncio
 from dotenv import load_dotenv
 import os
-from groq import Groq  # sesuai instruksi
+import threading
+import time
+import sys
+import atexit
+import traceback
+from groq import Groq, AsyncGroq, RateLimitError  # sesuai instruksi
 
 WA_API_URL = "https://wa.zulzario.my.id/api/whatsapp"
 WA_API_DOC_URL = "https://wa.zulzario.my.id/api/whatsapp/document"
@@ -22,6 +37,7 @@ APP_BG_COLOR = "#1e2a38"
 WINDOW_GEOMETRY = "700x600"
 WINDOW_BG_COLOR = "#1e2a38"
 DB_NAME = "thesis_management.db"
+WORKSPACE = os.getenv("SKRIPSI_WORKSPACE", "default")
 PDF_HEADER_COLOR = "#2c3e50"
 PDF_HEADER_TEXT_COLOR = colors.white
 PDF_HEADER_TITLE = "Laporan Kinerja Skripsi"
@@ -43,9 +59,483 @@ PDF_FOOTER_TEXT = "Aplikasi Manajemen Skripsi - Laporan Otomatis"
 PDF_FOOTER_FONT = "Helvetica-Oblique"
 PDF_FOOTER_FONT_SIZE = 9
 
+# --- Query refresh halaman (dipakai juga oleh laporan PDF dan benchmark) ---
+# Daftar bab satu workspace (sama dengan cakupan penghitung progress)
+SQL_REFRESH_CHAPTERS = "SELECT id, chapter_name, target_date, status FROM chapters WHERE workspace = ? ORDER BY id"
+SQL_REFRESH_CONSULTATIONS = """
+    SELECT c.id, c.date, c.lecturer, ch.chapter_name
+    FROM consultations c
+    LEFT JOIN chapters ch ON c.chapter_id = ch.id
+    ORDER BY c.date DESC
+"""
+# Konsultasi dalam rentang tanggal [awal, akhir) (API ?month=, memakai idx_consultations_date)
+SQL_REFRESH_CONSULTATIONS_RANGE = """
+    SELECT c.id, c.date, c.lecturer, ch.chapter_name
+    FROM consultations c
+    LEFT JOIN chapters ch ON c.chapter_id = ch.id
+    WHERE c.date >= ? AND c.date < ?
+    ORDER BY c.date DESC
+"""
+SQL_REFRESH_REVISIONS = """
+    SELECT r.id, ch.chapter_name, r.notes, r.date
+    FROM revisions r
+    LEFT JOIN chapters ch ON r.chapter_id = ch.id
+    ORDER BY r.id DESC
+"""
+# Revisi satu bab (API ?chapter_id=)
+SQL_REFRESH_REVISIONS_BY_CHAPTER = """
+    SELECT r.id, ch.chapter_name, r.notes, r.date
+    FROM revisions r
+    LEFT JOIN chapters ch ON r.chapter_id = ch.id
+    WHERE r.chapter_id = ?
+    ORDER BY r.id DESC
+"""
+# Kalender konsultasi: satu query range per bulan tampil (memakai idx_consultations_date)
+SQL_CONSULTATION_MONTH = """
+    SELECT date, COUNT(*), GROUP_CONCAT(lecturer, ', ')
+    FROM consultations
+    WHERE date >= ? AND date < ?
+    GROUP BY date
+"""
+SQL_CONSULTATION_DAY = """
+    SELECT c.lecturer, ch.chapter_name
+    FROM consultations c
+    LEFT JOIN chapters ch ON c.chapter_id = ch.id
+    WHERE c.date = ?
+    ORDER BY c.lecturer
+"""
+# Cek jadwal bentrok dosen (memakai idx_consultations_lecturer_date)
+SQL_CONSULTATION_CONFLICT = """
+    SELECT c.date, c.lecturer, ch.chapter_name
+    FROM consultations c
+    LEFT JOIN chapters ch ON c.chapter_id = ch.id
+    WHERE c.lecturer = ? COLLATE NOCASE AND c.date = ?
+    LIMIT 1
+"""
+# Statistik progress dibaca dari tabel penghitung yang dijaga trigger (O(1) per workspace)
+SQL_PROGRESS_COUNTERS = "SELECT done, not_done FROM progress_counters WHERE workspace = ?"
+# Bab belum selesai yang lewat target: jumlah per tanggal target, hanya tanggal yang sudah lewat
+SQL_PROGRESS_OVERDUE = """
+    SELECT COALESCE(SUM(pending), 0) FROM progress_deadlines
+    WHERE workspace = ? AND target_date < ?
+"""
+# Agregat penuh atas chapters, hanya untuk membangun ulang / memeriksa penghitung
+SQL_PROGRESS_AGGREGATE = """
+    SELECT workspace, SUM(status IS 'Selesai'), SUM(status IS 'Belum Selesai')
+    FROM chapters GROUP BY workspace ORDER BY workspace
+"""
+SQL_DEADLINE_AGGREGATE = """
+    SELECT workspace, target_date, COUNT(*)
+    FROM chapters WHERE status = 'Belum Selesai' AND target_date IS NOT NULL
+    GROUP BY workspace, target_date ORDER BY workspace, target_date
+"""
+# Isi trigger: keluarkan baris lama (OLD) dari penghitung / masukkan baris baru (NEW).
+# `status IS ...` selalu 0/1 (juga saat status NULL) sehingga penjumlahan tidak pernah NULL.
+PROGRESS_TRIGGER_REMOVE = """
+    UPDATE progress_counters
+    SET done = done - (OLD.status IS 'Selesai'), not_done = not_done - (OLD.status IS 'Belum Selesai')
+    WHERE workspace = OLD.workspace;
+    UPDATE progress_deadlines SET pending = pending - 1
+    WHERE OLD.status = 'Belum Selesai' AND workspace = OLD.workspace AND target_date = OLD.target_date;
+    DELETE FROM progress_deadlines
+    WHERE workspace = OLD.workspace AND target_date = OLD.target_date AND pending <= 0;
+"""
+PROGRESS_TRIGGER_ADD = """
+    INSERT INTO progress_counters (workspace, done, not_done)
+    VALUES (NEW.workspace, NEW.status IS 'Selesai', NEW.status IS 'Belum Selesai')
+    ON CONFLICT(workspace) DO UPDATE SET done = done + excluded.done, not_done = not_done + excluded.not_done;
+    INSERT INTO progress_deadlines (workspace, target_date, pending)
+    SELECT NEW.workspace, NEW.target_date, 1
+    WHERE NEW.status = 'Belum Selesai' AND NEW.target_date IS NOT NULL
+    ON CONFLICT(workspace, target_date) DO UPDATE SET pending = pending + 1;
+"""
+
+# --- Pustaka referensi (korpus di disk, dibaca lewat mmap) ---
+REFERENCE_DIR = "reference_library"
+REFERENCE_INDEX_DB = "index.db"
+REFERENCE_CORPUS_FILE = "corpus.bin"
+REFERENCE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+REFERENCE_TOP_K = 3
+REFERENCE_PASSAGE_CHARS = 800
+REFERENCE_MMAP_SIZE = 256 * 1024 * 1024
+STOPWORDS = set("""
+yang dan di ke dari untuk dengan pada dalam ini itu adalah atau juga tidak akan oleh sebagai
+dapat telah bahwa lebih karena secara setiap antara maka para the and for with that this from
+are was were has have been which their these those into than then also such not
+""".split())
+
+# --- Deteksi catatan revisi berulang (MinHash + LSH) ---
+REVISION_SHINGLE_SIZE = 3  # shingle karakter
+REVISION_LSH_BANDS = 20
+REVISION_LSH_ROWS = 3  # MinHash = bands x rows permutasi; ambang LSH kira-kira (1/20)^(1/3) = 0.37
+REVISION_SIMILARITY_THRESHOLD = 0.4  # Jaccard minimum agar dianggap catatan serupa
+REVISION_SIMILAR_LIMIT = 5
+REVISION_CANDIDATE_LIMIT = 200  # kandidat LSH terbanyak yang diverifikasi dengan Jaccard
+
 # --- AI Groq Chat Constants ---
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
+# Batas rate Groq (sesuaikan dengan plan akun), dipakai oleh AIScheduler
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_RPM", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TPM", "30000"))
+GROQ_MAX_RETRIES = 3
+GROQ_COMPLETION_TOKEN_ESTIMATE = 512
+AI_SCHEDULER_WORKERS = 2
+AI_PRIORITY_INTERACTIVE = 0
+AI_PRIORITY_BACKGROUND = 10
+CHAT_PAGE_SIZE = 30  # jumlah pesan yang dimuat per halaman di jendela chat
+CHAT_CONTEXT_MESSAGES = 10  # pesan terakhir thread yang ikut dikirim sebagai konteks AI
+SUMMARY_CHUNK_WORDS = 3000  # teks bab lebih panjang diringkas per potongan
+SUMMARY_DOCUMENT_SCOPE = "DOKUMEN"  # scope ringkasan seluruh skripsi di document_summaries
+CHAT_PASSAGES = 3  # potongan teks asli bab yang ikut dikirim bersama ringkasan
+CHAT_PASSAGE_CHARS = 600
+BATCH_REVIEW_CONCURRENCY = 4
+BATCH_REVIEW_QUESTION = (
+    "Berikan review untuk bab ini: kekuatan, kelemahan, dan saran perbaikan yang konkret "
+    "dalam bentuk poin-poin singkat."
+)
+
+# --- Backup database (online backup API SQLite, dijalankan di thread background) ---
+BACKUP_DIR = os.getenv("SKRIPSI_BACKUP_DIR", "backups")
+BACKUP_INTERVAL_MINUTES = int(os.getenv("SKRIPSI_BACKUP_INTERVAL_MINUTES", "60"))  # 0 = backup terjadwal nonaktif
+BACKUP_KEEP = int(os.getenv("SKRIPSI_BACKUP_KEEP", "7"))
+BACKUP_PAGES_PER_STEP = 256  # halaman database yang disalin per langkah
+BACKUP_STEP_PAUSE = 0.005  # jeda antar langkah (detik) agar writer lain tetap lancar
+BACKUP_STARTUP_DELAY = 30  # detik setelah aplikasi dibuka sebelum backup yang tertunda dijalankan
+
+# --- Lampiran file konsultasi/revisi (disimpan berdasarkan hash isi) ---
+ATTACHMENT_DIR = os.getenv("SKRIPSI_ATTACHMENT_DIR", "attachments")
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024  # ukuran potongan saat hashing/menyalin file
+ATTACHMENT_OWNERS = {"consultation": "consultation_id", "revision": "revision_id"}
+
+# --- Tracing (opsional, aktifkan dengan SKRIPSI_TRACE=1) ---
+TRACE_ENABLED = os.getenv("SKRIPSI_TRACE") == "1"
+TRACE_FILE = os.getenv("SKRIPSI_TRACE_FILE", "skripsi_trace.jsonl")
+SLOW_QUERY_LOG = os.getenv("SKRIPSI_SLOW_QUERY_LOG", "skripsi_slow_queries.log")
+SLOW_QUERY_MS = float(os.getenv("SKRIPSI_SLOW_QUERY_MS", "100"))
+
+# --- Watchdog main loop Tk (opsional, aktifkan dengan SKRIPSI_WATCHDOG=1) ---
+WATCHDOG_ENABLED = os.getenv("SKRIPSI_WATCHDOG") == "1"
+WATCHDOG_LOG = os.getenv("SKRIPSI_WATCHDOG_LOG", "skripsi_stalls.log")
+WATCHDOG_STALL_MS = float(os.getenv("SKRIPSI_WATCHDOG_STALL_MS", "500"))  # UI dianggap hang setelah selama ini
+WATCHDOG_HEARTBEAT_MS = 100  # jarak antar heartbeat root.after
+WATCHDOG_SAMPLE_MS = 50  # jarak antar sampel stack main thread saat hang
+
+_trace_lock = threading.Lock()
+_trace_file = None
+
+class _NullSpan:
+    """Span kosong yang dipakai saat tracing nonaktif (tanpa alokasi, tanpa I/O)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class TraceSpan:
+    """Satu span tracing: mencatat durasi dan atribut (baris, bytes, token) ke TRACE_FILE."""
+
+    __slots__ = ("kind", "name", "attrs", "start", "ts")
+
+    def __init__(self, kind, name, attrs):
+        self.kind = kind
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.ts = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record = {
+            "ts": round(self.ts, 6),
+            "kind": self.kind,
+            "name": self.name,
+            "duration_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "thread": threading.current_thread().name,
+        }
+        record.update(self.attrs)
+        if exc_type is not None:
+            record["error"] = repr(exc)
+        write_trace_record(record)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+def trace_span(kind, name, **attrs):
+    """
+    Fungsi untuk membuat span tracing. Jika tracing nonaktif mengembalikan span kosong,
+    sehingga overhead di jalur utama hanya satu pengecekan boolean.
+    """
+    if not TRACE_ENABLED:
+        return _NULL_SPAN
+    return TraceSpan(kind, name, attrs)
+
+def write_trace_record(record):
+    """
+    Fungsi untuk menulis satu record span ke file JSON-lines,
+    dan ke slow query log jika query SQL melebihi SLOW_QUERY_MS.
+    """
+    global _trace_file
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _trace_lock:
+        if _trace_file is None:
+            _trace_file = open(TRACE_FILE, "a", encoding="utf-8", buffering=1)
+        _trace_file.write(line + "\n")
+        if record["kind"] == "sql" and record["duration_ms"] >= SLOW_QUERY_MS:
+            with open(SLOW_QUERY_LOG, "a", encoding="utf-8") as f:
+                f.write(
+                    f"{datetime.fromtimestamp(record['ts']).isoformat(timespec='milliseconds')} "
+                    f"{record['duration_ms']:.1f} ms rows={record.get('rows', record.get('rowcount'))} "
+                    f"{record.get('sql', '')}\n"
+                )
+
+def close_trace_file():
+    # Dipanggil saat program keluar (atexit) agar file trace ditutup dengan rapi
+    global _trace_file
+    with _trace_lock:
+        if _trace_file is not None:
+            _trace_file.close()
+            _trace_file = None
+
+atexit.register(close_trace_file)
+
+class MainLoopWatchdog:
+    """
+    Pendeteksi main loop Tk yang macet. Heartbeat dijadwalkan dengan root.after; thread
+    sampler memeriksa kapan heartbeat terakhir berjalan. Jika lebih lama dari stall_ms,
+    stack main thread diambil berkala (sys._current_frames) sampai heartbeat jalan lagi.
+    Awal hang langsung ditulis ke log (agar hang permanen tetap tercatat), lalu saat UI
+    pulih ditulis ringkasan: durasi, keterlambatan heartbeat, dan stack yang paling sering
+    terlihat beserta jumlah sampelnya.
+    """
+
+    def __init__(self, root, stall_ms=WATCHDOG_STALL_MS, heartbeat_ms=WATCHDOG_HEARTBEAT_MS,
+                 sample_ms=WATCHDOG_SAMPLE_MS, log_path=WATCHDOG_LOG):
+        self.root = root
+        self.stall = stall_ms / 1000.0
+        self.heartbeat_ms = heartbeat_ms
+        self.sample = sample_ms / 1000.0
+        self.log_path = log_path
+        self.main_ident = threading.get_ident()  # dibuat di thread Tk
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._stall_started = None  # wall-clock awal hang yang sedang berlangsung
+        self._samples = Counter()
+        self._stopped = threading.Event()
+
+    def start(self):
+        self.root.after(self.heartbeat_ms, self._beat)
+        threading.Thread(target=self._sample_loop, name="tk-watchdog", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def _beat(self):
+        now = time.monotonic()
+        with self._lock:
+            lateness = now - self._last_beat - self.heartbeat_ms / 1000.0
+            self._last_beat = now
+            started, samples = self._stall_started, self._samples
+            self._stall_started, self._samples = None, Counter()
+        if started is not None:
+            self._write_stall_end(started, lateness, samples)
+        if not self._stopped.is_set():
+            self.root.after(self.heartbeat_ms, self._beat)
+
+    def _sample_loop(self):
+        while not self._stopped.wait(self.sample):
+            with self._lock:
+                blocked = time.monotonic() - self._last_beat - self.heartbeat_ms / 1000.0
+                if blocked < self.stall:
+                    continue
+                frame = sys._current_frames().get(self.main_ident)
+                if frame is None:  # main thread sudah selesai
+                    return
+                stack = "".join(traceback.format_stack(frame))
+                del frame
+                first = self._stall_started is None
+                if first:
+                    self._stall_started = time.time() - blocked
+                self._samples[stack] += 1
+            if first:
+                self._write(f"STALL mulai {self._format_ts(self._stall_started)} "
+                            f"(main loop tidak merespons {blocked * 1000:.0f} ms)\n{stack}")
+
+    def _write_stall_end(self, started, lateness, samples):
+        total = sum(samples.values())
+        lines = [f"STALL selesai {self._format_ts(started)} durasi={lateness * 1000:.0f} ms "
+                 f"sampel={total} (tiap {self.sample * 1000:.0f} ms)"]
+        for stack, count in samples.most_common(3):
+            lines.append(f"--- {count}/{total} sampel ({count * self.sample * 1000:.0f} ms) di:\n{stack}")
+        self._write("\n".join(lines))
+
+    def _write(self, text):
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(text.rstrip("\n") + "\n\n")
+
+    @staticmethod
+    def _format_ts(ts):
+        return datetime.fromtimestamp(ts).isoformat(timespec="milliseconds")
+
+class TracedCursor:
+    """
+    Pembungkus cursor SQLite yang mencatat span untuk setiap execute/executemany.
+    Untuk SELECT, span ditutup saat hasil selesai diambil (fetchall/fetchone, fetchmany atau
+    iterasi sampai habis) agar durasi mencakup fetch dan jumlah baris.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._pending = None
+        self._rows = 0
+
+    def execute(self, sql, parameters=()):
+        self._finish_pending()
+        span = trace_span("sql", sql.split(None, 1)[0].upper(), sql=" ".join(sql.split()))
+        self._run(span, self._cursor.execute, sql, parameters)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish_pending()
+        span = trace_span("sql", sql.split(None, 1)[0].upper(), sql=" ".join(sql.split()), many=True)
+        self._run(span, self._cursor.executemany, sql, seq_of_parameters)
+        return self
+
+    def _run(self, span, method, sql, parameters):
+        span.__enter__()
+        try:
+            method(sql, parameters)
+        except BaseException as e:
+            span.__exit__(type(e), e, e.__traceback__)
+            raise
+        if self._cursor.description is None:
+            span.set(rowcount=self._cursor.rowcount)
+            span.__exit__(None, None, None)
+        else:
+            self._pending = span
+            self._rows = 0
+
+    def _finish_pending(self):
+        span = self._pending
+        if span is not None:
+            self._pending = None
+            span.set(rows=self._rows)
+            span.__exit__(None, None, None)
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._rows += len(rows)
+        self._finish_pending()
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._rows += row is not None
+        self._finish_pending()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self._cursor.arraysize if size is None else size
+        rows = self._cursor.fetchmany(size)
+        self._rows += len(rows)
+        if len(rows) < size:
+            self._finish_pending()
+        return rows
+
+    def close(self):
+        self._finish_pending()
+        self._cursor.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # Streaming baris per baris; span ditutup saat hasil habis
+        try:
+            row = next(self._cursor)
+        except StopIteration:
+            self._finish_pending()
+            raise
+        self._rows += 1
+        return row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class TracedConnection:
+    """
+    Pembungkus koneksi SQLite: cursor() dan jalan pintas execute/executemany milik koneksi
+    memakai TracedCursor, sehingga semua query lewat koneksi ini tercatat.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return TracedCursor(self._conn.cursor())
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def backup(self, target, **kwargs):
+        # sqlite3 hanya menerima koneksi asli sebagai tujuan backup
+        self._conn.backup(getattr(target, "_conn", target), **kwargs)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+def traced_connection(conn):
+    """Bungkus koneksi dengan TracedConnection hanya jika tracing aktif."""
+    return TracedConnection(conn) if TRACE_ENABLED else conn
+
+def _request_bytes(kwargs):
+    # Perkiraan ukuran body request untuk atribut span HTTP
+    total = 0
+    if kwargs.get("json") is not None:
+        total += len(json.dumps(kwargs["json"]).encode("utf-8"))
+    data = kwargs.get("data")
+    if isinstance(data, dict):
+        total += sum(len(str(k)) + len(str(v)) for k, v in data.items())
+    elif isinstance(data, (bytes, str)):
+        total += len(data)
+    for value in (kwargs.get("files") or {}).values():
+        fileobj = value[1] if isinstance(value, tuple) else value
+        try:
+            total += os.fstat(fileobj.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            pass
+    return total
+
+def http_post(url, **kwargs):
+    """
+    Fungsi pembungkus requests.post yang mencatat span HTTP (status, bytes keluar/masuk).
+    """
+    with trace_span("http", url, method="POST") as span:
+        response = requests.post(url, **kwargs)
+        if span is not _NULL_SPAN:
+            span.set(status=response.status_code, bytes_out=_request_bytes(kwargs),
+                     bytes_in=len(response.content))
+        return response
 
 def send_wa_notification(chapter_name, days_left, lewat=False):
     """
@@ -65,7 +555,7 @@ def send_wa_notification(chapter_name, days_left, lewat=False):
     }
 
     try:
-        response = requests.post(WA_API_URL, json=payload)
+        response = http_post(WA_API_URL, json=payload)
         response.raise_for_status()
     except Exception as e:
         print("Gagal mengirim notifikasi WA:", e)
@@ -84,7 +574,7 @@ def send_wa_pdf_notification(pdf_path):
                 "message": message
             }
             # Assuming the API endpoint supports multipart/form-data for document upload
-            response = requests.post(WA_API_DOC_URL, data=data, files=files)
+            response = http_post(WA_API_DOC_URL, data=data, files=files)
             response.raise_for_status()
         print("WA: PDF report sent successfully.")
     except Exception as e:
@@ -99,77 +589,1361 @@ def send_wa_test_message():
         "message": test_message
     }
     try:
-        response = requests.post(WA_API_URL, json=payload)
+        response = http_post(WA_API_URL, json=payload)
         response.raise_for_status()
         messagebox.showinfo("Sukses", "Pesan test WhatsApp berhasil dikirim.")
     except Exception as e:
         messagebox.showerror("Gagal", f"Gagal mengirim pesan test WhatsApp:\n{e}")
 
-# Simpan history chat ke memory sementara
-chat_history_memory = []
+class TokenBucket:
+    """
+    Token bucket thread-safe. reserve() langsung memotong token dan mengembalikan
+    lama waktu tunggu (detik) sebelum permintaan boleh dikirim, sehingga bisa dipakai
+    baik dengan time.sleep maupun asyncio.sleep.
+    """
+
+    def __init__(self, capacity, refill_per_second):
+        self.capacity = float(capacity)
+        self.rate = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount=1):
+        with self.lock:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, delta):
+        # Koreksi setelah pemakaian sebenarnya diketahui (positif = tambah pemakaian)
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+    def penalize(self, seconds):
+        # Paksa permintaan berikutnya menunggu minimal `seconds` (misal dari header retry-after)
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+def estimate_tokens(messages):
+    # Perkiraan kasar: 1 token ~ 4 karakter, ditambah perkiraan panjang jawaban
+    return sum(len(m.get("content") or "") for m in messages) // 4 + GROQ_COMPLETION_TOKEN_ESTIMATE
+
+def _retry_after_seconds(error, default=1.0):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return default
 
-def ask_groq_ai(prompt):
+class AIScheduler:
     """
-    Fungsi untuk mengirim prompt ke Groq AI dan mengembalikan respon.
-    Menyimpan history chat ke memory sementara (chat_history_memory).
+    Penjadwal permintaan Groq dengan satu client yang dipakai bersama:
+    - token bucket untuk jumlah request dan token per menit,
+    - antrian prioritas (AI_PRIORITY_INTERACTIVE didahulukan dari AI_PRIORITY_BACKGROUND),
+    - prompt identik yang sedang diproses digabung menjadi satu request,
+    - request milik jendela yang ditutup dibatalkan lewat cancel_owner(),
+    - status 429 ditunggu sesuai header retry-after lalu dicoba ulang.
     """
+
+    def __init__(self, requests_per_minute=GROQ_REQUESTS_PER_MINUTE, tokens_per_minute=GROQ_TOKENS_PER_MINUTE,
+                 workers=AI_SCHEDULER_WORKERS, max_retries=GROQ_MAX_RETRIES):
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self.max_retries = max_retries
+        self.workers = workers
+        self._client = None
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Future
+        self._owners = {}    # key -> set owner (None = pemanggil tanpa owner)
+        self._threads = []
+
+    @property
+    def client(self):
+        # Satu client Groq untuk seluruh aplikasi; retry ditangani scheduler sendiri
+        with self._lock:
+            if self._client is None:
+                self._client = Groq(api_key=GROQ_API_KEY, max_retries=0)
+            return self._client
+
+    def submit(self, messages, priority=AI_PRIORITY_INTERACTIVE, owner=None):
+        """Masukkan permintaan ke antrian. Mengembalikan Future berisi response Groq."""
+        key = hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None and not future.done():
+                self._owners[key].add(owner)
+                return future
+            future = Future()
+            self._inflight[key] = future
+            self._owners[key] = {owner}
+            self._queue.put((priority, next(self._sequence), key, messages, future))
+            # Worker yang mati (misal karena error tak terduga) diganti dengan yang baru
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, name=f"ai-scheduler-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    def cancel_owner(self, owner):
+        """Batalkan semua permintaan milik owner (misal jendela chat yang ditutup)."""
+        with self._lock:
+            for key, owners in list(self._owners.items()):
+                owners.discard(owner)
+                if not owners:
+                    self._inflight[key].cancel()
+
+    def _finish(self, key, future):
+        with self._lock:
+            # Key bisa sudah dipakai Future baru untuk prompt yang sama
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                del self._owners[key]
+
+    def _wait(self, delay, future):
+        # Tidur bertahap agar pembatalan tetap cepat terdeteksi
+        deadline = time.monotonic() + delay
+        while not future.cancelled():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.25))
+        return False
+
+    @staticmethod
+    def _resolve(future, result=None, exception=None):
+        # cancel_owner() bisa membatalkan Future tepat setelah _call selesai; hasilnya dibuang saja
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _worker(self):
+        while True:
+            priority, _, key, messages, future = self._queue.get()
+            try:
+                if future.cancelled():
+                    continue
+                try:
+                    response = self._call(messages, future)
+                except BaseException as e:
+                    self._resolve(future, exception=e)
+                else:
+                    if response is not None:
+                        self._resolve(future, result=response)
+            finally:
+                self._finish(key, future)
+                self._queue.task_done()
+
+    def reserve(self, estimated_tokens):
+        """Pesan kuota satu request; mengembalikan detik yang harus ditunggu sebelum mengirim."""
+        return max(self.request_bucket.reserve(1), self.token_bucket.reserve(estimated_tokens))
+
+    def record_usage(self, response, estimated_tokens, span=_NULL_SPAN):
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            span.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens,
+                     total_tokens=usage.total_tokens)
+            self.token_bucket.adjust(usage.total_tokens - estimated_tokens)
+
+    def rate_limited(self, error):
+        """Tahan semua request berikutnya selama retry-after dari response 429."""
+        retry_after = _retry_after_seconds(error)
+        self.request_bucket.penalize(retry_after)
+        self.token_bucket.penalize(retry_after)
+
+    def _call(self, messages, future):
+        estimated = estimate_tokens(messages)
+        for attempt in range(self.max_retries + 1):
+            delay = self.reserve(estimated)
+            if not self._wait(delay, future):
+                return None
+            try:
+                with trace_span("ai", GROQ_MODEL, messages=len(messages), attempt=attempt) as span:
+                    response = self.client.chat.completions.create(model=GROQ_MODEL, messages=messages)
+                    self.record_usage(response, estimated, span)
+                return response
+            except RateLimitError as e:
+                self.rate_limited(e)
+                if attempt == self.max_retries:
+                    raise
+
+_ai_scheduler = None
+_ai_scheduler_lock = threading.Lock()
+
+def get_ai_scheduler():
+    """Fungsi untuk mengambil AIScheduler bersama (dibuat saat pertama dipakai)."""
+    global _ai_scheduler
+    with _ai_scheduler_lock:
+        if _ai_scheduler is None:
+            _ai_scheduler = AIScheduler()
+        return _ai_scheduler
+
+async def review_chapters_async(jobs, progress=None, concurrency=BATCH_REVIEW_CONCURRENCY, scheduler=None):
+    """
+    Fungsi untuk menjalankan review banyak bab sekaligus dengan AsyncGroq.
+    jobs berisi (chapter_id, prompt). Paling banyak `concurrency` request berjalan bersamaan
+    dan kuota rate limit diambil dari AIScheduler bersama. progress(chapter_id, status, teks)
+    dipanggil saat bab mulai, selesai atau gagal. Mengembalikan list (chapter_id, review, error).
+    """
+    scheduler = scheduler or get_ai_scheduler()
+    semaphore = asyncio.Semaphore(concurrency)
+    client = AsyncGroq(api_key=GROQ_API_KEY, max_retries=0)
+
+    def notify(chapter_id, status, text=None):
+        if progress:
+            progress(chapter_id, status, text)
+
+    async def review_one(chapter_id, prompt):
+        messages = [{"role": "system", "content": "okey."}, {"role": "user", "content": prompt}]
+        estimated = estimate_tokens(messages)
+        async with semaphore:
+            notify(chapter_id, "berjalan")
+            try:
+                for attempt in range(scheduler.max_retries + 1):
+                    await asyncio.sleep(scheduler.reserve(estimated))
+                    try:
+                        with trace_span("ai", GROQ_MODEL, messages=len(messages), attempt=attempt, batch=True) as span:
+                            response = await client.chat.completions.create(model=GROQ_MODEL, messages=messages)
+                            scheduler.record_usage(response, estimated, span)
+                        break
+                    except RateLimitError as e:
+                        scheduler.rate_limited(e)
+                        if attempt == scheduler.max_retries:
+                            raise
+                review = response.choices[0].message.content if response.choices else ""
+            except Exception as e:
+                notify(chapter_id, "gagal", str(e))
+                return chapter_id, None, str(e)
+            notify(chapter_id, "selesai", review)
+            return chapter_id, review, None
+
     try:
-        # Tambahkan prompt user ke history
-        chat_history_memory.append({"role": "user", "content": prompt})
-
-        # Siapkan pesan untuk dikirim ke Groq, gunakan seluruh history
-        messages = [
-            {
-                "role": "system",
-                "content": "okey."
-            }
-        ] + chat_history_memory[-10:]  # Kirim maksimal 10 pesan terakhir (bisa diubah sesuai kebutuhan)
+        return await asyncio.gather(*(review_one(chapter_id, prompt) for chapter_id, prompt in jobs))
+    finally:
+        await client.close()
 
-        client = Groq(api_key=GROQ_API_KEY)
-        response = client.chat.completions.create(
-            model=GROQ_MODEL,
-            messages=messages
-        )
-        # Ambil isi jawaban dari response Groq
-        if hasattr(response, "choices") and response.choices:
-            ai_reply = response.choices[0].message.content
-            # Simpan jawaban AI ke history
-            chat_history_memory.append({"role": "assistant", "content": ai_reply})
-            return ai_reply
-        else:
-            return "Tidak ada jawaban dari AI."
+async def stream_chat_async(client, messages, scheduler=None):
+    """
+    Fungsi (async generator) untuk meminta jawaban chat dari AsyncGroq secara streaming.
+    Kuota rate limit diambil dari AIScheduler bersama; 429 sebelum potongan pertama
+    ditunggu sesuai retry-after lalu dicoba ulang. Menghasilkan potongan teks jawaban.
+    """
+    scheduler = scheduler or get_ai_scheduler()
+    estimated = estimate_tokens(messages)
+    for attempt in range(scheduler.max_retries + 1):
+        await asyncio.sleep(scheduler.reserve(estimated))
+        try:
+            with trace_span("ai", GROQ_MODEL, messages=len(messages), attempt=attempt, stream=True) as span:
+                stream = await client.chat.completions.create(model=GROQ_MODEL, messages=messages, stream=True)
+                async for chunk in stream:
+                    x_groq = getattr(chunk, "x_groq", None)
+                    if x_groq is not None:
+                        scheduler.record_usage(x_groq, estimated, span)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            return
+        except RateLimitError as e:
+            scheduler.rate_limited(e)
+            if attempt == scheduler.max_retries:
+                raise
+
+def request_groq_reply(prompt, history, priority=AI_PRIORITY_INTERACTIVE, owner=None):
+    """
+    Fungsi untuk mengirim prompt ke Groq AI dan mengembalikan teks jawabannya.
+    history adalah list pesan dari thread chat tersimpan (boleh kosong) yang dipakai sebagai konteks.
+    Permintaan dikirim lewat AIScheduler bersama (rate limit, prioritas, pembatalan per owner);
+    pembatalan (CancelledError) dan error diteruskan ke pemanggil.
+    """
+    messages = [{"role": "system", "content": "okey."}] + list(history) + [{"role": "user", "content": prompt}]
+    response = get_ai_scheduler().submit(messages, priority=priority, owner=owner).result()
+    # Ambil isi jawaban dari response Groq
+    if hasattr(response, "choices") and response.choices:
+        return response.choices[0].message.content
+    return "Tidak ada jawaban dari AI."
+
+def ask_groq_ai(prompt, history, priority=AI_PRIORITY_INTERACTIVE, owner=None):
+    """Seperti request_groq_reply, tetapi pembatalan dan error dikembalikan sebagai teks jawaban."""
+    try:
+        return request_groq_reply(prompt, history, priority=priority, owner=owner)
+    except CancelledError:
+        return "Permintaan ke AI dibatalkan."
     except Exception as e:
         return f"Terjadi error saat menghubungi AI: {e}"
 
-class ThesisApp:
+def extract_text_from_file(file_path):
+    """
+    Fungsi untuk mengekstrak teks dari file skripsi (PDF, DOC, DOCX).
+    Mengembalikan string kosong jika gagal.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    with trace_span("extract", ext, file=os.path.basename(file_path)) as span:
+        text = _extract_text(file_path, ext)
+        if span is not _NULL_SPAN:
+            span.set(bytes=os.path.getsize(file_path) if os.path.exists(file_path) else 0, chars=len(text))
+    return text
 
-    def __init__(self, root):
-        # Inisialisasi jendela utama
-        self.root = root
-        self.root.title(APP_TITLE)
-        self.root.geometry(APP_GEOMETRY)
-        self.root.configure(bg=APP_BG_COLOR)
+def _extract_text(file_path, ext):
+    try:
+        if ext == ".pdf":
+            try:
+                import PyPDF2
+            except ImportError:
+                messagebox.showerror("Error", "PyPDF2 belum terinstall. Install dengan 'pip install PyPDF2'")
+                return ""
+            text = ""
+            with open(file_path, "rb") as f:
+                reader = PyPDF2.PdfReader(f)
+                for page in reader.pages:
+                    text += page.extract_text() or ""
+            return text
+        elif ext in [".doc", ".docx"]:
+            try:
+                import docx
+            except ImportError:
+                messagebox.showerror("Error", "python-docx belum terinstall. Install dengan 'pip install python-docx'")
+                return ""
+            doc = docx.Document(file_path)
+            return "\n".join([p.text for p in doc.paragraphs])
+        else:
+            messagebox.showerror("Error", "Format file tidak didukung. Hanya PDF, DOC, DOCX.")
+            return ""
+    except Exception as e:
+        messagebox.showerror("Error", f"Gagal membaca file: {e}")
+        return ""
 
-        self.setup_style()  # Set tema dan gaya widget
+def build_bab_prompt(selected_bab, skripsi_text, user_msg, chapter_text=None):
+    """
+    Fungsi untuk menyusun prompt AI dari bab terpilih, isi skripsi dan pertanyaan user.
+    Jika chapter_text (hasil segmentasi) tersedia, hanya teks bab tersebut yang dikirim.
+    """
+    source_text = chapter_text if chapter_text else skripsi_text
+    # Batasi panjang teks agar tidak terlalu besar untuk API (misal 2000 kata)
+    max_words = 2000
+    skripsi_words = source_text.split()
+    if len(skripsi_words) > max_words:
+        skripsi_excerpt = " ".join(skripsi_words[:max_words]) + "\n\n[Isi skripsi dipotong untuk ringkasan.]"
+    else:
+        skripsi_excerpt = source_text
 
+    if chapter_text:
+        intro = "Berikut adalah isi bab tersebut dari skripsi saya (dari file yang diupload):\n"
+    else:
+        intro = "Berikut adalah ringkasan isi skripsi saya (dari file yang diupload):\n"
+    return (
+        f"Saya sedang mengerjakan skripsi pada bab '{selected_bab}'. "
+        f"{intro}"
+        f"{skripsi_excerpt}\n\n"
+        f"Berikut pertanyaan saya: {user_msg}\n"
+        f"Jawablah dengan relevan terhadap bab tersebut dan isi skripsi saya di atas."
+    )
+
+# --- Segmentasi bab skripsi ---
+ROMAN_NUMERALS = {"I": 1, "II": 2, "III": 3, "IV": 4, "V": 5, "VI": 6, "VII": 7, "VIII": 8, "IX": 9, "X": 10}
+CHAPTER_TITLE_KEYWORDS = [
+    (1, ("pendahuluan",)),
+    (2, ("tinjauan pustaka", "landasan teori", "kajian pustaka", "kajian teori")),
+    (3, ("metodologi", "metode penelitian", "analisis dan perancangan")),
+    (4, ("hasil dan pembahasan", "hasil penelitian", "implementasi dan pengujian")),
+    (5, ("kesimpulan", "penutup")),
+]
+# "BAB I", "BAB 2 TINJAUAN PUSTAKA", "Bab III Metodologi" di awal baris
+CHAPTER_HEADING_RE = re.compile(r"^[ \t]*(?:BAB|Bab)[ \t]+([IVX]+|\d{1,2})\b[ \t.:\-]*([^\n]*)$", re.MULTILINE)
+# Judul bab tanpa kata "BAB" (misal baris "TINJAUAN PUSTAKA" saja)
+CHAPTER_TITLE_RE = re.compile(
+    r"^[ \t]*(" + "|".join(k for _, keys in CHAPTER_TITLE_KEYWORDS for k in keys) + r")[ \t]*$",
+    re.MULTILINE | re.IGNORECASE
+)
+BACK_MATTER_RE = re.compile(r"^[ \t]*(DAFTAR PUSTAKA|DAFTAR REFERENSI|LAMPIRAN)\b[^\n]*$", re.MULTILINE)
+# Baris daftar isi: "BAB I PENDAHULUAN ........ 1"
+TOC_LINE_RE = re.compile(r"(\.{4,}|…{2,})\s*\d+\s*$")
+
+def chapter_number_from_title(title):
+    """
+    Fungsi untuk menebak nomor bab (1, 2, ...) dari judul seperti
+    "Bab 2 Tinjauan Pustaka" atau "TINJAUAN PUSTAKA". None jika tidak dikenali.
+    """
+    match = re.search(r"\bbab\s+([ivx]+|\d{1,2})\b", title, re.IGNORECASE)
+    if match:
+        token = match.group(1).upper()
+        return int(token) if token.isdigit() else ROMAN_NUMERALS.get(token)
+    lowered = title.lower()
+    for number, keywords in CHAPTER_TITLE_KEYWORDS:
+        if any(k in lowered for k in keywords):
+            return number
+    return None
+
+def segment_chapters(text):
+    """
+    Fungsi untuk memecah teks skripsi menjadi bagian per bab berdasarkan pola heading.
+    Mengembalikan list dict {number, heading, start, end}; number None untuk
+    Daftar Pustaka/Lampiran. Heading dari daftar isi diabaikan: untuk setiap nomor bab
+    dipilih bagian terpanjang.
+    """
+    boundaries = []
+    for match in CHAPTER_HEADING_RE.finditer(text):
+        if TOC_LINE_RE.search(match.group(0)):
+            continue
+        token = match.group(1).upper()
+        number = int(token) if token.isdigit() else ROMAN_NUMERALS.get(token)
+        if number is None:
+            continue
+        title = match.group(2).strip()
+        if not title:
+            # Judul biasanya berada di baris berikutnya ("BAB I\nPENDAHULUAN")
+            next_line = text[match.end():match.end() + 200].lstrip("\n").split("\n", 1)[0]
+            title = next_line.strip()
+        boundaries.append((match.start(), number, f"BAB {token} {title}".strip()))
+    if not boundaries:
+        for match in CHAPTER_TITLE_RE.finditer(text):
+            number = chapter_number_from_title(match.group(1))
+            boundaries.append((match.start(), number, match.group(1).strip().upper()))
+    for match in BACK_MATTER_RE.finditer(text):
+        if not TOC_LINE_RE.search(match.group(0)):
+            boundaries.append((match.start(), None, match.group(1).upper()))
+    boundaries.sort()
+
+    best = {}
+    for idx, (start, number, heading) in enumerate(boundaries):
+        end = boundaries[idx + 1][0] if idx + 1 < len(boundaries) else len(text)
+        key = number if number is not None else heading
+        if key not in best or end - start > best[key]["end"] - best[key]["start"]:
+            best[key] = {"number": number, "heading": heading, "start": start, "end": end}
+    return sorted(best.values(), key=lambda section: section["start"])
+
+def map_sections_to_chapters(sections, chapter_list):
+    """
+    Fungsi untuk memetakan hasil segment_chapters ke baris tabel chapters.
+    chapter_list berisi (id, chapter_name). Mengembalikan dict chapter_id -> section.
+    """
+    by_number = {s["number"]: s for s in sections if s["number"] is not None}
+    mapping = {}
+    for chapter_id, chapter_name in chapter_list:
+        number = chapter_number_from_title(chapter_name or "")
+        if number in by_number:
+            mapping[chapter_id] = by_number[number]
+    return mapping
+
+# --- Versi dokumen dan diff per bagian ---
+def section_key(heading):
+    # Kunci pencocokan bagian antar versi: nomor bab, atau judul untuk Daftar Pustaka/Lampiran
+    number = chapter_number_from_title(heading or "")
+    return f"bab-{number}" if number is not None else (heading or "").upper()
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def split_paragraphs(text):
+    # Paragraf = blok teks yang dipisah baris kosong, atau per baris jika tidak ada baris kosong
+    blocks = re.split(r"\n\s*\n", text) if "\n\n" in text else text.split("\n")
+    return [" ".join(block.split()) for block in blocks if block.strip()]
+
+def diff_section_text(old_text, new_text):
+    """
+    Fungsi untuk membandingkan dua versi teks bagian secara linear memakai hash paragraf.
+    Mengembalikan (paragraf_baru_atau_diubah, paragraf_dihapus) sesuai urutan dokumen.
+    """
+    old_paragraphs = split_paragraphs(old_text)
+    new_paragraphs = split_paragraphs(new_text)
+    old_set = set(old_paragraphs)
+    new_set = set(new_paragraphs)
+    added = [p for p in new_paragraphs if p not in old_set]
+    removed = [p for p in old_paragraphs if p not in new_set]
+    return added, removed
+
+def diff_document_sections(old_sections, new_sections):
+    """
+    Fungsi untuk diff tingkat bagian antara dua versi dokumen.
+    Setiap section berupa dict {key, heading, hash, text}. Hanya bagian yang hash-nya
+    berbeda yang dibandingkan per paragraf. Mengembalikan list perubahan
+    {key, heading, status: added/removed/changed, added, removed}.
+    """
+    old_by_key = {section["key"]: section for section in old_sections}
+    new_keys = set()
+    changes = []
+    for section in new_sections:
+        new_keys.add(section["key"])
+        old = old_by_key.get(section["key"])
+        if old is None:
+            changes.append({"key": section["key"], "heading": section["heading"], "status": "added",
+                            "added": split_paragraphs(section["text"]), "removed": []})
+        elif old["hash"] != section["hash"]:
+            added, removed = diff_section_text(old["text"], section["text"])
+            changes.append({"key": section["key"], "heading": section["heading"], "status": "changed",
+                            "added": added, "removed": removed})
+    for section in old_sections:
+        if section["key"] not in new_keys:
+            changes.append({"key": section["key"], "heading": section["heading"], "status": "removed",
+                            "added": [], "removed": split_paragraphs(section["text"])})
+    return changes
+
+def format_section_diff(changes):
+    """Fungsi untuk mengubah hasil diff_document_sections menjadi teks ringkas untuk prompt AI."""
+    lines = []
+    for change in changes:
+        lines.append(f"== {change['heading']} ({change['status']}) ==")
+        for paragraph in change["added"]:
+            lines.append(f"+ {paragraph}")
+        for paragraph in change["removed"]:
+            lines.append(f"- {paragraph}")
+        lines.append("")
+    return "\n".join(lines).strip()
+
+def build_review_prompt(selected_bab, diff_text, user_msg, baseline_label):
+    """
+    Fungsi untuk menyusun prompt mode review perubahan: hanya diff yang dikirim ke AI.
+    """
+    return (
+        f"Saya sedang mengerjakan skripsi pada bab '{selected_bab}'. "
+        f"Berikut adalah perubahan skripsi saya sejak {baseline_label} "
+        f"(baris '+' ditambahkan/diubah, baris '-' dihapus):\n"
+        f"{diff_text}\n\n"
+        f"Berikut pertanyaan saya: {user_msg}\n"
+        f"Tinjau hanya perubahan di atas dan jawab dengan relevan terhadap bab tersebut."
+    )
+
+# --- Indeks kemiripan catatan revisi (MinHash + LSH) ---
+# Permutasi MinHash = hash 64-bit shingle di-XOR dengan mask acak (seed tetap agar signature stabil antar sesi)
+_minhash_random = random.Random(20240612)
+MINHASH_MASKS = [_minhash_random.getrandbits(64) for _ in range(REVISION_LSH_BANDS * REVISION_LSH_ROWS)]
+
+def note_shingles(text, size=REVISION_SHINGLE_SIZE):
+    """
+    Fungsi untuk mengubah catatan menjadi himpunan shingle karakter.
+    Teks dinormalisasi dulu (huruf kecil, tanpa tanda baca dan stopword) supaya
+    "Tambahkan referensi terbaru." dan "tambahkan referensi yang terbaru" dianggap mirip.
+    """
+    normalized = " ".join(tokenize_terms(text)) or " ".join(text.lower().split())
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+def jaccard_similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def minhash_signature(shingles):
+    """Fungsi untuk menghitung signature MinHash (satu nilai minimum per permutasi)."""
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+              for s in shingles]
+    if not hashes:
+        return []
+    return [min([h ^ mask for h in hashes]) for mask in MINHASH_MASKS]
+
+def lsh_buckets(signature):
+    """
+    Fungsi untuk membagi signature menjadi band LSH. Mengembalikan list (band, bucket);
+    dua catatan menjadi kandidat mirip jika berbagi minimal satu (band, bucket).
+    """
+    buckets = []
+    for band in range(REVISION_LSH_BANDS if signature else 0):
+        rows = signature[band * REVISION_LSH_ROWS:(band + 1) * REVISION_LSH_ROWS]
+        digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "big") & 0x7FFFFFFFFFFFFFFF))  # muat di INTEGER SQLite
+    return buckets
+
+# --- Pustaka referensi ---
+TERM_RE = re.compile(r"[^\W\d_]{3,}")
+
+def tokenize_terms(text):
+    """Fungsi untuk memecah teks menjadi term huruf kecil tanpa stopword."""
+    return [term for term in TERM_RE.findall(text.lower()) if term not in STOPWORDS]
+
+def _file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _ingest_reference_worker(path):
+    # Dijalankan di proses worker: ekstrak teks PDF dan hitung frekuensi term
+    try:
+        import PyPDF2
+        with open(path, "rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    except Exception as e:
+        return path, None, None, str(e)
+    return path, text, Counter(tokenize_terms(text)), None
+
+class ReferenceLibrary:
+    """
+    Pustaka referensi persisten: teks semua jurnal disimpan berurutan di corpus.bin
+    dan statistik term (posting list) di index.db. Pencarian memakai BM25 lewat index
+    SQLite dan membaca potongan teks melalui mmap, sehingga ratusan paper tidak perlu
+    dimuat ke memori.
+    """
+
+    def __init__(self, directory=REFERENCE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, REFERENCE_INDEX_DB)
+        self.corpus_path = os.path.join(directory, REFERENCE_CORPUS_FILE)
+        os.makedirs(directory, exist_ok=True)
+        conn = self.connect()
         try:
-            # Koneksi ke SQLite dan inisialisasi database
-            self.conn = sqlite3.connect(DB_NAME)
-            self.conn.execute("PRAGMA foreign_keys = ON")
-            self.cursor = self.conn.cursor()
-            self.create_tables()  # Membuat tabel jika belum ada
-        except Exception as e:
-            messagebox.showerror("Database Error", str(e))
-            self.root.destroy()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS reference_papers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_name TEXT,
+                    file_hash TEXT UNIQUE,
+                    corpus_offset INTEGER,
+                    corpus_length INTEGER,
+                    term_count INTEGER,
+                    added_at TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS reference_terms (
+                    term TEXT,
+                    paper_id INTEGER,
+                    tf INTEGER,
+                    PRIMARY KEY (term, paper_id)
+                ) WITHOUT ROWID
+            """)
+            conn.commit()
+        finally:
+            conn.close()
 
-        # Cek notifikasi bab (H-3 dan lewat deadline)
-        self.check_chapter_deadlines()
+    def connect(self):
+        conn = traced_connection(sqlite3.connect(self.index_path))
+        conn.execute(f"PRAGMA mmap_size = {REFERENCE_MMAP_SIZE}")
+        return conn
 
-        self.build_menu()  # Tampilkan menu utama
+    def paper_count(self):
+        conn = self.connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM reference_papers").fetchone()[0]
+        finally:
+            conn.close()
+
+    def ingest_folder(self, folder, progress=None, workers=REFERENCE_WORKERS):
+        """
+        Impor semua PDF di folder secara paralel di beberapa proses worker.
+        File yang sudah pernah diimpor (hash sama) dilewati. progress(selesai, total, nama_file)
+        dipanggil setiap satu file selesai. Mengembalikan (jumlah_baru, daftar_error).
+        """
+        paths = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(folder)
+            for name in names if name.lower().endswith(".pdf")
+        )
+        conn = self.connect()
+        try:
+            known = {row[0] for row in conn.execute("SELECT file_hash FROM reference_papers")}
+            pending = {}
+            for path in paths:
+                file_hash = _file_sha256(path)
+                if file_hash not in known:
+                    known.add(file_hash)
+                    pending[path] = file_hash
+            added, errors = 0, []
+            if not pending:
+                return added, errors
+            with ProcessPoolExecutor(max_workers=workers) as pool, open(self.corpus_path, "ab") as corpus:
+                futures = [pool.submit(_ingest_reference_worker, path) for path in pending]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    path, text, terms, error = future.result()
+                    if error or not text:
+                        errors.append((os.path.basename(path), error or "Teks kosong"))
+                    else:
+                        data = text.encode("utf-8")
+                        offset = corpus.seek(0, os.SEEK_END)
+                        corpus.write(data)
+                        corpus.flush()
+                        with trace_span("ingest", os.path.basename(path), terms=len(terms), bytes=len(data)):
+                            cur = conn.execute("""
+                                INSERT INTO reference_papers
+                                    (file_name, file_hash, corpus_offset, corpus_length, term_count, added_at)
+                                VALUES (?, ?, ?, ?, ?, ?)
+                            """, (os.path.basename(path), pending[path], offset, len(data), sum(terms.values()),
+                                  datetime.now().isoformat(timespec="seconds")))
+                            conn.executemany(
+                                "INSERT INTO reference_terms (term, paper_id, tf) VALUES (?, ?, ?)",
+                                ((term, cur.lastrowid, tf) for term, tf in terms.items())
+                            )
+                            conn.commit()
+                        added += 1
+                    if progress:
+                        progress(done, len(pending), os.path.basename(path))
+            return added, errors
+        finally:
+            conn.close()
+
+    def search(self, question, top_k=REFERENCE_TOP_K, passage_chars=REFERENCE_PASSAGE_CHARS):
+        """
+        Cari paper paling relevan (BM25) dan ambil satu potongan teks terbaik dari masing-masing.
+        Mengembalikan list dict {file_name, score, passage}.
+        """
+        terms = sorted(set(tokenize_terms(question)))
+        if not terms or not os.path.exists(self.corpus_path) or not os.path.getsize(self.corpus_path):
+            return []
+        conn = self.connect()
+        try:
+            n_papers, avg_len = conn.execute(
+                "SELECT COUNT(*), AVG(term_count) FROM reference_papers"
+            ).fetchone()
+            if not n_papers:
+                return []
+            k1, b = 1.5, 0.75
+            scores = Counter()
+            lengths = {}
+            idf_by_term = {}
+            for term in terms:
+                postings = conn.execute("""
+                    SELECT t.paper_id, t.tf, p.term_count FROM reference_terms t
+                    JOIN reference_papers p ON p.id = t.paper_id
+                    WHERE t.term = ?
+                """, (term,)).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_papers - len(postings) + 0.5) / (len(postings) + 0.5))
+                idf_by_term[term] = idf
+                for paper_id, tf, length in postings:
+                    lengths[paper_id] = length
+                    scores[paper_id] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / (avg_len or 1)))
+            if not scores:
+                return []
+            best = scores.most_common(top_k)
+            placeholders = ",".join("?" * len(best))
+            rows = {
+                row[0]: row[1:] for row in conn.execute(
+                    f"SELECT id, file_name, corpus_offset, corpus_length FROM reference_papers WHERE id IN ({placeholders})",
+                    [paper_id for paper_id, _ in best]
+                )
+            }
+        finally:
+            conn.close()
+
+        results = []
+        with open(self.corpus_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as corpus:
+            for paper_id, score in best:
+                file_name, offset, length = rows[paper_id]
+                text = corpus[offset:offset + length].decode("utf-8", errors="ignore")
+                results.append({
+                    "file_name": file_name,
+                    "score": score,
+                    "passage": best_passage(text, idf_by_term, passage_chars),
+                })
+        return results
+
+def best_passage(text, idf_by_term, passage_chars):
+    """
+    Fungsi untuk memilih jendela teks sepanjang passage_chars dengan bobot idf term
+    pertanyaan terbanyak (two-pointer atas posisi kemunculan term).
+    """
+    lowered = text.lower()
+    hits = []
+    for term, idf in idf_by_term.items():
+        for match in re.finditer(r"\b" + re.escape(term) + r"\b", lowered):
+            hits.append((match.start(), idf))
+    if not hits:
+        return " ".join(text[:passage_chars].split())
+    hits.sort()
+    best_start, best_score, window_score, left = hits[0][0], 0.0, 0.0, 0
+    for right in range(len(hits)):
+        window_score += hits[right][1]
+        while hits[right][0] - hits[left][0] > passage_chars:
+            window_score -= hits[left][1]
+            left += 1
+        if window_score > best_score:
+            best_score, best_start = window_score, hits[left][0]
+    start = max(0, best_start - passage_chars // 4)
+    return " ".join(text[start:start + passage_chars].split())
+
+def format_reference_passages(passages):
+    """Fungsi untuk menyusun kutipan pustaka referensi yang disertakan dalam prompt AI."""
+    lines = ["Kutipan pustaka referensi yang relevan (sebutkan sumber dengan nomor [n] jika dipakai):"]
+    for idx, passage in enumerate(passages, start=1):
+        lines.append(f"[{idx}] {passage['file_name']}: \"{passage['passage']}\"")
+    return "\n".join(lines)
+
+# --- Ringkasan skripsi (dibuat sekali per upload, dipakai di setiap pertanyaan chat) ---
+def build_summary_request(heading, text):
+    """Fungsi untuk menyusun prompt ringkasan satu bab (atau satu potongan bab)."""
+    return (
+        f"Ringkas bagian skripsi berikut ('{heading}') dalam maksimal 200 kata. "
+        f"Pertahankan tujuan, metode, temuan, istilah kunci, angka penting dan sitasi yang dipakai.\n\n"
+        f"{text}"
+    )
+
+def build_document_summary_request(chapter_summaries):
+    """Fungsi untuk menyusun prompt ringkasan seluruh skripsi dari ringkasan per bab."""
+    body = "\n\n".join(f"== {heading} ==\n{summary}" for heading, summary in chapter_summaries)
+    return (
+        "Berikut ringkasan tiap bab sebuah skripsi. Buat ringkasan keseluruhan skripsi dalam "
+        "maksimal 250 kata: judul/topik, rumusan masalah, metode, hasil utama dan kesimpulan.\n\n"
+        f"{body}"
+    )
+
+def submit_summary(prompt, owner=None):
+    """
+    Fungsi untuk mengantrikan permintaan ringkasan ke AIScheduler dengan prioritas background
+    (pertanyaan chat tetap didahulukan). Mengembalikan Future berisi response Groq.
+    """
+    messages = [{"role": "system", "content": "okey."}, {"role": "user", "content": prompt}]
+    return get_ai_scheduler().submit(messages, priority=AI_PRIORITY_BACKGROUND, owner=owner)
+
+def summary_text(response):
+    # Error dilempar sebagai exception (bukan teks) agar tidak ikut tersimpan di cache ringkasan
+    if not response.choices or not response.choices[0].message.content:
+        raise ValueError("AI tidak mengembalikan ringkasan.")
+    return response.choices[0].message.content.strip()
+
+def split_words(text, chunk_words=SUMMARY_CHUNK_WORDS):
+    words = text.split()
+    return [" ".join(words[i:i + chunk_words]) for i in range(0, len(words), chunk_words)]
+
+def select_passages(text, question, k=CHAT_PASSAGES, passage_chars=CHAT_PASSAGE_CHARS):
+    """
+    Fungsi untuk memilih k paragraf teks asli yang paling relevan dengan pertanyaan
+    (skor = jumlah idf term pertanyaan yang muncul di paragraf), dalam urutan dokumen.
+    Mengembalikan list kosong jika tidak ada term pertanyaan yang cocok.
+    """
+    question_terms = set(tokenize_terms(question))
+    if not question_terms or not text:
+        return []
+    paragraphs = split_paragraphs(text)
+    paragraph_terms = [set(tokenize_terms(paragraph)) & question_terms for paragraph in paragraphs]
+    df = Counter(term for terms in paragraph_terms for term in terms)
+    idf = {term: math.log(1 + len(paragraphs) / count) for term, count in df.items()}
+    scored = [(sum(idf[term] for term in terms), idx) for idx, terms in enumerate(paragraph_terms) if terms]
+    best = sorted(idx for _, idx in sorted(scored, reverse=True)[:k])
+    return [paragraphs[idx][:passage_chars] for idx in best]
+
+def build_summary_prompt(selected_bab, document_summary, chapter_summary, passages, user_msg):
+    """
+    Fungsi untuk menyusun prompt chat dari ringkasan (bukan teks mentah skripsi):
+    ringkasan keseluruhan, ringkasan bab terpilih, dan beberapa potongan asli yang relevan.
+    """
+    parts = [f"Saya sedang mengerjakan skripsi pada bab '{selected_bab}'."]
+    if document_summary:
+        parts.append(f"Ringkasan keseluruhan skripsi saya:\n{document_summary}")
+    if chapter_summary:
+        parts.append(f"Ringkasan bab tersebut:\n{chapter_summary}")
+    if passages:
+        parts.append("Kutipan asli bab yang relevan dengan pertanyaan:\n" + "\n".join(
+            f"- \"{passage}\"" for passage in passages
+        ))
+    parts.append(f"Berikut pertanyaan saya: {user_msg}\n"
+                 f"Jawablah dengan relevan terhadap bab tersebut dan isi skripsi saya di atas.")
+    return "\n\n".join(parts)
+
+def build_chat_prompt(selected_bab, skripsi_text, user_msg, chapter_text=None,
+                      document_summary=None, chapter_summary=None, review_diff=None):
+    """
+    Fungsi untuk memilih jenis prompt chat (dipakai jendela chat dan server API):
+    diff perubahan jika review_diff diberikan, ringkasan + potongan relevan jika
+    ringkasan tersedia, atau teks bab/skripsi lengkap.
+    """
+    if review_diff:
+        return build_review_prompt(selected_bab, review_diff[1], user_msg, review_diff[0])
+    if chapter_summary or (document_summary and chapter_text is None):
+        # Ringkasan + beberapa potongan asli yang relevan, bukan seluruh teks bab
+        passages = select_passages(chapter_text or skripsi_text, user_msg)
+        return build_summary_prompt(selected_bab, document_summary, chapter_summary, passages, user_msg)
+    return build_bab_prompt(selected_bab, skripsi_text, user_msg, chapter_text=chapter_text)
+
+# --- Pemeriksa sitasi dan Daftar Pustaka (lokal, tanpa AI) ---
+CITATION_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}[a-z]?\b|\bn\.d\.|\bt\.t\.")
+# Isi kurung yang memuat tahun: "(Sugiyono, 2019)", "(Wijaya dkk., 2020; Pratama, 2018a)", "(2019)"
+CITATION_PAREN_RE = re.compile(r"\(([^()\n]{0,300}?(?:(?:19|20)\d{2}|n\.d\.|t\.t\.)[^()\n]{0,100})\)")
+# Nama penulis tepat sebelum "(2019)" pada sitasi naratif: "Sugiyono (2019)", "Wijaya dan Santoso (2020)"
+CITATION_NARRATIVE_RE = re.compile(
+    r"(?P<names>(?:[A-Z][\w'’\-]*\s+){0,3}[A-Z][\w'’\-]*)"
+    r"(?:\s+(?:dkk\.?|et al\.?))?(?:\s*(?:dan|and|&)\s+[A-Z][\w'’\-]*(?:\s+(?:dkk\.?|et al\.?))?)?\s*$"
+)
+CITATION_AUTHOR_SPLIT_RE = re.compile(r"\s+(?:dan|and)\s+|\s*&\s*|\s*,\s*|\s+(?:dkk|et al)\b\.?")
+# Awal entri Daftar Pustaka: nama penulis diikuti koma/titik, dan baris tersebut memuat tahun
+BIBLIOGRAPHY_ENTRY_RE = re.compile(r"^[ \t]*[A-Z][\w'’\-]*(?:[ \t]+[A-Z][\w'’\-]*)*[,.]")
+BIBLIOGRAPHY_HEADINGS = ("DAFTAR PUSTAKA", "DAFTAR REFERENSI")
+CITATION_QUESTION_RE = re.compile(r"\b(sitasi|kutipan|citations?|pustaka)\b", re.IGNORECASE)
+CITATION_CHECK_RE = re.compile(r"\b(konsisten|cocok|sesuai|lengkap|cek|periksa|check|consistent|hilang|terpakai)\b",
+                               re.IGNORECASE)
+CITATION_REPORT_LIMIT = 30  # jumlah baris maksimum per daftar di laporan
+
+def citation_key(author, year):
+    # Kunci hash: nama belakang penulis pertama (huruf saja, huruf kecil) + tahun
+    return "".join(ch for ch in author.casefold() if ch.isalpha()), year.lower()
+
+def first_author(author):
+    # "Wijaya dkk." / "Wijaya & Santoso" / "Wijaya, A., & Santoso, B." -> "Wijaya"
+    words = re.split(r"[.(]", CITATION_AUTHOR_SPLIT_RE.split(author.strip(), 1)[0], 1)[0].split()
+    while len(words) > 1 and re.fullmatch(r"[A-Z]{1,2}", words[-1]):
+        words.pop()  # inisial tanpa koma: "Smith J" -> "Smith"
+    return " ".join(words)
+
+def find_bibliography(text):
+    """Fungsi untuk mencari bagian Daftar Pustaka; mengembalikan (start, end) atau None."""
+    for section in segment_chapters(text):
+        if section["number"] is None and section["heading"].startswith(BIBLIOGRAPHY_HEADINGS):
+            return section["start"], section["end"]
+    return None
+
+def parse_bibliography(text):
+    """
+    Fungsi untuk memecah teks Daftar Pustaka menjadi entri. Baris baru dianggap entri baru
+    jika diawali nama penulis dan memuat tahun; selain itu sambungan entri sebelumnya.
+    Mengembalikan list dict {key, author, year, entry}.
+    """
+    entries = []
+    lines = text.split("\n")[1:]  # baris pertama = heading
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        year = CITATION_YEAR_RE.search(line) if BIBLIOGRAPHY_ENTRY_RE.match(line) else None
+        if year:
+            author = first_author(line[:year.start()])
+            entries.append({"key": citation_key(author, year.group(0)), "author": author,
+                            "year": year.group(0), "entry": line})
+        elif entries:
+            entries[-1]["entry"] += " " + line
+    return entries
+
+def extract_citations(text, known_keys=()):
+    """
+    Fungsi untuk mengambil sitasi (Penulis, Tahun) dari teks dalam satu kali scan.
+    Sitasi naratif "Nama (Tahun)" dicocokkan ke known_keys dengan mencoba 1-4 kata
+    terakhir sebelum kurung (untuk penulis lembaga seperti "Badan Pusat Statistik").
+    Mengembalikan dict key -> {author, year, count}.
+    """
+    citations = {}
+
+    def add(author, year):
+        key = citation_key(author, year)
+        if not key[0]:
+            return
+        entry = citations.setdefault(key, {"author": author, "year": year, "count": 0})
+        entry["count"] += 1
+
+    for match in CITATION_PAREN_RE.finditer(text):
+        for part in match.group(1).split(";"):
+            year = CITATION_YEAR_RE.search(part)
+            if not year:
+                continue
+            years = CITATION_YEAR_RE.findall(part[year.start():])
+            author = part[:year.start()].strip(" ,")
+            # Buang kata pengantar huruf kecil: "(lihat Sugiyono, 2019)"
+            author = re.sub(r"^(?:[a-z][\w.]*\s+)+", "", author)
+            if author:
+                if not author[0].isupper() or len(author.split()) > 6:
+                    continue
+                author = first_author(author)
+            elif match.start() > 0:
+                narrative = CITATION_NARRATIVE_RE.search(text, max(0, match.start() - 120), match.start())
+                if not narrative:
+                    continue
+                names = narrative.group("names").split()
+                candidates = [" ".join(names[i:]) for i in range(len(names))]
+                author = next((name for name in candidates
+                               if citation_key(name, years[0]) in known_keys), names[-1])
+            else:
+                continue
+            for cited_year in years:
+                add(author, cited_year)
+    return citations
+
+def check_citations(text):
+    """
+    Fungsi untuk memeriksa konsistensi sitasi dan Daftar Pustaka secara lokal.
+    Kedua sisi diindeks dengan dict (nama belakang, tahun), lalu dibandingkan:
+    sitasi tanpa entri, entri yang tidak pernah disitasi, dan entri ganda.
+    """
+    bounds = find_bibliography(text)
+    references = {}
+    duplicates = []
+    if bounds:
+        for entry in parse_bibliography(text[bounds[0]:bounds[1]]):
+            if entry["key"] in references:
+                duplicates.append(entry)
+            else:
+                references[entry["key"]] = entry
+        body_parts = (text[:bounds[0]], text[bounds[1]:])
+    else:
+        body_parts = (text,)
+
+    citations = {}
+    for part in body_parts:
+        for key, cited in extract_citations(part, references).items():
+            if key in citations:
+                citations[key]["count"] += cited["count"]
+            else:
+                citations[key] = cited
+
+    years_by_author = {}
+    for author_key, year in references:
+        years_by_author.setdefault(author_key, []).append(year)
+    unmatched = [
+        dict(cited, other_years=sorted(years_by_author.get(key[0], [])))
+        for key, cited in citations.items() if key not in references
+    ]
+    unused = [entry for key, entry in references.items() if key not in citations]
+    return {
+        "has_bibliography": bounds is not None,
+        "citations": len(citations),
+        "references": len(references),
+        "unmatched": unmatched,
+        "unused": unused,
+        "duplicates": duplicates,
+    }
+
+def is_citation_question(question):
+    # "Apakah sitasi saya sudah konsisten?" dijawab lokal oleh check_citations
+    return bool(CITATION_QUESTION_RE.search(question) and CITATION_CHECK_RE.search(question))
+
+def format_citation_report(report, limit=CITATION_REPORT_LIMIT):
+    """Fungsi untuk mengubah hasil check_citations menjadi teks jawaban chat."""
+    if not report["has_bibliography"]:
+        return ("Bagian DAFTAR PUSTAKA tidak ditemukan di skripsi, sehingga sitasi belum bisa dicocokkan. "
+                f"Ditemukan {report['citations']} sitasi berbeda di teks.")
+    lines = [f"Pemeriksaan lokal: {report['citations']} sitasi berbeda di teks, "
+             f"{report['references']} entri di Daftar Pustaka."]
+
+    def section(title, items, describe):
+        if not items:
+            return
+        lines.append("")
+        lines.append(f"{title} ({len(items)}):")
+        lines.extend(f"- {describe(item)}" for item in items[:limit])
+        if len(items) > limit:
+            lines.append(f"- ... dan {len(items) - limit} lainnya")
+
+    def describe_unmatched(item):
+        text = f"{item['author']}, {item['year']} (disitasi {item['count']}x)"
+        if item["other_years"]:
+            text += f" — di Daftar Pustaka tercatat tahun {', '.join(item['other_years'])}"
+        return text
+
+    section("Sitasi tanpa entri Daftar Pustaka", report["unmatched"], describe_unmatched)
+    section("Entri Daftar Pustaka yang tidak pernah disitasi", report["unused"],
+            lambda entry: entry["entry"][:160])
+    section("Entri Daftar Pustaka ganda", report["duplicates"], lambda entry: entry["entry"][:160])
+    if not (report["unmatched"] or report["unused"] or report["duplicates"]):
+        lines.append("Semua sitasi cocok dengan Daftar Pustaka dan tidak ada entri yang tidak terpakai.")
+    return "\n".join(lines)
+
+# --- Backup dan restore database ---
+def list_backups(backup_dir=BACKUP_DIR, db_path=DB_NAME):
+    """Fungsi untuk mendaftar file backup milik db_path, terbaru lebih dulu."""
+    prefix = os.path.splitext(os.path.basename(db_path))[0] + "-"
+    if not os.path.isdir(backup_dir):
+        return []
+    names = [name for name in os.listdir(backup_dir) if name.startswith(prefix) and name.endswith(".db")]
+    return [os.path.join(backup_dir, name) for name in sorted(names, reverse=True)]
+
+def rotate_backups(backup_dir=BACKUP_DIR, db_path=DB_NAME, keep=BACKUP_KEEP):
+    # Simpan hanya `keep` backup terbaru
+    for path in list_backups(backup_dir, db_path)[keep:]:
+        os.remove(path)
+
+def backup_database(db_path=DB_NAME, backup_dir=BACKUP_DIR, pages_per_step=BACKUP_PAGES_PER_STEP,
+                    step_pause=BACKUP_STEP_PAUSE, keep=BACKUP_KEEP, progress=None):
+    """
+    Fungsi untuk membuat snapshot database dengan online backup API SQLite, sedikit demi
+    sedikit (pages_per_step halaman per langkah, diselingi jeda). Memakai koneksi sendiri
+    sehingga aman dijalankan di thread background.
+    Pada mode WAL, snapshot baca ditahan selama backup: hasilnya konsisten, writer lain
+    tidak terblokir, dan backup tidak perlu diulang dari awal setiap kali ada penulisan.
+    File ditulis ke .partial lalu di-rename, jadi backup yang gagal tidak pernah terlihat.
+    keep=None melewati rotasi (dipakai untuk backup pengaman sebelum restore).
+    progress(halaman_selesai, total_halaman) dipanggil dari thread backup.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    name = f"{os.path.splitext(os.path.basename(db_path))[0]}-{datetime.now():%Y%m%d-%H%M%S}.db"
+    target = os.path.join(backup_dir, name)
+    partial = target + ".partial"
+
+    def on_step(status, remaining, total):
+        if progress:
+            progress(total - remaining, total)
+        time.sleep(step_pause)
+
+    with trace_span("backup", "backup_database", pages_per_step=pages_per_step) as span:
+        source = traced_connection(sqlite3.connect(db_path))
+        dest = traced_connection(sqlite3.connect(partial))
+        try:
+            if source.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            source.backup(dest, pages=pages_per_step, progress=on_step)
+        except BaseException:
+            dest.close()
+            os.remove(partial)
+            raise
+        finally:
+            source.close()
+        dest.close()
+        os.replace(partial, target)
+        span.set(bytes=os.path.getsize(target))
+    if keep is not None:
+        rotate_backups(backup_dir, db_path, keep)
+    return target
+
+def restore_database(conn, backup_path):
+    """
+    Fungsi untuk mengembalikan isi database dari file backup ke koneksi conn
+    (dijalankan di thread pemilik conn). File backup dicek integritasnya dulu.
+    """
+    source = traced_connection(sqlite3.connect(f"file:{backup_path}?mode=ro", uri=True))
+    try:
+        if source.execute("PRAGMA integrity_check").fetchone()[0] != "ok":
+            raise ValueError(f"File backup rusak: {os.path.basename(backup_path)}")
+        conn.commit()
+        source.backup(conn)
+    finally:
+        source.close()
+
+# --- Lampiran konsultasi/revisi (blob content-addressed) ---
+class AttachmentStore:
+    """
+    Penyimpanan file lampiran berdasarkan isi: setiap blob disimpan sekali di
+    <directory>/<2 karakter hash>/<sha256>, sehingga file yang diupload berulang kali
+    tidak menambah ukuran penyimpanan. Penulisan di-stream per potongan (memori tetap)
+    dan pembacaan memakai mmap. Metadata (nama file, pemilik) disimpan di database.
+    """
+
+    def __init__(self, directory=ATTACHMENT_DIR):
+        self.directory = directory
+
+    def blob_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def has_blob(self, digest):
+        return os.path.exists(self.blob_path(digest))
+
+    def put(self, path, chunk_size=ATTACHMENT_CHUNK_SIZE):
+        """
+        Simpan file ke store. Hash dihitung dulu tanpa menulis apa pun; file yang isinya
+        sudah ada (duplikat) tidak disalin lagi. Blob baru ditulis ke file .partial sambil
+        di-hash ulang, lalu di-rename. Mengembalikan (sha256, ukuran, baru).
+        """
+        digest = _file_sha256(path, chunk_size)
+        target = self.blob_path(digest)
+        if os.path.exists(target):
+            return digest, os.path.getsize(target), False
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        partial = f"{target}.{threading.get_ident()}.partial"
+        hasher = hashlib.sha256()
+        size = 0
+        with trace_span("attachment", "put", file=os.path.basename(path)) as span:
+            try:
+                with open(path, "rb") as source, open(partial, "wb") as dest:
+                    for chunk in iter(lambda: source.read(chunk_size), b""):
+                        hasher.update(chunk)
+                        dest.write(chunk)
+                        size += len(chunk)
+                    dest.flush()
+                    os.fsync(dest.fileno())
+            except BaseException:
+                if os.path.exists(partial):
+                    os.remove(partial)
+                raise
+            if hasher.hexdigest() != digest:
+                # File berubah di antara hashing dan penyalinan: simpan sesuai isi yang tersalin
+                digest = hasher.hexdigest()
+                target = self.blob_path(digest)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(partial, target)
+            span.set(bytes=size)
+        return digest, size, True
+
+    def open_blob(self, digest):
+        """
+        Buka blob sebagai mmap read-only (dipakai dengan `with`). Blob kosong
+        dikembalikan sebagai bytes kosong karena file 0 byte tidak bisa di-mmap.
+        """
+        path = self.blob_path(digest)
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"")
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def export(self, digest, dest_path, chunk_size=ATTACHMENT_CHUNK_SIZE):
+        # Salin blob ke dest_path lewat mmap, per potongan
+        with self.open_blob(digest) as data, open(dest_path, "wb") as dest:
+            for offset in range(0, len(data), chunk_size):
+                dest.write(data[offset:offset + chunk_size])
+        return dest_path
+
+    def remove(self, digest):
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            os.remove(path)
+
+# --- Store bab bersama (dipakai semua halaman) ---
+class ChapterStore:
+    """
+    Cache data bab di memori yang dipakai bersama oleh semua halaman, hanya untuk bab
+    milik satu workspace (default WORKSPACE) agar sama dengan penghitung progress.
+    Ditulis lewat add/mark_done/set_target_date/delete sehingga cache dan database selalu
+    sama; operasi massal dijalankan dengan satu executemany dalam satu transaksi.
+    Setiap perubahan dipublikasikan ke subscriber sebagai (event, chapters) dengan event
+    "added", "updated" atau "deleted" dan chapters = list (id, nama, target, status).
+    Event "reset" (dari reload) berarti seluruh data diganti; chapters berisi semua bab.
+    Semua akses terjadi di thread Tk.
+    """
+
+    def __init__(self, conn, cursor, workspace=WORKSPACE):
+        self.conn = conn
+        self.cursor = cursor
+        self.workspace = workspace
+        self._chapters = None  # id -> (id, chapter_name, target_date, status), urut id
+        self._ids_by_name = {}  # nama bab -> id, unik per workspace
+        self._subscribers = []
+
+    def _load(self):
+        if self._chapters is None:
+            self.cursor.execute(SQL_REFRESH_CHAPTERS, (self.workspace,))
+            self._chapters = {row[0]: row for row in self.cursor.fetchall()}
+            self._ids_by_name = {row[1]: row[0] for row in self._chapters.values()}
+        return self._chapters
+
+    def invalidate(self):
+        self._chapters = None
+        self._ids_by_name = {}
+
+    def reload(self):
+        # Untuk perubahan tabel chapters di luar store (mis. restore backup): muat ulang lalu beri tahu subscriber
+        self.invalidate()
+        chapters = self.chapters()
+        self._publish("reset", chapters)
+        return chapters
+
+    def chapters(self):
+        return list(self._load().values())
+
+    def chapter_list(self):
+        return [(chapter_id, row[1]) for chapter_id, row in self._load().items()]
+
+    def names(self):
+        return [row[1] for row in self._load().values()]
+
+    def get(self, chapter_id):
+        return self._load().get(chapter_id)
+
+    def id_for(self, chapter_name):
+        self._load()
+        return self._ids_by_name.get(chapter_name)
+
+    def subscribe(self, callback):
+        # Mengembalikan fungsi untuk berhenti berlangganan (panggil saat jendela ditutup)
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback) if callback in self._subscribers else None
+
+    def subscribe_widget(self, widget, callback):
+        # Berlangganan selama widget masih ada; otomatis berhenti saat widget dihancurkan
+        unsubscribe = self.subscribe(callback)
+        widget.bind("<Destroy>", lambda event: unsubscribe() if event.widget is widget else None, add="+")
+        return unsubscribe
+
+    def _publish(self, event, chapters):
+        if not chapters and event != "reset":
+            return
+        for callback in list(self._subscribers):
+            callback(event, chapters)
+
+    def _write_many(self, sql, params):
+        # Satu executemany, satu transaksi: semua berhasil atau tidak sama sekali
+        try:
+            self.cursor.executemany(sql, params)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def add(self, chapter_name, target_date, status="Belum Selesai"):
+        chapters = self._load()
+        if chapter_name in self._ids_by_name:
+            raise ValueError(f"Bab '{chapter_name}' sudah ada.")
+        try:
+            self.cursor.execute("INSERT INTO chapters (chapter_name, target_date, status, workspace) VALUES (?, ?, ?, ?)",
+                                (chapter_name, target_date, status, self.workspace))
+        except sqlite3.IntegrityError:
+            # Bab yang sama sudah ditambahkan proses lain (mis. server) sejak cache dimuat
+            self.conn.rollback()
+            self.reload()
+            raise ValueError(f"Bab '{chapter_name}' sudah ada.")
+        self.conn.commit()
+        chapter = (self.cursor.lastrowid, chapter_name, target_date, status)
+        chapters[chapter[0]] = chapter
+        self._ids_by_name[chapter_name] = chapter[0]
+        self._publish("added", [chapter])
+        return chapter
+
+    def _update_many(self, chapter_ids, column, value):
+        chapters = self._load()
+        ids = [chapter_id for chapter_id in dict.fromkeys(chapter_ids) if chapter_id in chapters]
+        self._write_many(f"UPDATE chapters SET {column} = ? WHERE id = ?", [(value, chapter_id) for chapter_id in ids])
+        index = ("id", "chapter_name", "target_date", "status").index(column)
+        updated = []
+        for chapter_id in ids:
+            row = list(chapters[chapter_id])
+            row[index] = value
+            chapters[chapter_id] = tuple(row)
+            updated.append(chapters[chapter_id])
+        self._publish("updated", updated)
+        return updated
+
+    def mark_done(self, chapter_ids):
+        return self._update_many(chapter_ids, "status", "Selesai")
+
+    def set_target_date(self, chapter_ids, target_date):
+        return self._update_many(chapter_ids, "target_date", target_date)
+
+    def delete(self, chapter_ids):
+        chapters = self._load()
+        deleted = [chapters[chapter_id] for chapter_id in dict.fromkeys(chapter_ids) if chapter_id in chapters]
+        self._write_many("DELETE FROM chapters WHERE id = ?", [(chapter[0],) for chapter in deleted])
+        for chapter in deleted:
+            del chapters[chapter[0]]
+            self._ids_by_name.pop(chapter[1], None)
+        self._publish("deleted", deleted)
+        return deleted
+
+class ThesisDatabase:
+    """
+    Operasi data aplikasi tanpa Tk: skema dan migrasi, progress, lampiran, thread chat,
+    versi dokumen, catatan revisi, notifikasi deadline dan laporan PDF. Dipakai ThesisApp,
+    sesi pool mode server (server.DatabaseSession) dan benchmark.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.chapter_store = ChapterStore(self.conn, self.cursor)  # Data bab bersama untuk semua halaman
+        self.attachment_store = AttachmentStore()  # File lampiran konsultasi/revisi
+        self.chapter_store.subscribe(self.on_chapters_deleted)
+
+    def close(self):
+        self.cursor.close()
+        self.conn.close()
 
     def check_chapter_deadlines(self):
-        # Ambil semua bab yang statusnya 'Belum Selesai'
-        self.cursor.execute("SELECT chapter_name, target_date FROM chapters WHERE status = 'Belum Selesai'")
+        # Ambil semua bab WORKSPACE yang statusnya 'Belum Selesai'
+        self.cursor.execute(
+            "SELECT chapter_name, target_date FROM chapters WHERE workspace = ? AND status = 'Belum Selesai'",
+            (WORKSPACE,)
+        )
         chapters = self.cursor.fetchall()
         today = date.today()
         for bab in chapters:
@@ -185,17 +1959,8 @@ class ThesisApp:
             elif days_left < 0:
                 send_wa_notification(chapter_name, days_left, lewat=True)
 
-    def setup_style(self):
-        # Mengatur tampilan dan warna widget
-        style = ttk.Style()
-        style.theme_use("clam")
-        style.configure("TButton", background="#3498db", foreground="white", font=("Arial", 10, "bold"))
-        style.configure("TLabel", background=APP_BG_COLOR, foreground="white", font=("Arial", 10))
-        style.configure("TLabelframe", background="#2c3e50", foreground="white", font=("Arial", 10, "bold"))
-        style.configure("TLabelframe.Label", background="#2c3e50", foreground="white")
-
-    def create_tables(self):
-        # Membuat tabel-tabel database
+    def create_tables(self, seed_dummy=True):
+        # Membuat tabel-tabel database (idempoten; juga dipakai untuk melengkapi skema backup lama)
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS chapters (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -204,6 +1969,67 @@ class ThesisApp:
                 status TEXT
             )
         """)
+        self.ensure_column("chapters", "workspace", "TEXT NOT NULL DEFAULT 'default'")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_chapters_workspace ON chapters(workspace, id)")
+        # Nama bab unik per workspace. Database lama bisa sudah berisi duplikat; bab yang lebih
+        # baru diberi akhiran " (2)", " (3)", ... agar indeks unik bisa dibuat tanpa kehilangan data.
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_chapters_workspace_name'")
+        if not self.cursor.fetchone():
+            self.cursor.execute("""
+                SELECT c.id, c.workspace, c.chapter_name FROM chapters c
+                WHERE EXISTS (SELECT 1 FROM chapters d
+                              WHERE d.workspace = c.workspace AND d.chapter_name = c.chapter_name AND d.id < c.id)
+                ORDER BY c.id
+            """)
+            for chapter_id, workspace, chapter_name in self.cursor.fetchall():
+                suffix = 2
+                while True:
+                    candidate = f"{chapter_name} ({suffix})"
+                    self.cursor.execute("SELECT 1 FROM chapters WHERE workspace = ? AND chapter_name = ?",
+                                        (workspace, candidate))
+                    if not self.cursor.fetchone():
+                        break
+                    suffix += 1
+                self.cursor.execute("UPDATE chapters SET chapter_name = ? WHERE id = ?", (candidate, chapter_id))
+            self.cursor.execute("CREATE UNIQUE INDEX idx_chapters_workspace_name ON chapters(workspace, chapter_name)")
+        # Penghitung progress per workspace, dijaga trigger pada chapters agar statistik tidak
+        # perlu agregat penuh. Bab terlambat bergantung pada tanggal hari ini, jadi yang disimpan
+        # adalah jumlah bab belum selesai per tanggal target (progress_deadlines).
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'progress_counters'"
+        )
+        new_counters = self.cursor.fetchone() is None
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS progress_counters (
+                workspace TEXT PRIMARY KEY,
+                done INTEGER NOT NULL DEFAULT 0,
+                not_done INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS progress_deadlines (
+                workspace TEXT,
+                target_date TEXT,
+                pending INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (workspace, target_date)
+            )
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_chapters_progress_insert AFTER INSERT ON chapters
+            BEGIN {PROGRESS_TRIGGER_ADD} END
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_chapters_progress_update
+            AFTER UPDATE OF status, target_date, workspace ON chapters
+            BEGIN {PROGRESS_TRIGGER_REMOVE} {PROGRESS_TRIGGER_ADD} END
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_chapters_progress_delete AFTER DELETE ON chapters
+            BEGIN {PROGRESS_TRIGGER_REMOVE} END
+        """)
+        if new_counters:
+            # Database lama: isi penghitung sekali dari data bab yang sudah ada
+            self.rebuild_progress_counters()
         # consultations dan revisions sekarang punya kolom chapter_id (FK)
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS consultations (
@@ -217,12 +2043,158 @@ class ThesisApp:
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS revisions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                notes TEXT,
-                date TEXT,
-                chapter_id INTEGER,
-                FOREIGN KEY (chapter_id) REFERENCES chapters(id) ON DELETE CASCADE
+                notes TEXT,
+                date TEXT,
+                chapter_id INTEGER,
+                FOREIGN KEY (chapter_id) REFERENCES chapters(id) ON DELETE CASCADE
+            )
+        """)
+        # Dokumen skripsi yang diupload beserta hasil segmentasi per bab (offset karakter)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_name TEXT,
+                content_hash TEXT,
+                content TEXT,
+                uploaded_at TEXT,
+                workspace TEXT NOT NULL DEFAULT 'default',
+                version INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS document_sections (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                document_id INTEGER,
+                chapter_id INTEGER,
+                heading TEXT,
+                start_offset INTEGER,
+                end_offset INTEGER,
+                content_hash TEXT,
+                changed INTEGER NOT NULL DEFAULT 1,
+                FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE,
+                FOREIGN KEY (chapter_id) REFERENCES chapters(id) ON DELETE SET NULL
+            )
+        """)
+        # Migrasi database lama yang dibuat sebelum ada versi dokumen
+        self.ensure_column("documents", "workspace", "TEXT NOT NULL DEFAULT 'default'")
+        self.ensure_column("documents", "version", "INTEGER NOT NULL DEFAULT 1")
+        self.ensure_column("document_sections", "content_hash", "TEXT")
+        self.ensure_column("document_sections", "changed", "INTEGER NOT NULL DEFAULT 1")
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_document_sections_doc ON document_sections(document_id, chapter_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_documents_workspace_version ON documents(workspace, version)"
+        )
+        # Thread chat AI per bab dan versi dokumen
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chat_threads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chapter_id INTEGER,
+                document_id INTEGER,
+                created_at TEXT,
+                FOREIGN KEY (chapter_id) REFERENCES chapters(id) ON DELETE CASCADE,
+                FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE SET NULL
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                thread_id INTEGER,
+                role TEXT,
+                content TEXT,
+                created_at TEXT,
+                FOREIGN KEY (thread_id) REFERENCES chat_threads(id) ON DELETE CASCADE
+            )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chat_threads_key ON chat_threads(chapter_id, document_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chat_messages_thread ON chat_messages(thread_id, id)"
+        )
+        # Indeks untuk kalender (range tanggal) dan cek bentrok jadwal dosen
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_consultations_date ON consultations(date)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_consultations_lecturer_date ON consultations(lecturer COLLATE NOCASE, date)"
+        )
+        # Indeks LSH catatan revisi: satu baris per (revisi, band); dihapus ikut revisinya
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS revision_lsh (
+                revision_id INTEGER,
+                chapter_id INTEGER,
+                band INTEGER,
+                bucket INTEGER,
+                FOREIGN KEY (revision_id) REFERENCES revisions(id) ON DELETE CASCADE
+            )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_revision_lsh_bucket ON revision_lsh(band, bucket)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_revision_lsh_revision ON revision_lsh(revision_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_revision_lsh_chapter ON revision_lsh(chapter_id, band, bucket)"
+        )
+        # Cache ringkasan AI, dikunci hash isi (hash bagian untuk bab, hash dokumen untuk keseluruhan)
+        # sehingga bab yang tidak berubah antar versi tidak diringkas ulang
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS document_summaries (
+                content_hash TEXT PRIMARY KEY,
+                scope TEXT,
+                summary TEXT,
+                created_at TEXT
+            )
+        """)
+        # Hasil review AI per bab (mode "Review Semua Bab")
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chapter_reviews (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chapter_id INTEGER,
+                document_id INTEGER,
+                review TEXT,
+                created_at TEXT,
+                FOREIGN KEY (chapter_id) REFERENCES chapters(id) ON DELETE CASCADE,
+                FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE SET NULL
+            )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_chapter_reviews_chapter ON chapter_reviews(chapter_id, id)"
+        )
+        # Lampiran file: blob disimpan sekali per hash isi, attachments menautkan blob ke
+        # konsultasi atau revisi (terhapus ikut pemiliknya; blob yatim dibersihkan terpisah)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS attachment_blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER,
+                created_at TEXT
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS attachments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                digest TEXT NOT NULL,
+                file_name TEXT,
+                consultation_id INTEGER,
+                revision_id INTEGER,
+                added_at TEXT,
+                FOREIGN KEY (digest) REFERENCES attachment_blobs(digest),
+                FOREIGN KEY (consultation_id) REFERENCES consultations(id) ON DELETE CASCADE,
+                FOREIGN KEY (revision_id) REFERENCES revisions(id) ON DELETE CASCADE
             )
         """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attachments_consultation ON attachments(consultation_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attachments_revision ON attachments(revision_id)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_attachments_digest ON attachments(digest)"
+        )
         # Hapus tabel relasi N:M, tidak dipakai lagi
         self.cursor.execute("DROP TABLE IF EXISTS chapter_consultation")
         self.cursor.execute("DROP TABLE IF EXISTS chapter_revision")
@@ -230,7 +2202,7 @@ class ThesisApp:
 
         # Data dummy hanya akan diinsert jika tabel chapters masih kosong
         self.cursor.execute("SELECT COUNT(*) FROM chapters")
-        if self.cursor.fetchone()[0] == 0:
+        if self.cursor.fetchone()[0] == 0 and seed_dummy:
             # Insert dummy chapters
             dummy_chapters = [
                 ("Bab 1 Pendahuluan", "2024-06-20", "Belum Selesai"),
@@ -240,8 +2212,8 @@ class ThesisApp:
                 ("Bab 5 Kesimpulan", "2024-07-15", "Belum Selesai"),
             ]
             self.cursor.executemany(
-                "INSERT INTO chapters (chapter_name, target_date, status) VALUES (?, ?, ?)",
-                dummy_chapters
+                "INSERT INTO chapters (chapter_name, target_date, status, workspace) VALUES (?, ?, ?, ?)",
+                [chapter + (WORKSPACE,) for chapter in dummy_chapters]
             )
             self.conn.commit()
 
@@ -274,6 +2246,863 @@ class ThesisApp:
             )
             self.conn.commit()
 
+        # Catatan revisi lama (sebelum ada indeks LSH) diindeks sekali saja
+        self.index_missing_revisions()
+
+    def load_progress(self, workspace=WORKSPACE):
+        # (selesai, belum selesai, terlambat) dari tabel penghitung, tanpa memindai chapters
+        self.cursor.execute(SQL_PROGRESS_COUNTERS, (workspace,))
+        row = self.cursor.fetchone()
+        done, not_done = row if row else (0, 0)
+        self.cursor.execute(SQL_PROGRESS_OVERDUE, (workspace, date.today().isoformat()))
+        return done, not_done, self.cursor.fetchone()[0]
+
+    def rebuild_progress_counters(self):
+        # Hitung ulang seluruh penghitung dari chapters dalam satu transaksi
+        try:
+            self.cursor.execute("DELETE FROM progress_counters")
+            self.cursor.execute("DELETE FROM progress_deadlines")
+            self.cursor.execute(f"INSERT INTO progress_counters (workspace, done, not_done) {SQL_PROGRESS_AGGREGATE}")
+            self.cursor.execute(f"INSERT INTO progress_deadlines (workspace, target_date, pending) {SQL_DEADLINE_AGGREGATE}")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def check_progress_counters(self, repair=True):
+        """
+        Bandingkan penghitung dengan agregat penuh atas chapters.
+        Mengembalikan daftar workspace yang tidak cocok (kosong jika konsisten);
+        jika repair=True dan ada selisih, penghitung dibangun ulang.
+        """
+        self.cursor.execute(SQL_PROGRESS_AGGREGATE)
+        expected = {workspace: (done, not_done) for workspace, done, not_done in self.cursor.fetchall()}
+        self.cursor.execute("SELECT workspace, done, not_done FROM progress_counters")
+        stored = {workspace: (done, not_done) for workspace, done, not_done in self.cursor.fetchall()
+                  if done or not_done}
+        mismatched = {workspace for workspace in expected.keys() | stored.keys()
+                      if expected.get(workspace) != stored.get(workspace)}
+
+        self.cursor.execute(SQL_DEADLINE_AGGREGATE)
+        expected_deadlines = set(self.cursor.fetchall())
+        self.cursor.execute("SELECT workspace, target_date, pending FROM progress_deadlines")
+        stored_deadlines = set(self.cursor.fetchall())
+        mismatched.update(row[0] for row in expected_deadlines ^ stored_deadlines)
+
+        if mismatched and repair:
+            self.rebuild_progress_counters()
+        return sorted(mismatched)
+
+    def add_attachments(self, owner, owner_ids, files):
+        """
+        Tautkan blob yang sudah tersimpan ke konsultasi/revisi (owner: "consultation"/"revision").
+        files berisi (file_name, digest, size). Blob yang sama tidak ditautkan dua kali ke
+        pemilik yang sama. Semua baris ditulis dalam satu transaksi; mengembalikan jumlah tautan baru.
+        """
+        column = ATTACHMENT_OWNERS[owner]
+        now = datetime.now().isoformat(timespec="seconds")
+        placeholders = ",".join("?" * len(owner_ids))
+        self.cursor.execute(
+            f"SELECT {column}, digest FROM attachments WHERE {column} IN ({placeholders})", list(owner_ids)
+        )
+        existing = set(self.cursor.fetchall())
+        rows = []
+        for owner_id in owner_ids:
+            for file_name, digest, _ in files:
+                if (owner_id, digest) not in existing:
+                    existing.add((owner_id, digest))
+                    rows.append((digest, file_name, owner_id, now))
+        try:
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO attachment_blobs (digest, size, created_at) VALUES (?, ?, ?)",
+                [(digest, size, now) for _, digest, size in files]
+            )
+            self.cursor.executemany(
+                f"INSERT INTO attachments (digest, file_name, {column}, added_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return len(rows)
+
+    def load_attachments(self, owner, owner_id):
+        # Lampiran satu konsultasi/revisi: (id, file_name, digest, size, added_at)
+        self.cursor.execute(f"""
+            SELECT a.id, a.file_name, a.digest, b.size, a.added_at
+            FROM attachments a JOIN attachment_blobs b ON b.digest = a.digest
+            WHERE a.{ATTACHMENT_OWNERS[owner]} = ?
+            ORDER BY a.id
+        """, (owner_id,))
+        return self.cursor.fetchall()
+
+    def collect_attachment_garbage(self):
+        # Hapus blob yang tidak lagi dirujuk (pemiliknya dihapus) dari database dan disk
+        self.cursor.execute("""
+            SELECT digest FROM attachment_blobs b
+            WHERE NOT EXISTS (SELECT 1 FROM attachments a WHERE a.digest = b.digest)
+        """)
+        orphans = [row[0] for row in self.cursor.fetchall()]
+        if not orphans:
+            return 0
+        self.write_many("DELETE FROM attachment_blobs WHERE digest = ?", [(digest,) for digest in orphans])
+        for digest in orphans:
+            self.attachment_store.remove(digest)
+        return len(orphans)
+
+    def on_chapters_deleted(self, event, chapters):
+        # Konsultasi/revisi bab yang dihapus ikut terhapus (ON DELETE CASCADE), begitu juga lampirannya
+        if event == "deleted":
+            self.collect_attachment_garbage()
+
+    def ensure_column(self, table, column, declaration):
+        # Tambahkan kolom jika belum ada (migrasi sederhana untuk database lama)
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in self.cursor.fetchall()]:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+    def get_chapter_list(self):
+        return self.chapter_store.chapter_list()
+
+    def get_chat_thread(self, chapter_id, document_id, create=True):
+        # Thread chat untuk pasangan (bab, versi dokumen); dibuat jika belum ada dan create=True
+        self.cursor.execute(
+            "SELECT id FROM chat_threads WHERE chapter_id = ? AND document_id IS ? ORDER BY id LIMIT 1",
+            (chapter_id, document_id)
+        )
+        row = self.cursor.fetchone()
+        if row or not create:
+            return row[0] if row else None
+        self.cursor.execute(
+            "INSERT INTO chat_threads (chapter_id, document_id, created_at) VALUES (?, ?, ?)",
+            (chapter_id, document_id, datetime.now().isoformat(timespec="seconds"))
+        )
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def add_chat_exchange(self, thread_id, user_msg, reply):
+        # Pertanyaan dan jawaban ditulis dalam satu transaksi; mengembalikan id pesan jawaban
+        now = datetime.now().isoformat(timespec="seconds")
+        try:
+            for role, content in (("user", user_msg), ("assistant", reply)):
+                self.cursor.execute(
+                    "INSERT INTO chat_messages (thread_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                    (thread_id, role, content, now)
+                )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return self.cursor.lastrowid
+
+    def load_chat_messages(self, thread_id, before_id=None, limit=CHAT_PAGE_SIZE):
+        # Satu halaman pesan (id, role, content) terurut kronologis, diambil dari yang terbaru ke belakang
+        self.cursor.execute("""
+            SELECT id, role, content FROM chat_messages
+            WHERE thread_id = ? AND id < ?
+            ORDER BY id DESC LIMIT ?
+        """, (thread_id, before_id if before_id is not None else 2 ** 63 - 1, limit))
+        return self.cursor.fetchall()[::-1]
+
+    def save_uploaded_document(self, file_path, text):
+        """
+        Simpan teks skripsi sebagai versi baru di WORKSPACE beserta segmentasi per bab.
+        Bagian yang hash-nya sama dengan versi sebelumnya ditandai changed = 0 sehingga
+        tidak perlu diproses ulang. Jika isi dokumen identik dengan versi terakhir,
+        versi terakhir dipakai lagi. Mengembalikan dict {id, version, mapped, changed};
+        jika gagal transaksi di-rollback dan error diteruskan ke pemanggil.
+        """
+        content_hash = text_hash(text)
+        latest = self.get_latest_document()
+        if latest and latest["content_hash"] == content_hash:
+            self.cursor.execute(
+                "SELECT COUNT(chapter_id) FROM document_sections WHERE document_id = ?", (latest["id"],)
+            )
+            mapped = self.cursor.fetchone()[0]
+            return {"id": latest["id"], "version": latest["version"], "mapped": mapped, "changed": 0}
+
+        sections = segment_chapters(text)
+        mapping = map_sections_to_chapters(sections, self.get_chapter_list())
+        chapter_by_start = {section["start"]: chapter_id for chapter_id, section in mapping.items()}
+        previous_hashes = {}
+        if latest:
+            previous_hashes = {
+                section["key"]: section["hash"] for section in self.load_document_sections(latest["id"])
+            }
+        rows = []
+        changed = 0
+        for section in sections:
+            section_hash = text_hash(text[section["start"]:section["end"]])
+            is_changed = previous_hashes.get(section_key(section["heading"])) != section_hash
+            changed += is_changed
+            rows.append((chapter_by_start.get(section["start"]), section["heading"],
+                         section["start"], section["end"], section_hash, int(is_changed)))
+        version = latest["version"] + 1 if latest else 1
+        try:
+            self.cursor.execute("""
+                INSERT INTO documents (file_name, content_hash, content, uploaded_at, workspace, version)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (os.path.basename(file_path), content_hash, text,
+                  datetime.now().isoformat(timespec="seconds"), WORKSPACE, version))
+            document_id = self.cursor.lastrowid
+            self.cursor.executemany("""
+                INSERT INTO document_sections
+                    (document_id, chapter_id, heading, start_offset, end_offset, content_hash, changed)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(document_id,) + row for row in rows])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return {"id": document_id, "version": version, "mapped": len(mapping), "changed": changed}
+
+    def get_latest_document(self, before=None):
+        # Versi dokumen terbaru di WORKSPACE (opsional: yang diupload sebelum tanggal `before`)
+        query = "SELECT id, version, content_hash, file_name, uploaded_at FROM documents WHERE workspace = ?"
+        params = [WORKSPACE]
+        if before is not None:
+            query += " AND uploaded_at < ?"
+            params.append(before)
+        self.cursor.execute(query + " ORDER BY version DESC LIMIT 1", params)
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+        return dict(zip(("id", "version", "content_hash", "file_name", "uploaded_at"), row))
+
+    def load_document_text(self, document_id):
+        self.cursor.execute("SELECT content FROM documents WHERE id = ?", (document_id,))
+        row = self.cursor.fetchone()
+        return row[0] if row else ""
+
+    def load_document_sections(self, document_id, text=None):
+        # Bagian dokumen sebagai dict {key, heading, chapter_id, hash, changed, text}; text hanya diisi jika diberikan
+        self.cursor.execute("""
+            SELECT chapter_id, heading, start_offset, end_offset, content_hash, changed
+            FROM document_sections WHERE document_id = ? ORDER BY start_offset
+        """, (document_id,))
+        sections = []
+        for chapter_id, heading, start, end, section_hash, changed in self.cursor.fetchall():
+            sections.append({
+                "key": section_key(heading),
+                "heading": heading,
+                "chapter_id": chapter_id,
+                "hash": section_hash,
+                "changed": bool(changed),
+                "text": text[start:end] if text is not None else None,
+            })
+        return sections
+
+    def build_revision_diff(self, document_id, chapter_id):
+        """
+        Diff antara versi dokumen document_id dan versi yang berlaku saat konsultasi terakhir
+        bab tersebut (atau versi sebelumnya jika belum ada konsultasi).
+        Mengembalikan (label_baseline, teks_diff) atau None jika tidak ada versi pembanding.
+        teks_diff kosong jika tidak ada perubahan, termasuk jika belum ada upload baru
+        sejak konsultasi terakhir.
+        """
+        self.cursor.execute("SELECT version FROM documents WHERE id = ?", (document_id,))
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+        current_version = row[0]
+        self.cursor.execute("""
+            SELECT MAX(date) FROM consultations WHERE chapter_id = ? AND date <= DATE('now')
+        """, (chapter_id,))
+        last_consult = self.cursor.fetchone()[0]
+        baseline = None
+        if last_consult:
+            # Versi terakhir yang diupload sebelum hari konsultasi berakhir
+            baseline = self.get_latest_document(before=f"{last_consult}T23:59:59")
+            label = f"konsultasi terakhir ({last_consult}, versi {baseline['version']})" if baseline else ""
+            if baseline and baseline["version"] >= current_version:
+                # Belum ada versi baru sejak konsultasi: jangan diam-diam membandingkan dengan versi lain
+                return label, ""
+        if not baseline:
+            self.cursor.execute("""
+                SELECT id, version FROM documents
+                WHERE workspace = ? AND version < ? ORDER BY version DESC LIMIT 1
+            """, (WORKSPACE, current_version))
+            row = self.cursor.fetchone()
+            if not row:
+                return None
+            baseline = {"id": row[0], "version": row[1]}
+            label = f"versi sebelumnya (versi {row[1]})"
+
+        # Flag changed dihitung terhadap versi tepat sebelumnya; jika itu baseline-nya dan
+        # semua bagian bab terpilih tidak berubah, diff pasti kosong tanpa perlu memuat teks
+        if baseline["version"] == current_version - 1:
+            selected = [section for section in self.load_document_sections(document_id)
+                        if section["chapter_id"] == chapter_id]
+            if selected and not any(section["changed"] for section in selected):
+                return label, ""
+        old_sections = self.load_document_sections(baseline["id"], self.load_document_text(baseline["id"]))
+        new_sections = self.load_document_sections(document_id, self.load_document_text(document_id))
+        # Batasi ke bab terpilih jika bab tersebut terdeteksi di versi terbaru
+        selected = [section for section in new_sections if section["chapter_id"] == chapter_id]
+        if selected:
+            keys = {section["key"] for section in selected}
+            old_sections = [section for section in old_sections if section["key"] in keys]
+            new_sections = selected
+        return label, format_section_diff(diff_document_sections(old_sections, new_sections))
+
+    def load_summaries(self, hashes):
+        # Ringkasan yang sudah ada di cache: {content_hash: summary}
+        hashes = list(hashes)
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" * len(hashes))
+        self.cursor.execute(
+            f"SELECT content_hash, summary FROM document_summaries WHERE content_hash IN ({placeholders})", hashes
+        )
+        return dict(self.cursor.fetchall())
+
+    def save_summary(self, content_hash, scope, summary):
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO document_summaries (content_hash, scope, summary, created_at)
+            VALUES (?, ?, ?, ?)
+        """, (content_hash, scope, summary, datetime.now().isoformat(timespec="seconds")))
+        self.conn.commit()
+
+    def get_document_summaries(self, document_id, chapter_id):
+        """
+        Ringkasan untuk prompt chat: (ringkasan_dokumen, ringkasan_bab); masing-masing None
+        jika belum selesai dibuat.
+        """
+        self.cursor.execute("SELECT content_hash FROM documents WHERE id = ?", (document_id,))
+        row = self.cursor.fetchone()
+        if not row:
+            return None, None
+        self.cursor.execute("""
+            SELECT content_hash FROM document_sections
+            WHERE document_id = ? AND chapter_id = ?
+            LIMIT 1
+        """, (document_id, chapter_id))
+        section = self.cursor.fetchone()
+        summaries = self.load_summaries([row[0]] + ([section[0]] if section else []))
+        return summaries.get(row[0]), summaries.get(section[0]) if section else None
+
+    def get_chapter_text(self, document_id, chapter_id, text):
+        # Potongan teks bab dari dokumen berdasarkan offset segmentasi, None jika tidak terdeteksi
+        self.cursor.execute("""
+            SELECT start_offset, end_offset FROM document_sections
+            WHERE document_id = ? AND chapter_id = ?
+            LIMIT 1
+        """, (document_id, chapter_id))
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+        return text[row[0]:row[1]]
+
+    def index_revision_note(self, revision_id, chapter_id, notes):
+        # Simpan bucket LSH catatan revisi (tanpa commit, ikut transaksi pemanggil)
+        self.cursor.executemany(
+            "INSERT INTO revision_lsh (revision_id, chapter_id, band, bucket) VALUES (?, ?, ?, ?)",
+            [(revision_id, chapter_id, band, bucket)
+             for band, bucket in lsh_buckets(minhash_signature(note_shingles(notes or "")))]
+        )
+
+    def index_missing_revisions(self):
+        self.cursor.execute("""
+            SELECT r.id, r.chapter_id, r.notes FROM revisions r
+            WHERE NOT EXISTS (SELECT 1 FROM revision_lsh l WHERE l.revision_id = r.id)
+        """)
+        missing = self.cursor.fetchall()
+        for revision_id, chapter_id, notes in missing:
+            self.index_revision_note(revision_id, chapter_id, notes)
+        if missing:
+            self.conn.commit()
+
+    def find_similar_revisions(self, notes, exclude_id=None, limit=REVISION_SIMILAR_LIMIT):
+        """
+        Cari catatan revisi lama yang mirip lewat indeks LSH: hanya revisi yang berbagi
+        bucket yang diperiksa, lalu diverifikasi dengan Jaccard shingle.
+        Mengembalikan list (similarity, revision_id, chapter_name, date, notes).
+        """
+        shingles = note_shingles(notes)
+        buckets = lsh_buckets(minhash_signature(shingles))
+        if not buckets:
+            return []
+        where = " OR ".join(["(band = ? AND bucket = ?)"] * len(buckets))
+        self.cursor.execute(f"""
+            SELECT revision_id, COUNT(*) AS shared FROM revision_lsh
+            WHERE {where}
+            GROUP BY revision_id
+            ORDER BY shared DESC
+            LIMIT ?
+        """, [value for bucket in buckets for value in bucket] + [REVISION_CANDIDATE_LIMIT])
+        candidate_ids = [row[0] for row in self.cursor.fetchall() if row[0] != exclude_id]
+        if not candidate_ids:
+            return []
+        placeholders = ",".join("?" * len(candidate_ids))
+        self.cursor.execute(f"""
+            SELECT r.id, ch.chapter_name, r.date, r.notes FROM revisions r
+            LEFT JOIN chapters ch ON r.chapter_id = ch.id
+            WHERE r.id IN ({placeholders})
+        """, candidate_ids)
+        similar = []
+        for revision_id, chapter_name, revision_date, other_notes in self.cursor.fetchall():
+            similarity = jaccard_similarity(shingles, note_shingles(other_notes or ""))
+            if similarity >= REVISION_SIMILARITY_THRESHOLD:
+                similar.append((similarity, revision_id, chapter_name, revision_date, other_notes))
+        similar.sort(key=lambda item: (-item[0], -item[1]))
+        return similar[:limit]
+
+    def cluster_revision_notes(self, chapter_id):
+        """
+        Kelompokkan catatan revisi berulang dalam satu bab. Setiap anggota bucket LSH
+        dibandingkan dengan anggota pertama bucket tersebut (bukan semua pasangan, agar
+        tetap linear), diverifikasi Jaccard, lalu digabung dengan union-find.
+        Mengembalikan list kelompok (>= 2 catatan) berisi (id, date, notes).
+        """
+        self.cursor.execute("SELECT id, date, notes FROM revisions WHERE chapter_id = ?", (chapter_id,))
+        revisions = {row[0]: row for row in self.cursor.fetchall()}
+        self.cursor.execute(
+            "SELECT band, bucket, revision_id FROM revision_lsh WHERE chapter_id = ? ORDER BY band, bucket",
+            (chapter_id,)
+        )
+        shingles = {}
+        parent = {}
+
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def note_of(revision_id):
+            if revision_id not in shingles:
+                shingles[revision_id] = note_shingles(revisions[revision_id][2] or "")
+            return shingles[revision_id]
+
+        for _, rows in itertools.groupby(self.cursor.fetchall(), key=lambda row: row[:2]):
+            members = [row[2] for row in rows if row[2] in revisions]
+            for other in members[1:]:
+                root_first, root_other = find(members[0]), find(other)
+                if root_first != root_other and \
+                        jaccard_similarity(note_of(members[0]), note_of(other)) >= REVISION_SIMILARITY_THRESHOLD:
+                    parent[root_other] = root_first
+
+        groups = {}
+        for revision_id in parent:
+            groups.setdefault(find(revision_id), []).append(revisions[revision_id])
+        clusters = [sorted(group) for group in groups.values() if len(group) > 1]
+        clusters.sort(key=len, reverse=True)
+        return clusters
+
+    def find_consultation_conflict(self, lecturer, consult_date):
+        # Jadwal lain dengan dosen yang sama pada tanggal yang sama -> (date, lecturer, chapter_name) atau None
+        self.cursor.execute(SQL_CONSULTATION_CONFLICT, (lecturer, consult_date))
+        return self.cursor.fetchone()
+
+    def load_consultation_month(self, year, month):
+        # Ringkasan konsultasi per tanggal untuk satu bulan: {date: (jumlah, daftar dosen)}
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        self.cursor.execute(SQL_CONSULTATION_MONTH, (start.isoformat(), end.isoformat()))
+        return {day: (count, lecturers) for day, count, lecturers in self.cursor.fetchall()}
+
+    def render_pdf_report(self, file_path):
+        # Menggambar isi laporan PDF ke file_path (tanpa dialog, bisa dipakai benchmark)
+        c = canvas.Canvas(file_path, pagesize=A4)
+        width, height = A4
+        margin = 40
+        padding_y = 8  # padding vertikal antar baris
+        padding_x = 10 # padding horizontal antar kolom/tepi
+        y = height - margin
+
+        # Header dengan garis dan logo (jika ada)
+        c.setFillColor(colors.HexColor(PDF_HEADER_COLOR))
+        c.rect(0, height-70, width, 70, fill=1, stroke=0)
+        c.setFillColor(PDF_HEADER_TEXT_COLOR)
+        c.setFont(PDF_HEADER_FONT, PDF_HEADER_FONT_SIZE)
+        c.drawString(margin + padding_x, height-50, PDF_HEADER_TITLE)
+        c.setFont(PDF_HEADER_DATE_FONT, PDF_HEADER_DATE_FONT_SIZE)
+        c.drawString(margin + padding_x, height-65, f"Tanggal Cetak: {datetime.now().strftime('%d-%m-%Y %H:%M')}")
+        c.setFillColor(colors.black)
+        y = height - 90
+
+        # Garis bawah header
+        c.setStrokeColor(colors.HexColor(PDF_HEADER_LINE_COLOR))
+        c.setLineWidth(2)
+        c.line(margin, y+10, width-margin, y+10)
+        y -= 10 + padding_y
+
+        # Section: Target Bab
+        c.setFont("Helvetica-Bold", 15)
+        c.setFillColor(colors.HexColor(PDF_SECTION_TITLE_COLOR))
+        c.drawString(margin + padding_x, y, "1. Target Bab")
+        y -= 18 + padding_y
+        c.setFillColor(colors.black)
+        # Sama dengan statistik di bagian 4: hanya bab milik WORKSPACE aktif
+        self.cursor.execute(SQL_REFRESH_CHAPTERS, (WORKSPACE,))
+        chapters = [row[1:] for row in self.cursor.fetchall()]
+        if chapters:
+            # Table header
+            c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_BG))
+            c.roundRect(margin-2, y-2, width-2*margin+4, 22, 5, fill=1, stroke=0)
+            c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_TEXT))
+            c.setFont("Helvetica-Bold", 11)
+            c.drawString(margin+5+padding_x, y+4, "Bab")
+            c.drawString(margin+180+padding_x, y+4, "Target Selesai")
+            c.drawString(margin+320+padding_x, y+4, "Status")
+            c.setFont("Helvetica", 11)
+            y -= 22 + padding_y
+            c.setFillColor(colors.black)
+            for idx, (bab, tgl, status) in enumerate(chapters):
+                c.setFillColor(colors.HexColor(PDF_TABLE_ROW_ALT_BG) if (idx%2==0) else PDF_TABLE_ROW_BG)
+                c.roundRect(margin-2, y-2, width-2*margin+4, 18, 3, fill=1, stroke=0)
+                c.setFillColor(colors.black)
+                c.drawString(margin+5+padding_x, y+2, str(bab))
+                c.drawString(margin+180+padding_x, y+2, str(tgl))
+                # Status badge with padding
+                status_text = f"  {status}  "  # Tambahkan padding kiri dan kanan
+                if status == "Selesai":
+                    c.setFillColor(colors.HexColor(PDF_STATUS_DONE_COLOR))
+                else:
+                    c.setFillColor(colors.HexColor(PDF_STATUS_NOT_DONE_COLOR))
+                # Hitung lebar badge berdasarkan panjang status + padding
+                badge_font = "Helvetica-Bold"
+                badge_font_size = 10
+                c.setFont(badge_font, badge_font_size)
+                badge_width = c.stringWidth(status_text, badge_font, badge_font_size) + 8  # extra padding
+                badge_x = margin+320+padding_x
+                badge_y = y+2
+                c.roundRect(badge_x, badge_y, badge_width, 14, 4, fill=1, stroke=0)
+                c.setFillColor(colors.white)
+                c.drawCentredString(badge_x + badge_width/2, badge_y+4, status_text)
+                c.setFont("Helvetica", 11)
+                c.setFillColor(colors.black)
+                y -= 18 + padding_y
+                if y < 100:
+                    c.showPage()
+                    y = height - margin
+        else:
+            c.setFont("Helvetica-Oblique", 11)
+            c.drawString(margin + padding_x, y, "Belum ada data target bab.")
+            y -= 18 + padding_y
+
+        y -= 10 + padding_y
+
+        # Section: Jadwal Konsultasi
+        c.setFont("Helvetica-Bold", 15)
+        c.setFillColor(colors.HexColor(PDF_SECTION_TITLE_COLOR))
+        c.drawString(margin + padding_x, y, "2. Jadwal Konsultasi")
+        y -= 18 + padding_y
+        c.setFillColor(colors.black)
+        c.setFont("Helvetica", 11)
+        self.cursor.execute(SQL_REFRESH_CONSULTATIONS)
+        consults = self.cursor.fetchall()
+        if consults:
+            c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_BG))
+            c.roundRect(margin-2, y-2, width-2*margin+4, 22, 5, fill=1, stroke=0)
+            c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_TEXT))
+            c.setFont("Helvetica-Bold", 11)
+            c.drawString(margin+5+padding_x, y+4, "Tanggal")
+            c.drawString(margin+110+padding_x, y+4, "Dosen")
+            c.drawString(margin+260+padding_x, y+4, "Bab Terkait")
+            c.setFont("Helvetica", 11)
+            y -= 22 + padding_y
+            c.setFillColor(colors.black)
+            for idx, (_, tgl, dosen, bab) in enumerate(consults):
+                c.setFillColor(colors.HexColor(PDF_TABLE_ROW_ALT_BG) if (idx%2==0) else PDF_TABLE_ROW_BG)
+                c.roundRect(margin-2, y-2, width-2*margin+4, 18, 3, fill=1, stroke=0)
+                c.setFillColor(colors.black)
+                c.drawString(margin+5+padding_x, y+2, str(tgl))
+                c.drawString(margin+110+padding_x, y+2, str(dosen))
+                c.drawString(margin+260+padding_x, y+2, str(bab))
+                y -= 18 + padding_y
+                if y < 100:
+                    c.showPage()
+                    y = height - margin
+        else:
+            c.setFont("Helvetica-Oblique", 11)
+            c.drawString(margin + padding_x, y, "Belum ada data konsultasi.")
+            y -= 18 + padding_y
+
+        y -= 10 + padding_y
+
+        # Section: Catatan Revisi
+        c.setFont("Helvetica-Bold", 15)
+        c.setFillColor(colors.HexColor(PDF_SECTION_TITLE_COLOR))
+        c.drawString(margin + padding_x, y, "3. Catatan Revisi")
+        y -= 18 + padding_y
+        c.setFillColor(colors.black)
+        c.setFont("Helvetica", 11)
+        self.cursor.execute("""
+            SELECT ch.chapter_name, r.notes, r.date
+            FROM revisions r
+            LEFT JOIN chapters ch ON r.chapter_id = ch.id
+            ORDER BY r.id DESC
+        """)
+        revisions = self.cursor.fetchall()
+        if revisions:
+            # Header background
+            header_height = 22
+            header_y = y
+            c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_BG))
+            c.roundRect(margin, header_y, width-2*margin, header_height, 5, fill=1, stroke=0)
+            # Header text
+            c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_TEXT))
+            c.setFont("Helvetica-Bold", 11)
+            c.drawString(margin + padding_x + 5, header_y + 6, "Bab")
+            c.drawString(margin + padding_x + 120, header_y + 6, "Catatan")
+            c.drawString(margin + padding_x + 380, header_y + 6, "Tanggal")
+            y -= header_height + padding_y
+            c.setFont("Helvetica", 11)
+            for idx, (bab, catatan, tgl) in enumerate(revisions):
+                row_height = 18
+                row_y = y
+                # Row background
+                c.setFillColor(colors.HexColor(PDF_TABLE_ROW_ALT_BG) if (idx % 2 == 0) else PDF_TABLE_ROW_BG)
+                c.roundRect(margin, row_y, width-2*margin, row_height, 3, fill=1, stroke=0)
+                # Row text
+                c.setFillColor(colors.black)
+                # Batasi bab maksimal 15 huruf
+                bab_str = str(bab)
+                if len(bab_str) > 15:
+                    bab_str = bab_str[:12] + "..."
+                c.drawString(margin + padding_x + 5, row_y + 4, bab_str)
+                # Catatan wrap/ellipsis
+                catatan_str = str(catatan)
+                if len(catatan_str) > 50:
+                    catatan_str = catatan_str[:47] + "..."
+                c.drawString(margin + padding_x + 120, row_y + 4, catatan_str)
+                c.drawString(margin + padding_x + 380, row_y + 4, str(tgl))
+                y -= row_height + padding_y
+                if y < 100:
+                    c.showPage()
+                    y = height - margin
+        else:
+            c.setFont("Helvetica-Oblique", 11)
+            c.drawString(margin + padding_x, y, "Belum ada catatan revisi.")
+            y -= 18 + padding_y
+
+        y -= 10 + padding_y
+
+        # Section: Statistik Progress
+        c.setFont("Helvetica-Bold", 15)
+        c.setFillColor(colors.HexColor(PDF_SECTION_TITLE_COLOR))
+        c.drawString(margin + padding_x, y, "4. Statistik Progress")
+        y -= 18 + padding_y
+        c.setFillColor(colors.black)
+        selesai, belum, terlambat = self.load_progress()
+        total = selesai + belum
+        c.setFont("Helvetica", 11)
+        # Progress bar visual
+        bar_x = margin + padding_x
+        bar_y = y
+        bar_width = width - 2*margin - 2*padding_x
+        bar_height = 18
+        if total > 0:
+            percent = selesai / total
+            # Text
+            c.setFillColor(colors.black)
+            c.drawString(bar_x, bar_y-5, f"Bab Selesai: {selesai}")
+            c.drawString(bar_x+150, bar_y-5, f"Bab Belum Selesai: {belum}")
+            c.drawString(bar_x+320, bar_y-5, f"Persentase Selesai: {percent*100:.1f}%")
+            c.drawString(bar_x, bar_y-20, f"Bab Terlambat: {terlambat}")
+            y -= 45 + padding_y
+        else:
+            c.setFont("Helvetica-Oblique", 11)
+            c.drawString(margin + padding_x, y, "Belum ada data progress.")
+            y -= 18 + padding_y
+
+        # Footer
+        c.setStrokeColor(colors.HexColor(PDF_FOOTER_LINE_COLOR))
+        c.setLineWidth(1)
+        c.line(margin, 50, width-margin, 50)
+        c.setFont(PDF_FOOTER_FONT, PDF_FOOTER_FONT_SIZE)
+        c.setFillColor(colors.HexColor(PDF_FOOTER_TEXT_COLOR))
+        c.drawCentredString(width/2, 38, PDF_FOOTER_TEXT)
+        c.save()
+
+    def write_many(self, sql, params):
+        # Aksi massal: satu executemany dalam satu transaksi
+        try:
+            self.cursor.executemany(sql, params)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+class ThesisApp(ThesisDatabase):
+
+    def __init__(self, root):
+        # Inisialisasi jendela utama
+        self.root = root
+        self.root.title(APP_TITLE)
+        self.root.geometry(APP_GEOMETRY)
+        self.root.configure(bg=APP_BG_COLOR)
+
+        self.setup_style()  # Set tema dan gaya widget
+
+        # Watchdog UI hang (opsional): stack handler yang memblokir main loop ditulis ke WATCHDOG_LOG
+        self.watchdog = MainLoopWatchdog(self.root).start() if WATCHDOG_ENABLED else None
+
+        # Jendela halaman yang sedang terbuka (title -> Toplevel) beserta refresh/cleanup-nya
+        self.windows = {}
+        self.window_refreshers = {}
+        self.window_cleanups = {}
+
+        try:
+            # Koneksi ke SQLite dan inisialisasi database
+            conn = traced_connection(sqlite3.connect(DB_NAME))
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")  # backup & pembaca tidak memblokir penulisan
+            super().__init__(conn)
+            self.create_tables()  # Membuat tabel jika belum ada
+            self.collect_attachment_garbage()  # Blob milik konsultasi/revisi yang sudah terhapus
+        except Exception as e:
+            messagebox.showerror("Database Error", str(e))
+            self.root.destroy()
+
+        # Cek notifikasi bab (H-3 dan lewat deadline)
+        self.check_chapter_deadlines()
+
+        self.build_menu()  # Tampilkan menu utama
+
+        self.backup_thread = None
+        self.schedule_backups()  # Backup otomatis berkala di background
+
+    def setup_style(self):
+        # Mengatur tampilan dan warna widget
+        style = ttk.Style()
+        style.theme_use("clam")
+        style.configure("TButton", background="#3498db", foreground="white", font=("Arial", 10, "bold"))
+        style.configure("TLabel", background=APP_BG_COLOR, foreground="white", font=("Arial", 10))
+        style.configure("TLabelframe", background="#2c3e50", foreground="white", font=("Arial", 10, "bold"))
+        style.configure("TLabelframe.Label", background="#2c3e50", foreground="white")
+
+    def reload_after_restore(self):
+        """
+        Dipanggil setelah restore_database: lengkapi skema backup lama (create_tables idempoten,
+        tanpa data dummy), hitung ulang penghitung progress, bersihkan blob lampiran tanpa
+        perujuk, lalu muat ulang data bab dan semua halaman yang sedang terbuka.
+        """
+        self.create_tables(seed_dummy=False)
+        self.rebuild_progress_counters()
+        self.collect_attachment_garbage()
+        self.chapter_store.reload()
+        for win, refresh in list(self.window_refreshers.items()):
+            if win.winfo_exists():
+                refresh()
+
+    def start_attachment_upload(self, owner, owner_ids, paths, done):
+        """
+        Simpan file ke AttachmentStore di thread background (I/O file saja), lalu tautkan
+        ke pemiliknya di thread Tk. done(pesan, error) dipanggil di thread Tk.
+        """
+        def finish(files, error):
+            if error:
+                done(None, error)
+                return
+            try:
+                for path, (_, digest, _, _) in zip(paths, files):
+                    if not self.attachment_store.has_blob(digest):
+                        # Blob lama sempat dibersihkan collect_attachment_garbage selama upload
+                        self.attachment_store.put(path)
+                linked = self.add_attachments(owner, owner_ids, [(name, digest, size) for name, digest, size, _ in files])
+            except Exception as e:
+                done(None, e)
+                return
+            reused = sum(1 for *_, new in files if not new)
+            done(f"{linked} lampiran ditautkan ({len(files) - reused} file baru disimpan, "
+                 f"{reused} sudah ada dan tidak disalin ulang).", None)
+
+        def run():
+            files = []
+            try:
+                for path in paths:
+                    digest, size, new = self.attachment_store.put(path)
+                    files.append((os.path.basename(path), digest, size, new))
+            except Exception as e:
+                self.root.after(0, finish, files, e)
+                return
+            self.root.after(0, finish, files, None)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def add_attachment_buttons(self, win, tree, owner, label):
+        # Tombol lampiran untuk halaman konsultasi/revisi (iid baris tree = id pemilik)
+        def attach():
+            selected = tree.selection()
+            if not selected:
+                messagebox.showwarning("Lampiran", f"Pilih {label} terlebih dahulu.", parent=win)
+                return
+            paths = filedialog.askopenfilenames(title="Pilih file lampiran", parent=win)
+            if not paths:
+                return
+
+            def done(message, error):
+                if error:
+                    messagebox.showerror("Error", str(error))
+                else:
+                    messagebox.showinfo("Lampiran", message)
+
+            self.start_attachment_upload(owner, [int(iid) for iid in selected], paths, done)
+
+        def show():
+            selected = tree.focus() or (tree.selection() or [None])[0]
+            if selected:
+                self.attachments_page(owner, int(selected), f"{label.title()} #{selected} ({tree.item(selected)['values'][0]})")
+
+        ttk.Button(win, text="Lampirkan File", command=attach).pack(pady=5)
+        ttk.Button(win, text="Lihat Lampiran", command=show).pack(pady=5)
+
+    def attachments_page(self, owner, owner_id, caption):
+        title = f"Lampiran {caption}"
+        if self.show_existing_window(title):
+            return
+        win = self.new_window(title)
+        tree = ttk.Treeview(win, columns=("Nama File", "Ukuran", "Ditambahkan"), show="headings", selectmode="extended")
+        for col in ("Nama File", "Ukuran", "Ditambahkan"):
+            tree.heading(col, text=col)
+        tree.pack(expand=True, fill="both", padx=10, pady=10)
+        digests = {}
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            digests.clear()
+            for attachment_id, file_name, digest, size, added_at in self.load_attachments(owner, owner_id):
+                digests[str(attachment_id)] = (file_name, digest)
+                tree.insert("", "end", iid=str(attachment_id), values=(file_name, f"{size / 1024:.1f} KB", added_at))
+
+        def save_copy():
+            selected = tree.focus()
+            if not selected:
+                return
+            file_name, digest = digests[selected]
+            dest = filedialog.asksaveasfilename(title="Simpan lampiran", initialfile=file_name, parent=win)
+            if not dest:
+                return
+
+            def run():
+                try:
+                    self.attachment_store.export(digest, dest)
+                    self.root.after(0, lambda: messagebox.showinfo("Lampiran", f"Tersimpan: {dest}", parent=win))
+                except Exception as e:
+                    self.root.after(0, messagebox.showerror, "Error", str(e))
+
+            threading.Thread(target=run, daemon=True).start()
+
+        def delete_selected():
+            selected = tree.selection()
+            if not selected:
+                return
+            if messagebox.askyesno("Konfirmasi", f"Hapus {len(selected)} lampiran terpilih?", parent=win):
+                try:
+                    self.write_many("DELETE FROM attachments WHERE id = ?", [(int(iid),) for iid in selected])
+                    tree.delete(*selected)
+                    self.collect_attachment_garbage()
+                except Exception as e:
+                    messagebox.showerror("Error", str(e))
+
+        ttk.Button(win, text="Simpan Salinan", command=save_copy).pack(pady=5)
+        ttk.Button(win, text="Hapus Lampiran", command=delete_selected).pack(pady=5)
+        self.on_window_reopen(win, refresh)
+        refresh()
+
     def build_menu(self):
         # Menampilkan tombol menu utama
         frame = tk.Frame(self.root, bg=APP_BG_COLOR)
@@ -284,6 +3113,8 @@ class ThesisApp:
             ("Jadwal Konsultasi", self.consult_page),
             ("Catatan Revisi", self.revision_page),
             ("Statistik Progress", self.statistic_page),
+            ("Review Semua Bab (AI)", self.batch_review_page),
+            ("Backup & Restore", self.backup_page),
             ("Cetak Laporan PDF", self.print_pdf_report)  # Tambahkan tombol PDF
         ]
 
@@ -333,8 +3164,9 @@ class ThesisApp:
         LABEL_FG = "#555"
         BORDER_RADIUS = 10
 
-        chat_win = tk.Toplevel(self.root)
-        chat_win.title("Chat dengan AI Groq")
+        if self.show_existing_window("Chat dengan AI Groq"):
+            return
+        chat_win = self.new_window("Chat dengan AI Groq")
         chat_win.geometry("800x750")
         chat_win.configure(bg=SECONDARY_COLOR)
 
@@ -353,64 +3185,151 @@ class ThesisApp:
 
         self.uploaded_skripsi_path = None
         self.uploaded_skripsi_text = None
+        self.uploaded_document_id = None
 
-        def extract_text_from_file(file_path):
-            ext = os.path.splitext(file_path)[1].lower()
-            try:
-                if ext == ".pdf":
-                    try:
-                        import PyPDF2
-                    except ImportError:
-                        messagebox.showerror("Error", "PyPDF2 belum terinstall. Install dengan 'pip install PyPDF2'")
-                        return ""
-                    text = ""
-                    with open(file_path, "rb") as f:
-                        reader = PyPDF2.PdfReader(f)
-                        for page in reader.pages:
-                            text += page.extract_text() or ""
-                    return text
-                elif ext in [".doc", ".docx"]:
+        def upload_skripsi():
+            file_path = tk.filedialog.askopenfilename(
+                title="Pilih file skripsi (PDF, DOC, DOCX)",
+                filetypes=[("Dokumen Skripsi", "*.pdf *.doc *.docx")]
+            )
+            if file_path:
+                chat_win.config(cursor="watch")
+                chat_win.update()
+                text = extract_text_from_file(file_path)
+                chat_win.config(cursor="")
+                if text:
+                    self.uploaded_skripsi_path = file_path
+                    self.uploaded_skripsi_text = text
                     try:
-                        import docx
-                    except ImportError:
-                        messagebox.showerror("Error", "python-docx belum terinstall. Install dengan 'pip install python-docx'")
-                        return ""
-                    doc = docx.Document(file_path)
-                    return "\n".join([p.text for p in doc.paragraphs])
+                        document = self.save_uploaded_document(file_path, text)
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Gagal menyimpan segmentasi skripsi: {e}")
+                        document = None
+                    self.uploaded_document_id = document["id"] if document else None
+                    open_chat_thread()
+                    if document:
+                        start_summaries(document["id"])
+                        upload_label.config(
+                            text=(f"✔ {os.path.basename(file_path)} versi {document['version']} "
+                                  f"({document['mapped']} bab terdeteksi, {document['changed']} bagian berubah)"),
+                            fg=ACCENT_COLOR
+                        )
+                    messagebox.showinfo("Sukses", "File skripsi berhasil diupload dan diproses.")
                 else:
-                    messagebox.showerror("Error", "Format file tidak didukung. Hanya PDF, DOC, DOCX.")
-                    return ""
-            except Exception as e:
-                messagebox.showerror("Error", f"Gagal membaca file: {e}")
-                return ""
+                    self.uploaded_skripsi_path = None
+                    self.uploaded_skripsi_text = None
+                    self.uploaded_document_id = None
+                    upload_label.config(text="Belum ada file terupload", fg="red")
+
+        upload_btn = tk.Button(
+            upload_frame,
+            text="Upload Skripsi (PDF/DOC/DOCX)",
+            command=upload_skripsi,
+            bg=BUTTON_BG,
+            fg=BUTTON_FG,
+            font=("Segoe UI", 10, "bold"),
+            relief="flat",
+            activebackground=ACCENT_COLOR,
+            activeforeground="white",
+            padx=18, pady=6,
+            bd=0,
+            cursor="hand2"
+        )
+        upload_btn.pack(side="left", padx=(0, 12))
+
+        upload_label = tk.Label(
+            upload_frame,
+            text="Belum ada file terupload",
+            bg=SECONDARY_COLOR,
+            fg="red",
+            font=("Segoe UI", 9, "italic")
+        )
+        upload_label.pack(side="left", padx=(0, 8))
+
+        summary_label = tk.Label(upload_frame, text="", bg=SECONDARY_COLOR, fg=LABEL_FG, font=("Segoe UI", 9, "italic"))
+        summary_label.pack(side="left")
+
+        def start_summaries(document_id):
+            # Ringkasan bab & dokumen dibuat sekali di background, lalu dipakai di setiap pertanyaan
+            def progress(finished, total):
+                if summary_label.winfo_exists():
+                    summary_label.config(text=f"Meringkas skripsi: {finished}/{total}")
+
+            def done(failed):
+                if summary_label.winfo_exists():
+                    summary_label.config(text=f"{failed} ringkasan gagal, memakai teks asli bab" if failed
+                                         else "Ringkasan skripsi siap")
+
+            if self.start_summary_job(document_id, progress=progress, done=done):
+                summary_label.config(text="Meringkas skripsi di background...")
+
+        def load_latest_document():
+            # Muat versi skripsi terakhir di workspace agar tidak perlu upload ulang (juga setelah restore)
+            latest_document = self.get_latest_document()
+            if not latest_document:
+                self.uploaded_skripsi_path = self.uploaded_skripsi_text = self.uploaded_document_id = None
+                upload_label.config(text="Belum ada file terupload", fg="red")
+                return
+            self.uploaded_document_id = latest_document["id"]
+            self.uploaded_skripsi_path = latest_document["file_name"]
+            self.uploaded_skripsi_text = self.load_document_text(latest_document["id"])
+            upload_label.config(
+                text=f"✔ {latest_document['file_name']} versi {latest_document['version']} dimuat",
+                fg=ACCENT_COLOR
+            )
+            start_summaries(latest_document["id"])  # lanjutkan ringkasan yang belum selesai
+
+        load_latest_document()
+
+        # --- Pustaka Referensi (folder jurnal PDF) ---
+        reference_frame = tk.Frame(chat_win, bg=SECONDARY_COLOR)
+        reference_frame.pack(fill="x", padx=20, pady=(12, 0))
+
+        if not hasattr(self, "reference_library"):
+            self.reference_library = ReferenceLibrary()
+        use_references_var = tk.BooleanVar(value=self.reference_library.paper_count() > 0)
+
+        def update_reference_label(text=None):
+            if not reference_label.winfo_exists():
+                return
+            reference_label.config(text=text or f"{self.reference_library.paper_count()} referensi di pustaka")
+
+        def import_references():
+            folder = filedialog.askdirectory(title="Pilih folder jurnal referensi (PDF)")
+            if not folder:
+                return
+            reference_btn.config(state="disabled")
+
+            def progress(done, total, name):
+                chat_win.after(0, update_reference_label, f"Mengimpor {done}/{total}: {name}")
+
+            def do_import():
+                try:
+                    added, errors = self.reference_library.ingest_folder(folder, progress=progress)
+                except Exception as e:
+                    added, errors = 0, [(folder, str(e))]
+
+                def finish():
+                    if not chat_win.winfo_exists():
+                        return
+                    reference_btn.config(state="normal")
+                    update_reference_label()
+                    use_references_var.set(self.reference_library.paper_count() > 0)
+                    message = f"{added} referensi baru diimpor."
+                    if errors:
+                        message += f"\n{len(errors)} file gagal dibaca:\n" + "\n".join(
+                            f"- {name}: {error}" for name, error in errors[:10]
+                        )
+                    messagebox.showinfo("Pustaka Referensi", message, parent=chat_win)
+
+                chat_win.after(0, finish)
 
-        def upload_skripsi():
-            file_path = tk.filedialog.askopenfilename(
-                title="Pilih file skripsi (PDF, DOC, DOCX)",
-                filetypes=[("Dokumen Skripsi", "*.pdf *.doc *.docx")]
-            )
-            if file_path:
-                chat_win.config(cursor="watch")
-                chat_win.update()
-                text = extract_text_from_file(file_path)
-                chat_win.config(cursor="")
-                if text:
-                    self.uploaded_skripsi_path = file_path
-                    self.uploaded_skripsi_text = text
-                    upload_label.config(
-                        text=f"✔ {os.path.basename(file_path)} terupload",
-                        fg=ACCENT_COLOR
-                    )
-                    messagebox.showinfo("Sukses", "File skripsi berhasil diupload dan diproses.")
-                else:
-                    self.uploaded_skripsi_path = None
-                    self.uploaded_skripsi_text = None
-                    upload_label.config(text="Belum ada file terupload", fg="red")
+            threading.Thread(target=do_import, daemon=True).start()
 
-        upload_btn = tk.Button(
-            upload_frame,
-            text="Upload Skripsi (PDF/DOC/DOCX)",
-            command=upload_skripsi,
+        reference_btn = tk.Button(
+            reference_frame,
+            text="Impor Pustaka (Folder PDF)",
+            command=import_references,
             bg=BUTTON_BG,
             fg=BUTTON_FG,
             font=("Segoe UI", 10, "bold"),
@@ -421,16 +3340,26 @@ class ThesisApp:
             bd=0,
             cursor="hand2"
         )
-        upload_btn.pack(side="left", padx=(0, 12))
+        reference_btn.pack(side="left", padx=(0, 12))
 
-        upload_label = tk.Label(
-            upload_frame,
-            text="Belum ada file terupload",
+        reference_label = tk.Label(
+            reference_frame,
             bg=SECONDARY_COLOR,
-            fg="red",
+            fg=LABEL_FG,
             font=("Segoe UI", 9, "italic")
         )
-        upload_label.pack(side="left", padx=(0, 8))
+        reference_label.pack(side="left", padx=(0, 8))
+        update_reference_label()
+
+        tk.Checkbutton(
+            reference_frame,
+            text="Sertakan kutipan pustaka",
+            variable=use_references_var,
+            bg=SECONDARY_COLOR,
+            fg=LABEL_FG,
+            activebackground=SECONDARY_COLOR,
+            font=("Segoe UI", 9)
+        ).pack(side="left")
 
         # --- Fitur Pilih Skripsi (Bab) ---
         select_frame = tk.Frame(chat_win, bg=SECONDARY_COLOR)
@@ -456,6 +3385,17 @@ class ThesisApp:
         )
         chapter_combo['values'] = chapter_names
         chapter_combo.pack(side="left", padx=(0, 8))
+
+        review_changes_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            select_frame,
+            text="Review hanya perubahan sejak konsultasi terakhir",
+            variable=review_changes_var,
+            bg=SECONDARY_COLOR,
+            fg=LABEL_FG,
+            activebackground=SECONDARY_COLOR,
+            font=("Segoe UI", 9)
+        ).pack(side="left")
         if chapter_names:
             chapter_combo.current(0)
         else:
@@ -513,53 +3453,105 @@ class ThesisApp:
                 messagebox.showwarning("Skripsi Belum Diupload", "Silakan upload file skripsi (PDF/DOC/DOCX) terlebih dahulu agar AI dapat memahami konteks skripsi Anda.")
                 return
 
+            if chapter_combo.current() < 0:
+                messagebox.showwarning("Bab Belum Dipilih", "Silakan pilih bab skripsi terlebih dahulu untuk bertanya ke AI.")
+                return
+            chapter_id = chapter_list[chapter_combo.current()][0]
+
+            # Pertanyaan konsistensi sitasi/Daftar Pustaka dijawab lokal, tanpa request ke Groq
+            local_reply = format_citation_report(check_citations(skripsi_text)) if is_citation_question(user_msg) else None
+
+            # Ambil hanya teks bab terpilih (hasil segmentasi saat upload), jika terdeteksi
+            chapter_text = None
+            review_diff = None
+            document_summary = chapter_summary = None
+            if local_reply is None and self.uploaded_document_id is not None:
+                if review_changes_var.get():
+                    review_diff = self.build_revision_diff(self.uploaded_document_id, chapter_id)
+                    if review_diff is None:
+                        messagebox.showinfo("Review Perubahan", "Belum ada versi sebelumnya untuk dibandingkan. Pertanyaan dikirim dengan isi bab lengkap.")
+                    elif not review_diff[1]:
+                        messagebox.showinfo("Review Perubahan", f"Tidak ada perubahan sejak {review_diff[0]}.")
+                        return
+                chapter_text = self.get_chapter_text(self.uploaded_document_id, chapter_id, skripsi_text)
+                document_summary, chapter_summary = self.get_document_summaries(self.uploaded_document_id, chapter_id)
+
+            # Thread chat bab ini; konteks AI diambil dari pesan terakhir thread. Pesan user baru
+            # disimpan bersama jawabannya (add_chat_exchange) agar pertanyaan yang batal/gagal
+            # tidak tertinggal di thread tanpa jawaban dan ikut jadi konteks berikutnya
+            thread_id = chat_state["thread_id"] or self.get_chat_thread(chapter_id, self.uploaded_document_id)
+            chat_state["thread_id"] = thread_id
+            history = [
+                {"role": role, "content": content}
+                for _, role, content in self.load_chat_messages(thread_id, limit=CHAT_CONTEXT_MESSAGES)
+            ]
+
             # Tampilkan pesan user (bubble style)
             chat_history.config(state="normal")
-            chat_history.insert(tk.END, f"\n🧑 Anda ({selected_bab}):\n", "user_bold")
-            chat_history.insert(tk.END, f"{user_msg}\n", "user_msg")
+            render_message("user", user_msg)
             chat_history.config(state="disabled")
             chat_history.see(tk.END)
             input_var.set("")
             chat_win.update_idletasks()
 
-            # Kirim ke Groq AI
+            if local_reply is not None:
+                self.add_chat_exchange(thread_id, user_msg, local_reply)
+                chat_history.config(state="normal")
+                render_message("assistant", local_reply)
+                chat_history.config(state="disabled")
+                chat_history.see(tk.END)
+                return
+
+            # Kirim ke Groq AI; baris "(memproses...)" diberi tag unik agar bisa diganti tepat
+            chat_state["pending"] += 1
+            pending_tag = f"pending{chat_state['pending']}"
             chat_history.config(state="normal")
-            chat_history.insert(tk.END, "🤖 AI: (memproses...)\n", "ai_bold")
+            chat_history.insert(tk.END, "🤖 AI: (memproses...)\n", ("ai_bold", pending_tag))
             chat_history.config(state="disabled")
             chat_history.see(tk.END)
             chat_win.update_idletasks()
 
-            def do_ai():
-                # Prompt dengan konteks bab skripsi dan isi skripsi
-                # Batasi panjang skripsi_text agar tidak terlalu besar untuk API (misal 2000 kata)
-                max_words = 2000
-                skripsi_words = skripsi_text.split()
-                if len(skripsi_words) > max_words:
-                    skripsi_excerpt = " ".join(skripsi_words[:max_words]) + "\n\n[Isi skripsi dipotong untuk ringkasan.]"
-                else:
-                    skripsi_excerpt = skripsi_text
-
-                bab_prompt = (
-                    f"Saya sedang mengerjakan skripsi pada bab '{selected_bab}'. "
-                    f"Berikut adalah ringkasan isi skripsi saya (dari file yang diupload):\n"
-                    f"{skripsi_excerpt}\n\n"
-                    f"Berikut pertanyaan saya: {user_msg}\n"
-                    f"Jawablah dengan relevan terhadap bab tersebut dan isi skripsi saya di atas."
-                )
-                ai_reply = ask_groq_ai(bab_prompt)
+            use_references = use_references_var.get()
+
+            def finish_reply(ai_reply, failed=False):
+                # Dijalankan di thread Tk: simpan pertanyaan + jawaban lalu ganti baris "(memproses...)".
+                # Jawaban gagal hanya ditampilkan, tidak disimpan ke thread
+                if chat_closed.is_set():
+                    return
+                if not failed:
+                    self.add_chat_exchange(thread_id, user_msg, ai_reply)
+                if chat_state["thread_id"] != thread_id:
+                    return
                 chat_history.config(state="normal")
-                # Hapus "(memproses...)" terakhir
-                chat_content = chat_history.get("1.0", tk.END)
-                lines = chat_content.strip().split("\n")
-                if lines and lines[-1].startswith("🤖 AI: (memproses..."):
-                    lines = lines[:-1]
-                chat_history.delete("1.0", tk.END)
-                chat_history.insert(tk.END, "\n".join(lines) + "\n")
-                chat_history.insert(tk.END, "🤖 AI:\n", "ai_bold")
-                chat_history.insert(tk.END, f"{ai_reply}\n", "ai_msg")
+                pending = chat_history.tag_ranges(pending_tag)
+                if pending:
+                    chat_history.mark_set("reply_at", pending[0])
+                    chat_history.mark_gravity("reply_at", tk.RIGHT)
+                    chat_history.delete(pending[0], pending[1])
+                    render_message("assistant", ai_reply, "reply_at")
+                else:
+                    render_message("assistant", ai_reply)
                 chat_history.config(state="disabled")
                 chat_history.see(tk.END)
 
+            def do_ai():
+                bab_prompt = build_chat_prompt(selected_bab, skripsi_text, user_msg, chapter_text=chapter_text,
+                                               document_summary=document_summary, chapter_summary=chapter_summary,
+                                               review_diff=review_diff)
+                if use_references:
+                    passages = self.reference_library.search(user_msg)
+                    if passages:
+                        bab_prompt += "\n\n" + format_reference_passages(passages)
+                try:
+                    ai_reply, failed = request_groq_reply(bab_prompt, history, owner=chat_win), False
+                except CancelledError:
+                    return  # jendela chat ditutup
+                except Exception as e:
+                    ai_reply, failed = f"Terjadi error saat menghubungi AI: {e}", True
+                if chat_closed.is_set():
+                    return
+                self.root.after(0, finish_reply, ai_reply, failed)
+
             threading.Thread(target=do_ai, daemon=True).start()
 
         # Style untuk chat bubble
@@ -568,6 +3560,85 @@ class ThesisApp:
         chat_history.tag_configure("ai_bold", font=("Segoe UI", 10, "bold"), foreground=ACCENT_COLOR, spacing1=6)
         chat_history.tag_configure("ai_msg", font=("Segoe UI", 11), foreground="#222", lmargin1=18, lmargin2=18, spacing3=12)
 
+        # --- Thread chat tersimpan: hanya halaman terakhir dimuat, halaman lama dimuat saat scroll ke atas ---
+        chat_state = {"thread_id": None, "oldest_id": None, "has_more": False, "loading": False, "pending": 0}
+
+        def render_message(role, content, index=tk.END):
+            if role == "user":
+                chat_history.insert(index, f"\n🧑 Anda ({chapter_var.get()}):\n", "user_bold")
+                chat_history.insert(index, f"{content}\n", "user_msg")
+            else:
+                chat_history.insert(index, "🤖 AI:\n", "ai_bold")
+                chat_history.insert(index, f"{content}\n", "ai_msg")
+
+        def load_messages_page(initial=False):
+            rows = self.load_chat_messages(chat_state["thread_id"], before_id=chat_state["oldest_id"])
+            chat_state["has_more"] = len(rows) == CHAT_PAGE_SIZE
+            if not rows:
+                return
+            chat_state["oldest_id"] = rows[0][0]
+            chat_history.config(state="normal")
+            chat_history.mark_set("history_top", "1.0")
+            chat_history.mark_gravity("history_top", tk.RIGHT)
+            for _, role, content in rows:
+                render_message(role, content, tk.END if initial else "history_top")
+            chat_history.config(state="disabled")
+            if initial:
+                chat_history.see(tk.END)
+            else:
+                # Pertahankan posisi baca: pesan yang tadi paling atas tetap terlihat
+                chat_history.yview("history_top")
+
+        def load_older_messages():
+            if chat_state["loading"] or not chat_state["has_more"]:
+                return
+            chat_state["loading"] = True
+            try:
+                load_messages_page()
+            finally:
+                chat_state["loading"] = False
+
+        def open_chat_thread(event=None):
+            chat_history.config(state="normal")
+            chat_history.delete("1.0", tk.END)
+            chat_history.config(state="disabled")
+            chat_state.update(thread_id=None, oldest_id=None, has_more=False)
+            if chapter_combo.current() < 0:
+                return
+            chapter_id = chapter_list[chapter_combo.current()][0]
+            chat_state["thread_id"] = self.get_chat_thread(chapter_id, self.uploaded_document_id, create=False)
+            if chat_state["thread_id"]:
+                load_messages_page(initial=True)
+
+        def on_history_scroll(first, last):
+            chat_history.vbar.set(first, last)
+            if float(first) <= 0.0 and chat_state["has_more"] and not chat_state["loading"]:
+                chat_history.after_idle(load_older_messages)
+
+        chat_history.configure(yscrollcommand=on_history_scroll)
+        def on_chapter_change(event, chapters):
+            # Daftar bab berubah di jendela lain: perbarui pilihan tanpa query ulang
+            selected = chapter_var.get()
+            chapter_list[:] = self.chapter_store.chapter_list()
+            chapter_combo['values'] = [c[1] for c in chapter_list]
+            if event == "reset" or (event == "deleted" and selected in {chapter[1] for chapter in chapters}):
+                # Bab terpilih terhapus atau seluruh data dimuat ulang (restore): buka ulang thread
+                if event == "reset":
+                    load_latest_document()
+                if event == "reset" and selected in {c[1] for c in chapter_list}:
+                    chapter_var.set(selected)
+                elif chapter_list:
+                    chapter_combo.current(0)
+                else:
+                    chapter_combo.set('')
+                open_chat_thread()
+            elif selected:
+                chapter_var.set(selected)
+
+        chapter_combo.bind("<<ComboboxSelected>>", open_chat_thread)
+        self.chapter_store.subscribe_widget(chat_win, on_chapter_change)
+        open_chat_thread()
+
         input_entry.bind("<Return>", send_message)
         send_btn = tk.Button(
             input_frame,
@@ -587,12 +3658,76 @@ class ThesisApp:
 
         input_entry.focus_set()
 
-    def get_chapter_list(self):
-        self.cursor.execute("SELECT id, chapter_name FROM chapters ORDER BY id")
-        return self.cursor.fetchall()
+        # Batalkan permintaan AI yang masih antri saat jendela chat ditutup
+        chat_closed = threading.Event()
+
+        def on_chat_destroy(event):
+            if event.widget is chat_win:
+                chat_closed.set()
+                get_ai_scheduler().cancel_owner(chat_win)
+
+        chat_win.bind("<Destroy>", on_chat_destroy, add="+")
+
+    def start_summary_job(self, document_id, progress=None, done=None):
+        """
+        Buat ringkasan setiap bagian yang belum ada di cache, lalu ringkasan seluruh dokumen
+        dari ringkasan bagian, di thread background lewat AIScheduler (prioritas background).
+        Dipanggil setelah upload; biaya ringkasan dibayar sekali per isi bab, bukan per pertanyaan.
+        progress(selesai, total) dan done(gagal) dipanggil di thread Tk.
+        Mengembalikan jumlah ringkasan yang perlu dibuat (0 jika semua sudah ada).
+        """
+        self.cursor.execute("SELECT content_hash FROM documents WHERE id = ?", (document_id,))
+        row = self.cursor.fetchone()
+        if not row:
+            return 0
+        document_hash = row[0]
+        # Hanya bagian yang terpetakan ke bab (Daftar Pustaka/Lampiran tidak perlu diringkas)
+        sections = [section for section in self.load_document_sections(document_id, self.load_document_text(document_id))
+                    if section["chapter_id"] is not None and section["text"].strip()]
+        cached = self.load_summaries([document_hash] + [section["hash"] for section in sections])
+        todo = list({section["hash"]: section for section in sections if section["hash"] not in cached}.values())
+        total = len(todo) + (document_hash not in cached)
+        if not sections or not total:
+            return 0
+
+        def report(finished):
+            if progress:
+                self.root.after(0, progress, finished, total)
+
+        def run():
+            summaries = dict(cached)
+            failed = 0
+            # Semua potongan dikirim sekaligus; AIScheduler yang mengatur rate limit dan paralelisme
+            pending = [(section, [submit_summary(build_summary_request(section["heading"], chunk))
+                                  for chunk in split_words(section["text"])]) for section in todo]
+            for finished, (section, futures) in enumerate(pending, start=1):
+                try:
+                    parts = [summary_text(future.result()) for future in futures]
+                except Exception:
+                    failed += 1
+                    continue
+                summaries[section["hash"]] = "\n".join(parts)
+                self.root.after(0, self.save_summary, section["hash"], section["key"], summaries[section["hash"]])
+                report(finished)
+            if document_hash not in cached and not failed:
+                try:
+                    document_summary = summary_text(submit_summary(build_document_summary_request(
+                        [(section["heading"], summaries[section["hash"]]) for section in sections]
+                    )).result())
+                    self.root.after(0, self.save_summary, document_hash, SUMMARY_DOCUMENT_SCOPE, document_summary)
+                    report(total)
+                except Exception:
+                    failed += 1
+            if done:
+                self.root.after(0, done, failed)
+
+        threading.Thread(target=run, name="document-summaries", daemon=True).start()
+        return total
 
     def target_page(self):
         # Halaman input dan status target bab
+        if self.show_existing_window("Target Bab"):
+            return
         win = self.new_window("Target Bab")
 
         frame = ttk.LabelFrame(win, text="Tambah Target Bab")
@@ -607,63 +3742,92 @@ class ThesisApp:
         date_entry.grid(row=1, column=1, padx=5, pady=5)
 
         def save():
-            # Menyimpan target bab ke database
+            # Menyimpan target bab ke database (tabel diperbarui lewat event store)
             try:
-                self.cursor.execute("INSERT INTO chapters (chapter_name, target_date, status) VALUES (?, ?, ?)",
-                                    (chapter_entry.get(), date_entry.get_date(), 'Belum Selesai'))
-                self.conn.commit()
+                self.chapter_store.add(chapter_entry.get(), date_entry.get_date().isoformat(), 'Belum Selesai')
                 chapter_entry.delete(0, tk.END)
-                refresh()
             except Exception as e:
                 self.conn.rollback()
                 messagebox.showerror("Error", str(e))
 
         ttk.Button(frame, text="Simpan", command=save).grid(row=2, column=1, pady=10)
 
-        tree = ttk.Treeview(win, columns=("Bab", "Target", "Status"), show="headings")
+        # selectmode extended: Ctrl/Shift+klik untuk memilih banyak bab sekaligus
+        tree = ttk.Treeview(win, columns=("Bab", "Target", "Status"), show="headings", selectmode="extended")
         for col in ("Bab", "Target", "Status"):
             tree.heading(col, text=col)
         tree.pack(expand=True, fill="both", padx=10, pady=10)
 
+        def selected_ids():
+            # iid baris = id bab
+            return [int(iid) for iid in tree.selection()]
+
         def mark_done():
-            # Menandai bab sebagai selesai
-            selected = tree.focus()
-            if selected:
-                item = tree.item(selected)['values']
-                self.cursor.execute("UPDATE chapters SET status = 'Selesai' WHERE chapter_name = ?", (item[0],))
-                self.conn.commit()
-                refresh()
+            # Menandai semua bab terpilih sebagai selesai (satu transaksi)
+            ids = selected_ids()
+            if ids:
+                try:
+                    self.chapter_store.mark_done(ids)
+                except Exception as e:
+                    messagebox.showerror("Error", str(e))
+
+        def change_target():
+            ids = selected_ids()
+            if not ids:
+                return
+            target_date = self.ask_date("Ubah Target", f"Target selesai baru untuk {len(ids)} bab (YYYY-MM-DD):", win)
+            if target_date:
+                try:
+                    self.chapter_store.set_target_date(ids, target_date)
+                except Exception as e:
+                    messagebox.showerror("Error", str(e))
 
         def delete_selected():
-            # Menghapus entri bab
-            selected = tree.focus()
-            if selected:
-                item = tree.item(selected)['values']
-                confirm = messagebox.askyesno("Konfirmasi", f"Yakin ingin menghapus Bab '{item[0]}'?")
+            # Menghapus semua bab terpilih
+            ids = selected_ids()
+            if ids:
+                names = ", ".join(str(tree.item(str(i))['values'][0]) for i in ids[:5]) + (" ..." if len(ids) > 5 else "")
+                confirm = messagebox.askyesno("Konfirmasi", f"Yakin ingin menghapus {len(ids)} bab ({names})?")
                 if confirm:
                     try:
-                        self.cursor.execute("DELETE FROM chapters WHERE chapter_name = ?", (item[0],))
-                        self.conn.commit()
-                        refresh()
-                        messagebox.showinfo("Berhasil", "Data berhasil dihapus.")
+                        self.chapter_store.delete(ids)
+                        messagebox.showinfo("Berhasil", f"{len(ids)} bab berhasil dihapus.")
                     except Exception as e:
-                        self.conn.rollback()
                         messagebox.showerror("Error", str(e))
 
         ttk.Button(win, text="Tandai Selesai", command=mark_done).pack(pady=5)
+        ttk.Button(win, text="Ubah Target", command=change_target).pack(pady=5)
         ttk.Button(win, text="Hapus", command=delete_selected).pack(pady=5)
 
         def refresh():
-            # Menampilkan data terbaru pada tabel
+            # Menampilkan data bab dari store bersama
             tree.delete(*tree.get_children())
-            self.cursor.execute("SELECT chapter_name, target_date, status FROM chapters")
-            for row in self.cursor.fetchall():
-                tree.insert("", "end", values=row)
+            for chapter in self.chapter_store.chapters():
+                tree.insert("", "end", iid=str(chapter[0]), values=chapter[1:])
 
+        def on_chapter_change(event, chapters):
+            # Perbarui hanya baris yang berubah, termasuk perubahan dari jendela lain
+            if event == "reset":
+                refresh()
+                return
+            if event == "deleted":
+                tree.delete(*[str(chapter[0]) for chapter in chapters if tree.exists(str(chapter[0]))])
+                return
+            for chapter in chapters:
+                iid = str(chapter[0])
+                if event == "added":
+                    tree.insert("", "end", iid=iid, values=chapter[1:])
+                elif event == "updated" and tree.exists(iid):
+                    tree.item(iid, values=chapter[1:])
+
+        self.chapter_store.subscribe_widget(tree, on_chapter_change)
+        self.on_window_reopen(win, refresh)
         refresh()
 
     def consult_page(self):
         # Halaman jadwal konsultasi
+        if self.show_existing_window("Jadwal Konsultasi"):
+            return
         win = self.new_window("Jadwal Konsultasi")
 
         frame = ttk.LabelFrame(win, text="Tambah Jadwal Konsultasi")
@@ -678,12 +3842,9 @@ class ThesisApp:
         lecturer_entry.grid(row=1, column=1, padx=5, pady=5)
 
         ttk.Label(frame, text="Bab Terkait:").grid(row=2, column=0, padx=5, pady=5)
-        chapter_list = self.get_chapter_list()
-        chapter_ids = [c[0] for c in chapter_list]
-        chapter_names = [c[1] for c in chapter_list]
         chapter_var = tk.StringVar()
         chapter_combo = ttk.Combobox(frame, textvariable=chapter_var, state="readonly")
-        chapter_combo['values'] = chapter_names
+        chapter_combo['values'] = self.chapter_store.names()
         chapter_combo.grid(row=2, column=1, padx=5, pady=5)
 
         def save():
@@ -692,15 +3853,20 @@ class ThesisApp:
                 selected_chapter = chapter_combo.get()
                 if not selected_chapter:
                     raise Exception("Pilih satu Bab terkait.")
-                chapter_id = None
-                for idx, name in enumerate(chapter_names):
-                    if name == selected_chapter:
-                        chapter_id = chapter_ids[idx]
-                        break
+                chapter_id = self.chapter_store.id_for(selected_chapter)
                 if chapter_id is None:
                     raise Exception("Bab tidak valid.")
+                consult_date = date_entry.get_date().isoformat()
+                lecturer = lecturer_entry.get().strip()
+                conflict = self.find_consultation_conflict(lecturer, consult_date)
+                if conflict and not messagebox.askyesno(
+                    "Jadwal Bentrok",
+                    f"Dosen '{conflict[1]}' sudah punya jadwal konsultasi pada {conflict[0]} "
+                    f"(Bab '{conflict[2]}'). Tetap simpan?"
+                ):
+                    return
                 self.cursor.execute("INSERT INTO consultations (date, lecturer, chapter_id) VALUES (?, ?, ?)",
-                                    (date_entry.get_date(), lecturer_entry.get(), chapter_id))
+                                    (consult_date, lecturer, chapter_id))
                 self.conn.commit()
                 lecturer_entry.delete(0, tk.END)
                 chapter_combo.set('')
@@ -712,69 +3878,137 @@ class ThesisApp:
 
         ttk.Button(frame, text="Simpan", command=save).grid(row=3, column=1, pady=10)
 
-        tree = ttk.Treeview(win, columns=("Tanggal", "Dosen", "Bab Terkait"), show="headings")
+        # iid baris = id konsultasi; selectmode extended untuk aksi massal
+        tree = ttk.Treeview(win, columns=("Tanggal", "Dosen", "Bab Terkait"), show="headings", selectmode="extended")
         for col in ("Tanggal", "Dosen", "Bab Terkait"):
             tree.heading(col, text=col)
         tree.pack(expand=True, fill="both", padx=10, pady=10)
 
-        # Fungsi hapus konsultasi
+        # Fungsi hapus konsultasi terpilih
         def delete_selected():
-            selected = tree.focus()
-            if selected:
-                item = tree.item(selected)['values']
-                if not item:
+            selected = tree.selection()
+            if not selected:
+                return
+            confirm = messagebox.askyesno("Konfirmasi", f"Yakin ingin menghapus {len(selected)} konsultasi terpilih?")
+            if confirm:
+                try:
+                    self.write_many("DELETE FROM consultations WHERE id = ?", [(int(iid),) for iid in selected])
+                    tree.delete(*selected)
+                    self.collect_attachment_garbage()
+                    messagebox.showinfo("Berhasil", f"{len(selected)} konsultasi berhasil dihapus.")
+                except Exception as e:
+                    messagebox.showerror("Error", str(e))
+
+        def change_date():
+            selected = tree.selection()
+            if not selected:
+                return
+            new_date = self.ask_date("Ubah Tanggal", f"Tanggal baru untuk {len(selected)} konsultasi (YYYY-MM-DD):", win)
+            if new_date:
+                # Cek bentrok untuk setiap baris (juga antar baris terpilih); satu bentrok membatalkan semuanya
+                conflicts = []
+                moved = {}
+                for iid in selected:
+                    lecturer = tree.set(iid, "Dosen")
+                    bab = tree.set(iid, "Bab Terkait")
+                    key = lecturer.casefold()
+                    if key in moved:
+                        conflicts.append(f"- {lecturer} (Bab '{bab}'): bentrok dengan Bab '{moved[key]}' yang ikut dipindah")
+                        continue
+                    moved[key] = bab
+                    if tree.set(iid, "Tanggal") == new_date:
+                        continue  # tidak pindah; jadwal baris ini sendiri bukan bentrok
+                    conflict = self.find_consultation_conflict(lecturer, new_date)
+                    if conflict:
+                        conflicts.append(f"- {lecturer} (Bab '{bab}'): sudah ada jadwal Bab '{conflict[2]}'")
+                if conflicts:
+                    messagebox.showerror("Jadwal Bentrok",
+                                         f"Tanggal tidak diubah. Konsultasi berikut bentrok pada {new_date}:\n"
+                                         + "\n".join(conflicts))
                     return
-                tanggal, dosen, bab = item
-                # Cari id konsultasi berdasarkan data unik
-                self.cursor.execute("""
-                    SELECT c.id FROM consultations c
-                    LEFT JOIN chapters ch ON c.chapter_id = ch.id
-                    WHERE c.date = ? AND c.lecturer = ? AND ch.chapter_name = ?
-                    LIMIT 1
-                """, (tanggal, dosen, bab))
-                row = self.cursor.fetchone()
-                if row:
-                    consult_id = row[0]
-                    confirm = messagebox.askyesno("Konfirmasi", f"Yakin ingin menghapus konsultasi dengan Dosen '{dosen}' pada '{tanggal}' untuk Bab '{bab}'?")
-                    if confirm:
-                        try:
-                            self.cursor.execute("DELETE FROM consultations WHERE id = ?", (consult_id,))
-                            self.conn.commit()
-                            refresh()
-                            messagebox.showinfo("Berhasil", "Konsultasi berhasil dihapus.")
-                        except Exception as e:
-                            self.conn.rollback()
-                            messagebox.showerror("Error", str(e))
+                try:
+                    self.write_many("UPDATE consultations SET date = ? WHERE id = ?",
+                                    [(new_date, int(iid)) for iid in selected])
+                    for iid in selected:
+                        tree.set(iid, "Tanggal", new_date)
+                except Exception as e:
+                    messagebox.showerror("Error", str(e))
 
+        ttk.Button(win, text="Ubah Tanggal", command=change_date).pack(pady=5)
         ttk.Button(win, text="Hapus", command=delete_selected).pack(pady=5)
+        self.add_attachment_buttons(win, tree, "consultation", "konsultasi")
+        ttk.Button(win, text="Lihat Kalender", command=self.consultation_calendar_page).pack(pady=5)
 
         def refresh():
             tree.delete(*tree.get_children())
-            self.cursor.execute("""
-                SELECT c.date, c.lecturer, ch.chapter_name
-                FROM consultations c
-                LEFT JOIN chapters ch ON c.chapter_id = ch.id
-                ORDER BY c.date DESC
-            """)
+            self.cursor.execute(SQL_REFRESH_CONSULTATIONS)
             for row in self.cursor.fetchall():
-                tree.insert("", "end", values=row)
+                tree.insert("", "end", iid=str(row[0]), values=row[1:])
+
+        def on_chapter_change(event, chapters):
+            names = self.chapter_store.names()
+            chapter_combo['values'] = names
+            if event in ("deleted", "reset"):
+                if chapter_combo.get() not in names:
+                    chapter_combo.set('')
+                refresh()  # konsultasi bab tersebut ikut terhapus (ON DELETE CASCADE)
 
+        self.chapter_store.subscribe_widget(tree, on_chapter_change)
+        self.on_window_reopen(win, refresh)
         refresh()
 
+    def consultation_calendar_page(self):
+        # Kalender bulanan konsultasi; data diambil per bulan yang sedang tampil
+        if self.show_existing_window("Kalender Konsultasi"):
+            return
+        win = self.new_window("Kalender Konsultasi")
+
+        today = date.today()
+        calendar = Calendar(win, selectmode="day", year=today.year, month=today.month,
+                            date_pattern="yyyy-mm-dd", showothermonthdays=False)
+        calendar.pack(padx=10, pady=10, fill="both", expand=True)
+        calendar.tag_config("konsultasi", background="#2980b9", foreground="white")
+
+        detail_label = ttk.Label(win, text="Pilih tanggal untuk melihat detail konsultasi.", justify="left")
+        detail_label.pack(padx=10, pady=(0, 10), fill="x")
+
+        def load_month(event=None):
+            calendar.calevent_remove("all")
+            month, year = calendar.get_displayed_month()
+            for day, (count, lecturers) in self.load_consultation_month(year, month).items():
+                calendar.calevent_create(
+                    datetime.strptime(day, "%Y-%m-%d").date(), f"{count} konsultasi: {lecturers}", "konsultasi"
+                )
+
+        def show_day(event=None):
+            selected = calendar.get_date()
+            self.cursor.execute(SQL_CONSULTATION_DAY, (selected,))
+            rows = self.cursor.fetchall()
+            if rows:
+                detail_label.config(text=f"{selected}:\n" + "\n".join(
+                    f"- {lecturer} ({chapter_name})" for lecturer, chapter_name in rows
+                ))
+            else:
+                detail_label.config(text=f"{selected}: tidak ada konsultasi.")
+
+        calendar.bind("<<CalendarMonthChanged>>", load_month)
+        calendar.bind("<<CalendarSelected>>", show_day)
+        self.on_window_reopen(win, load_month)
+        load_month()
+
     def revision_page(self):
         # Halaman catatan revisi
+        if self.show_existing_window("Catatan Revisi"):
+            return
         win = self.new_window("Catatan Revisi")
 
         frame = ttk.LabelFrame(win, text="Tambah Catatan Revisi")
         frame.pack(pady=10, fill="x", padx=10)
 
         ttk.Label(frame, text="Bab Terkait:").grid(row=0, column=0, padx=5, pady=5)
-        chapter_list = self.get_chapter_list()
-        chapter_ids = [c[0] for c in chapter_list]
-        chapter_names = [c[1] for c in chapter_list]
         chapter_var = tk.StringVar()
         chapter_combo = ttk.Combobox(frame, textvariable=chapter_var, state="readonly")
-        chapter_combo['values'] = chapter_names
+        chapter_combo['values'] = self.chapter_store.names()
         chapter_combo.grid(row=0, column=1, padx=5, pady=5)
 
         ttk.Label(frame, text="Catatan:").grid(row=2, column=0, padx=5, pady=5)
@@ -789,99 +4023,306 @@ class ThesisApp:
                 selected_chapter = chapter_combo.get()
                 if not selected_chapter:
                     raise Exception("Pilih satu Bab terkait.")
-                chapter_id = None
-                for idx, name in enumerate(chapter_names):
-                    if name == selected_chapter:
-                        chapter_id = chapter_ids[idx]
-                        break
+                chapter_id = self.chapter_store.id_for(selected_chapter)
                 if chapter_id is None:
                     raise Exception("Bab tidak valid.")
+                similar = self.find_similar_revisions(notes)
                 self.cursor.execute("""
                     INSERT INTO revisions (notes, date, chapter_id)
                     VALUES (?, DATE('now'), ?)
                 """, (notes, chapter_id))
+                self.index_revision_note(self.cursor.lastrowid, chapter_id, notes)
                 self.conn.commit()
                 notes_text.delete("1.0", tk.END)
                 chapter_combo.set('')
                 refresh()
-                messagebox.showinfo("Success", "Revisi tersimpan.")
+                message = "Revisi tersimpan."
+                if similar:
+                    message += "\n\nCatatan serupa pernah diberikan sebelumnya:\n" + "\n".join(
+                        f"- {name} ({revision_date}, {similarity:.0%}): {other_notes}"
+                        for similarity, _, name, revision_date, other_notes in similar
+                    )
+                messagebox.showinfo("Success", message)
             except Exception as e:
                 self.conn.rollback()
                 messagebox.showerror("Error", str(e))
 
         ttk.Button(frame, text="Simpan", command=save).grid(row=3, column=1, pady=10)
 
-        tree = ttk.Treeview(win, columns=("Bab", "Catatan"), show="headings")
-        for col in ("Bab", "Catatan"):
+        # iid baris = id revisi; selectmode extended untuk aksi massal
+        tree = ttk.Treeview(win, columns=("Bab", "Catatan", "Tanggal"), show="headings", selectmode="extended")
+        for col in ("Bab", "Catatan", "Tanggal"):
             tree.heading(col, text=col)
         tree.pack(expand=True, fill="both", padx=10, pady=10)
 
-        # Fungsi hapus revisi
+        # Fungsi hapus revisi terpilih (baris revision_lsh ikut terhapus lewat ON DELETE CASCADE)
         def delete_selected():
-            selected = tree.focus()
-            if selected:
-                item = tree.item(selected)['values']
-                if not item:
-                    return
-                bab, catatan = item
-                # Cari id revisi berdasarkan data unik
-                self.cursor.execute("""
-                    SELECT r.id FROM revisions r
-                    LEFT JOIN chapters ch ON r.chapter_id = ch.id
-                    WHERE ch.chapter_name = ? AND r.notes = ?
-                    ORDER BY r.id DESC
-                    LIMIT 1
-                """, (bab, catatan))
-                row = self.cursor.fetchone()
-                if row:
-                    revision_id = row[0]
-                    confirm = messagebox.askyesno("Konfirmasi", f"Yakin ingin menghapus catatan revisi untuk Bab '{bab}'?")
-                    if confirm:
-                        try:
-                            self.cursor.execute("DELETE FROM revisions WHERE id = ?", (revision_id,))
-                            self.conn.commit()
-                            refresh()
-                            messagebox.showinfo("Berhasil", "Catatan revisi berhasil dihapus.")
-                        except Exception as e:
-                            self.conn.rollback()
-                            messagebox.showerror("Error", str(e))
+            selected = tree.selection()
+            if not selected:
+                return
+            confirm = messagebox.askyesno("Konfirmasi", f"Yakin ingin menghapus {len(selected)} catatan revisi terpilih?")
+            if confirm:
+                try:
+                    self.write_many("DELETE FROM revisions WHERE id = ?", [(int(iid),) for iid in selected])
+                    tree.delete(*selected)
+                    self.collect_attachment_garbage()
+                    messagebox.showinfo("Berhasil", f"{len(selected)} catatan revisi berhasil dihapus.")
+                except Exception as e:
+                    messagebox.showerror("Error", str(e))
+
+        def change_date():
+            selected = tree.selection()
+            if not selected:
+                return
+            new_date = self.ask_date("Ubah Tanggal", f"Tanggal baru untuk {len(selected)} catatan revisi (YYYY-MM-DD):", win)
+            if new_date:
+                try:
+                    self.write_many("UPDATE revisions SET date = ? WHERE id = ?",
+                                    [(new_date, int(iid)) for iid in selected])
+                    for iid in selected:
+                        tree.set(iid, "Tanggal", new_date)
+                except Exception as e:
+                    messagebox.showerror("Error", str(e))
 
+        ttk.Button(win, text="Ubah Tanggal", command=change_date).pack(pady=5)
         ttk.Button(win, text="Hapus", command=delete_selected).pack(pady=5)
+        self.add_attachment_buttons(win, tree, "revision", "catatan revisi")
+
+        def show_recurring():
+            # Tampilkan catatan revisi berulang, dikelompokkan per bab
+            if self.show_existing_window("Catatan Revisi Berulang"):
+                return
+            group_win = self.new_window("Catatan Revisi Berulang")
+            group_tree = ttk.Treeview(group_win, columns=("Tanggal",))
+            group_tree.heading("#0", text="Bab / Catatan")
+            group_tree.heading("Tanggal", text="Tanggal")
+            group_tree.column("#0", width=520)
+            group_tree.column("Tanggal", width=110)
+            group_tree.pack(expand=True, fill="both", padx=10, pady=10)
+
+            def fill_groups():
+                group_tree.delete(*group_tree.get_children())
+                found = False
+                for chapter_id, chapter_name in self.chapter_store.chapter_list():
+                    clusters = self.cluster_revision_notes(chapter_id)
+                    if not clusters:
+                        continue
+                    found = True
+                    chapter_node = group_tree.insert("", "end", text=chapter_name, open=True)
+                    for cluster in clusters:
+                        cluster_node = group_tree.insert(
+                            chapter_node, "end", text=f"{len(cluster)}x: {cluster[-1][2]}", values=(cluster[-1][1],)
+                        )
+                        for _, revision_date, notes in cluster:
+                            group_tree.insert(cluster_node, "end", text=notes, values=(revision_date,))
+                if not found:
+                    group_tree.insert("", "end", text="Belum ada catatan revisi yang berulang.")
+
+            self.on_window_reopen(group_win, fill_groups)
+            fill_groups()
+
+        ttk.Button(win, text="Kelompokkan Catatan Berulang", command=show_recurring).pack(pady=5)
 
         def refresh():
             tree.delete(*tree.get_children())
-            self.cursor.execute("""
-                SELECT ch.chapter_name, r.notes
-                FROM revisions r
-                LEFT JOIN chapters ch ON r.chapter_id = ch.id
-                ORDER BY r.id DESC
-            """)
+            self.cursor.execute(SQL_REFRESH_REVISIONS)
             for row in self.cursor.fetchall():
-                tree.insert("", "end", values=row)
+                tree.insert("", "end", iid=str(row[0]), values=row[1:])
 
+        def on_chapter_change(event, chapters):
+            names = self.chapter_store.names()
+            chapter_combo['values'] = names
+            if event in ("deleted", "reset"):
+                if chapter_combo.get() not in names:
+                    chapter_combo.set('')
+                refresh()  # catatan revisi bab tersebut ikut terhapus (ON DELETE CASCADE)
+
+        self.chapter_store.subscribe_widget(tree, on_chapter_change)
+        self.on_window_reopen(win, refresh)
         refresh()
 
     def statistic_page(self):
         # Menampilkan grafik pie progress skripsi
+        if self.show_existing_window("Statistik Progress"):
+            return
         win = self.new_window("Statistik Progress")
-        try:
+        fig, ax = plt.subplots()
+        canvas = FigureCanvasTkAgg(fig, win)
+        canvas.get_tk_widget().pack()
+        # Figure pyplot tetap terdaftar global sampai plt.close, jadi ditutup bersama jendela
+        self.on_window_close(win, lambda: plt.close(fig))
+        overdue_label = ttk.Label(win, text="")
+        overdue_label.pack(pady=5)
+
+        def draw():
+            try:
+                selesai, belum, terlambat = self.load_progress()
+                overdue_label.config(text=f"Bab terlambat (lewat target): {terlambat}")
+
+                with trace_span("render", "statistic_chart"):
+                    ax.clear()
+                    ax.pie([selesai, belum], labels=["Selesai", "Belum Selesai"],
+                           autopct='%1.1f%%', colors=["green", "red"])
+                    ax.set_title("Progress Skripsi")
+                    canvas.draw_idle()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+        def check_counters():
+            try:
+                mismatched = self.check_progress_counters()
+                if mismatched:
+                    messagebox.showinfo("Penghitung Progress",
+                                        f"Penghitung dibangun ulang untuk workspace: {', '.join(mismatched)}", parent=win)
+                else:
+                    messagebox.showinfo("Penghitung Progress", "Penghitung sudah konsisten.", parent=win)
+                draw()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+        ttk.Button(win, text="Periksa Penghitung", command=check_counters).pack(pady=5)
+
+        self.on_window_reopen(win, draw)
+        draw()
+
+    def batch_review_page(self):
+        # Review AI untuk semua bab sekaligus (request berjalan paralel dengan asyncio)
+        if self.show_existing_window("Review Semua Bab (AI)"):
+            return
+        win = self.new_window("Review Semua Bab (AI)")
+
+        info_label = ttk.Label(win, text="")
+        info_label.pack(pady=(10, 0))
+
+        tree = ttk.Treeview(win, columns=("Bab", "Status", "Review"), show="headings")
+        tree.heading("Bab", text="Bab")
+        tree.heading("Status", text="Status")
+        tree.heading("Review", text="Review Terakhir")
+        tree.column("Bab", width=180)
+        tree.column("Status", width=110)
+        tree.column("Review", width=360)
+        tree.pack(expand=True, fill="both", padx=10, pady=10)
+
+        reviews = {}
+
+        def load_rows():
+            tree.delete(*tree.get_children())
+            reviews.clear()
             self.cursor.execute("""
-                SELECT 
-                    SUM(CASE WHEN status = 'Selesai' THEN 1 ELSE 0 END),
-                    SUM(CASE WHEN status = 'Belum Selesai' THEN 1 ELSE 0 END)
-                FROM chapters
-            """)
-            selesai, belum = self.cursor.fetchone()
-            selesai = selesai or 0
-            belum = belum or 0
-
-            fig, ax = plt.subplots()
-            ax.pie([selesai, belum], labels=["Selesai", "Belum Selesai"],
-                   autopct='%1.1f%%', colors=["green", "red"])
-            ax.set_title("Progress Skripsi")
-            FigureCanvasTkAgg(fig, win).get_tk_widget().pack()
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+                SELECT ch.id, ch.chapter_name, r.review, r.created_at
+                FROM chapters ch
+                LEFT JOIN chapter_reviews r ON r.id = (
+                    SELECT MAX(id) FROM chapter_reviews WHERE chapter_id = ch.id
+                )
+                WHERE ch.workspace = ?
+                ORDER BY ch.id
+            """, (WORKSPACE,))
+            for chapter_id, name, review, created_at in self.cursor.fetchall():
+                reviews[chapter_id] = review
+                status = f"Review {created_at[:10]}" if review else "Belum direview"
+                tree.insert("", "end", iid=str(chapter_id),
+                            values=(name, status, " ".join((review or "").split())[:120]))
+
+        def on_chapter_change(event, chapters):
+            if event == "reset":
+                load_rows()
+                return
+            for chapter in chapters:
+                iid = str(chapter[0])
+                if event == "added":
+                    tree.insert("", "end", iid=iid, values=(chapter[1], "Belum direview", ""))
+                elif event == "deleted" and tree.exists(iid):
+                    tree.delete(iid)
+                    reviews.pop(chapter[0], None)
+
+        self.chapter_store.subscribe_widget(tree, on_chapter_change)
+
+        def set_status(chapter_id, status, text=None):
+            if not tree.winfo_exists() or not tree.exists(str(chapter_id)):
+                return
+            labels = {"antri": "Antri", "berjalan": "Memproses...", "selesai": "Selesai", "gagal": "Gagal"}
+            tree.set(str(chapter_id), "Status", labels.get(status, status))
+            if text:
+                tree.set(str(chapter_id), "Review", " ".join(text.split())[:120])
+
+        def start_review():
+            document = self.get_latest_document()
+            if not document:
+                messagebox.showwarning("Skripsi Belum Diupload", "Upload file skripsi terlebih dahulu di jendela Chat AI.", parent=win)
+                return
+            text = self.load_document_text(document["id"])
+            jobs = []
+            for chapter_id, chapter_name in self.get_chapter_list():
+                chapter_text = self.get_chapter_text(document["id"], chapter_id, text)
+                if not chapter_text:
+                    set_status(chapter_id, "Tidak terdeteksi")
+                    continue
+                jobs.append((chapter_id, build_bab_prompt(chapter_name, text, BATCH_REVIEW_QUESTION,
+                                                          chapter_text=chapter_text)))
+                set_status(chapter_id, "antri")
+            if not jobs:
+                messagebox.showinfo("Review", "Tidak ada bab yang terdeteksi di skripsi.", parent=win)
+                return
+            start_btn.config(state="disabled")
+            started = time.perf_counter()
+
+            def progress(chapter_id, status, text=None):
+                self.root.after(0, set_status, chapter_id, status, text)
+
+            def save_results(results):
+                saved = 0
+                try:
+                    self.cursor.executemany("""
+                        INSERT INTO chapter_reviews (chapter_id, document_id, review, created_at)
+                        VALUES (?, ?, ?, ?)
+                    """, [(chapter_id, document["id"], review, datetime.now().isoformat(timespec="seconds"))
+                          for chapter_id, review, error in results if review])
+                    saved = self.cursor.rowcount
+                    self.conn.commit()
+                except Exception as e:
+                    self.conn.rollback()
+                    messagebox.showerror("Error", str(e))
+                if not win.winfo_exists():
+                    return
+                start_btn.config(state="normal")
+                failed = sum(1 for _, review, _ in results if not review)
+                info_label.config(
+                    text=f"{saved} bab direview dalam {time.perf_counter() - started:.1f} detik"
+                         + (f", {failed} gagal" if failed else "")
+                )
+                load_rows()
+                for chapter_id, review, error in results:
+                    if error:
+                        set_status(chapter_id, "gagal", error)
+
+            def run():
+                try:
+                    results = asyncio.run(review_chapters_async(jobs, progress=progress))
+                except Exception as e:
+                    results = [(chapter_id, None, str(e)) for chapter_id, _ in jobs]
+                # Simpan ke SQLite di thread Tk (koneksi tidak boleh dipakai lintas thread)
+                self.root.after(0, save_results, results)
+
+            threading.Thread(target=run, daemon=True).start()
+
+        def show_review(event=None):
+            selected = tree.focus()
+            review = reviews.get(int(selected)) if selected else None
+            if not review:
+                return
+            detail = tk.Toplevel(win)
+            detail.title(f"Review {tree.set(selected, 'Bab')}")
+            text_widget = scrolledtext.ScrolledText(detail, wrap=tk.WORD, width=80, height=25)
+            text_widget.insert(tk.END, review)
+            text_widget.config(state="disabled")
+            text_widget.pack(fill="both", expand=True)
+
+        tree.bind("<Double-1>", show_review)
+        start_btn = ttk.Button(win, text="Mulai Review Semua Bab", command=start_review)
+        start_btn.pack(pady=5)
+        ttk.Label(win, text="Klik dua kali pada baris untuk membaca review lengkap.").pack(pady=(0, 10))
+
+        load_rows()
 
     def print_pdf_report(self):
         # Fungsi untuk mencetak laporan PDF kinerja skripsi dengan tampilan modern & profesional
@@ -894,245 +4335,189 @@ class ThesisApp:
             if not file_path:
                 return
 
-            c = canvas.Canvas(file_path, pagesize=A4)
-            width, height = A4
-            margin = 40
-            padding_y = 8  # padding vertikal antar baris
-            padding_x = 10 # padding horizontal antar kolom/tepi
-            y = height - margin
-
-            # Header dengan garis dan logo (jika ada)
-            c.setFillColor(colors.HexColor(PDF_HEADER_COLOR))
-            c.rect(0, height-70, width, 70, fill=1, stroke=0)
-            c.setFillColor(PDF_HEADER_TEXT_COLOR)
-            c.setFont(PDF_HEADER_FONT, PDF_HEADER_FONT_SIZE)
-            c.drawString(margin + padding_x, height-50, PDF_HEADER_TITLE)
-            c.setFont(PDF_HEADER_DATE_FONT, PDF_HEADER_DATE_FONT_SIZE)
-            c.drawString(margin + padding_x, height-65, f"Tanggal Cetak: {datetime.now().strftime('%d-%m-%Y %H:%M')}")
-            c.setFillColor(colors.black)
-            y = height - 90
-
-            # Garis bawah header
-            c.setStrokeColor(colors.HexColor(PDF_HEADER_LINE_COLOR))
-            c.setLineWidth(2)
-            c.line(margin, y+10, width-margin, y+10)
-            y -= 10 + padding_y
-
-            # Section: Target Bab
-            c.setFont("Helvetica-Bold", 15)
-            c.setFillColor(colors.HexColor(PDF_SECTION_TITLE_COLOR))
-            c.drawString(margin + padding_x, y, "1. Target Bab")
-            y -= 18 + padding_y
-            c.setFillColor(colors.black)
-            self.cursor.execute("SELECT chapter_name, target_date, status FROM chapters ORDER BY id")
-            chapters = self.cursor.fetchall()
-            if chapters:
-                # Table header
-                c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_BG))
-                c.roundRect(margin-2, y-2, width-2*margin+4, 22, 5, fill=1, stroke=0)
-                c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_TEXT))
-                c.setFont("Helvetica-Bold", 11)
-                c.drawString(margin+5+padding_x, y+4, "Bab")
-                c.drawString(margin+180+padding_x, y+4, "Target Selesai")
-                c.drawString(margin+320+padding_x, y+4, "Status")
-                c.setFont("Helvetica", 11)
-                y -= 22 + padding_y
-                c.setFillColor(colors.black)
-                for idx, (bab, tgl, status) in enumerate(chapters):
-                    c.setFillColor(colors.HexColor(PDF_TABLE_ROW_ALT_BG) if (idx%2==0) else PDF_TABLE_ROW_BG)
-                    c.roundRect(margin-2, y-2, width-2*margin+4, 18, 3, fill=1, stroke=0)
-                    c.setFillColor(colors.black)
-                    c.drawString(margin+5+padding_x, y+2, str(bab))
-                    c.drawString(margin+180+padding_x, y+2, str(tgl))
-                    # Status badge with padding
-                    status_text = f"  {status}  "  # Tambahkan padding kiri dan kanan
-                    if status == "Selesai":
-                        c.setFillColor(colors.HexColor(PDF_STATUS_DONE_COLOR))
-                    else:
-                        c.setFillColor(colors.HexColor(PDF_STATUS_NOT_DONE_COLOR))
-                    # Hitung lebar badge berdasarkan panjang status + padding
-                    badge_font = "Helvetica-Bold"
-                    badge_font_size = 10
-                    c.setFont(badge_font, badge_font_size)
-                    badge_width = c.stringWidth(status_text, badge_font, badge_font_size) + 8  # extra padding
-                    badge_x = margin+320+padding_x
-                    badge_y = y+2
-                    c.roundRect(badge_x, badge_y, badge_width, 14, 4, fill=1, stroke=0)
-                    c.setFillColor(colors.white)
-                    c.drawCentredString(badge_x + badge_width/2, badge_y+4, status_text)
-                    c.setFont("Helvetica", 11)
-                    c.setFillColor(colors.black)
-                    y -= 18 + padding_y
-                    if y < 100:
-                        c.showPage()
-                        y = height - margin
-            else:
-                c.setFont("Helvetica-Oblique", 11)
-                c.drawString(margin + padding_x, y, "Belum ada data target bab.")
-                y -= 18 + padding_y
+            with trace_span("render", "pdf_report") as span:
+                self.render_pdf_report(file_path)
+                if span is not _NULL_SPAN:
+                    span.set(bytes=os.path.getsize(file_path))
+            messagebox.showinfo("Sukses", f"Laporan PDF berhasil disimpan di:\n{file_path}")
+            send_wa_pdf_notification(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Gagal mencetak laporan PDF:\n{e}")
 
-            y -= 10 + padding_y
+    def schedule_backups(self):
+        # Jadwalkan backup berikutnya; jika backup terakhir sudah terlalu lama, jalankan segera setelah startup
+        if BACKUP_INTERVAL_MINUTES <= 0:
+            return
+        interval = BACKUP_INTERVAL_MINUTES * 60
+        backups = list_backups()
+        due_in = interval - (time.time() - os.path.getmtime(backups[0])) if backups else 0
+        self.root.after(int(max(due_in, BACKUP_STARTUP_DELAY) * 1000), self.run_scheduled_backup)
 
-            # Section: Jadwal Konsultasi
-            c.setFont("Helvetica-Bold", 15)
-            c.setFillColor(colors.HexColor(PDF_SECTION_TITLE_COLOR))
-            c.drawString(margin + padding_x, y, "2. Jadwal Konsultasi")
-            y -= 18 + padding_y
-            c.setFillColor(colors.black)
-            c.setFont("Helvetica", 11)
-            self.cursor.execute("""
-                SELECT c.date, c.lecturer, ch.chapter_name
-                FROM consultations c
-                LEFT JOIN chapters ch ON c.chapter_id = ch.id
-                ORDER BY c.date DESC
-            """)
-            consults = self.cursor.fetchall()
-            if consults:
-                c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_BG))
-                c.roundRect(margin-2, y-2, width-2*margin+4, 22, 5, fill=1, stroke=0)
-                c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_TEXT))
-                c.setFont("Helvetica-Bold", 11)
-                c.drawString(margin+5+padding_x, y+4, "Tanggal")
-                c.drawString(margin+110+padding_x, y+4, "Dosen")
-                c.drawString(margin+260+padding_x, y+4, "Bab Terkait")
-                c.setFont("Helvetica", 11)
-                y -= 22 + padding_y
-                c.setFillColor(colors.black)
-                for idx, (tgl, dosen, bab) in enumerate(consults):
-                    c.setFillColor(colors.HexColor(PDF_TABLE_ROW_ALT_BG) if (idx%2==0) else PDF_TABLE_ROW_BG)
-                    c.roundRect(margin-2, y-2, width-2*margin+4, 18, 3, fill=1, stroke=0)
-                    c.setFillColor(colors.black)
-                    c.drawString(margin+5+padding_x, y+2, str(tgl))
-                    c.drawString(margin+110+padding_x, y+2, str(dosen))
-                    c.drawString(margin+260+padding_x, y+2, str(bab))
-                    y -= 18 + padding_y
-                    if y < 100:
-                        c.showPage()
-                        y = height - margin
-            else:
-                c.setFont("Helvetica-Oblique", 11)
-                c.drawString(margin + padding_x, y, "Belum ada data konsultasi.")
-                y -= 18 + padding_y
+    def run_scheduled_backup(self):
+        self.start_backup()
+        self.root.after(BACKUP_INTERVAL_MINUTES * 60 * 1000, self.run_scheduled_backup)
 
-            y -= 10 + padding_y
+    def start_backup(self, progress=None, done=None, keep=BACKUP_KEEP):
+        """
+        Jalankan backup_database di thread background. progress(halaman, total) dan
+        done(path, error) dipanggil di thread Tk. Mengembalikan False jika backup lain masih berjalan.
+        """
+        if self.backup_thread is not None and self.backup_thread.is_alive():
+            return False
 
-            # Section: Catatan Revisi
-            c.setFont("Helvetica-Bold", 15)
-            c.setFillColor(colors.HexColor(PDF_SECTION_TITLE_COLOR))
-            c.drawString(margin + padding_x, y, "3. Catatan Revisi")
-            y -= 18 + padding_y
-            c.setFillColor(colors.black)
-            c.setFont("Helvetica", 11)
-            self.cursor.execute("""
-                SELECT ch.chapter_name, r.notes, r.date
-                FROM revisions r
-                LEFT JOIN chapters ch ON r.chapter_id = ch.id
-                ORDER BY r.id DESC
-            """)
-            revisions = self.cursor.fetchall()
-            if revisions:
-                # Header background
-                header_height = 22
-                header_y = y
-                c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_BG))
-                c.roundRect(margin, header_y, width-2*margin, header_height, 5, fill=1, stroke=0)
-                # Header text
-                c.setFillColor(colors.HexColor(PDF_TABLE_HEADER_TEXT))
-                c.setFont("Helvetica-Bold", 11)
-                c.drawString(margin + padding_x + 5, header_y + 6, "Bab")
-                c.drawString(margin + padding_x + 120, header_y + 6, "Catatan")
-                c.drawString(margin + padding_x + 380, header_y + 6, "Tanggal")
-                y -= header_height + padding_y
-                c.setFont("Helvetica", 11)
-                for idx, (bab, catatan, tgl) in enumerate(revisions):
-                    row_height = 18
-                    row_y = y
-                    # Row background
-                    c.setFillColor(colors.HexColor(PDF_TABLE_ROW_ALT_BG) if (idx % 2 == 0) else PDF_TABLE_ROW_BG)
-                    c.roundRect(margin, row_y, width-2*margin, row_height, 3, fill=1, stroke=0)
-                    # Row text
-                    c.setFillColor(colors.black)
-                    # Batasi bab maksimal 15 huruf
-                    bab_str = str(bab)
-                    if len(bab_str) > 15:
-                        bab_str = bab_str[:12] + "..."
-                    c.drawString(margin + padding_x + 5, row_y + 4, bab_str)
-                    # Catatan wrap/ellipsis
-                    catatan_str = str(catatan)
-                    if len(catatan_str) > 50:
-                        catatan_str = catatan_str[:47] + "..."
-                    c.drawString(margin + padding_x + 120, row_y + 4, catatan_str)
-                    c.drawString(margin + padding_x + 380, row_y + 4, str(tgl))
-                    y -= row_height + padding_y
-                    if y < 100:
-                        c.showPage()
-                        y = height - margin
-            else:
-                c.setFont("Helvetica-Oblique", 11)
-                c.drawString(margin + padding_x, y, "Belum ada catatan revisi.")
-                y -= 18 + padding_y
+        def on_progress(copied, total):
+            if progress:
+                self.root.after(0, progress, copied, total)
+
+        def run():
+            try:
+                path, error = backup_database(progress=on_progress, keep=keep), None
+            except Exception as e:
+                path, error = None, e
+            if done:
+                self.root.after(0, done, path, error)
 
-            y -= 10 + padding_y
+        self.backup_thread = threading.Thread(target=run, name="db-backup", daemon=True)
+        self.backup_thread.start()
+        return True
 
-            # Section: Statistik Progress
-            c.setFont("Helvetica-Bold", 15)
-            c.setFillColor(colors.HexColor(PDF_SECTION_TITLE_COLOR))
-            c.drawString(margin + padding_x, y, "4. Statistik Progress")
-            y -= 18 + padding_y
-            c.setFillColor(colors.black)
-            self.cursor.execute("""
-                SELECT 
-                    SUM(CASE WHEN status = 'Selesai' THEN 1 ELSE 0 END),
-                    SUM(CASE WHEN status = 'Belum Selesai' THEN 1 ELSE 0 END)
-                FROM chapters
-            """)
-            selesai, belum = self.cursor.fetchone()
-            selesai = selesai or 0
-            belum = belum or 0
-            total = selesai + belum
-            c.setFont("Helvetica", 11)
-            # Progress bar visual
-            bar_x = margin + padding_x
-            bar_y = y
-            bar_width = width - 2*margin - 2*padding_x
-            bar_height = 18
-            if total > 0:
-                percent = selesai / total
-                # Text
-                c.setFillColor(colors.black)
-                c.drawString(bar_x, bar_y-5, f"Bab Selesai: {selesai}")
-                c.drawString(bar_x+150, bar_y-5, f"Bab Belum Selesai: {belum}")
-                c.drawString(bar_x+320, bar_y-5, f"Persentase Selesai: {percent*100:.1f}%")
-                y -= 30 + padding_y
+    def backup_page(self):
+        # Halaman backup manual, daftar snapshot, dan restore
+        if self.show_existing_window("Backup & Restore"):
+            return
+        win = self.new_window("Backup & Restore")
+
+        status_label = ttk.Label(win, text=f"Backup otomatis setiap {BACKUP_INTERVAL_MINUTES} menit, "
+                                           f"menyimpan {BACKUP_KEEP} snapshot terakhir di '{BACKUP_DIR}'.")
+        status_label.pack(pady=(10, 0))
+
+        tree = ttk.Treeview(win, columns=("File", "Ukuran", "Waktu"), show="headings")
+        for col in ("File", "Ukuran", "Waktu"):
+            tree.heading(col, text=col)
+        tree.pack(expand=True, fill="both", padx=10, pady=10)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for path in list_backups():
+                tree.insert("", "end", iid=path, values=(
+                    os.path.basename(path),
+                    f"{os.path.getsize(path) / 1024:.0f} KB",
+                    datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d %H:%M:%S"),
+                ))
+
+        def show_progress(copied, total):
+            if status_label.winfo_exists():
+                status_label.config(text=f"Backup berjalan: {copied}/{total} halaman")
+
+        def backup_done(path, error):
+            if not win.winfo_exists():
+                return
+            backup_btn.config(state="normal")
+            if error:
+                status_label.config(text="Backup gagal.")
+                messagebox.showerror("Error", str(error), parent=win)
             else:
-                c.setFont("Helvetica-Oblique", 11)
-                c.drawString(margin + padding_x, y, "Belum ada data progress.")
-                y -= 18 + padding_y
+                status_label.config(text=f"Backup selesai: {os.path.basename(path)}")
+                refresh()
 
-            # Footer
-            c.setStrokeColor(colors.HexColor(PDF_FOOTER_LINE_COLOR))
-            c.setLineWidth(1)
-            c.line(margin, 50, width-margin, 50)
-            c.setFont(PDF_FOOTER_FONT, PDF_FOOTER_FONT_SIZE)
-            c.setFillColor(colors.HexColor(PDF_FOOTER_TEXT_COLOR))
-            c.drawCentredString(width/2, 38, PDF_FOOTER_TEXT)
-            c.save()
-            messagebox.showinfo("Sukses", f"Laporan PDF berhasil disimpan di:\n{file_path}")
-            send_wa_pdf_notification(file_path)
-        except Exception as e:
-            messagebox.showerror("Error", f"Gagal mencetak laporan PDF:\n{e}")
+        def backup_now():
+            if self.start_backup(progress=show_progress, done=backup_done):
+                backup_btn.config(state="disabled")
+            else:
+                messagebox.showinfo("Backup", "Backup lain sedang berjalan.", parent=win)
+
+        def restore_selected():
+            selected = tree.focus()
+            if not selected:
+                return
+            if not messagebox.askyesno(
+                "Konfirmasi",
+                f"Kembalikan database ke '{os.path.basename(selected)}'? Data saat ini akan di-backup dulu, "
+                "lalu diganti isi backup tersebut.",
+                parent=win
+            ):
+                return
+
+            def safety_backup_done(path, error):
+                # Restore dijalankan di thread Tk karena memakai koneksi utama aplikasi
+                if error:
+                    messagebox.showerror("Error", f"Backup sebelum restore gagal: {error}", parent=win)
+                    return
+                try:
+                    restore_database(self.conn, selected)
+                    self.reload_after_restore()
+                    messagebox.showinfo("Berhasil", "Database berhasil dikembalikan.", parent=win)
+                except Exception as e:
+                    messagebox.showerror("Error", str(e), parent=win)
+                if win.winfo_exists():
+                    refresh()
+
+            # keep=None: rotasi dilewati agar backup yang dipilih tidak ikut terhapus
+            if not self.start_backup(progress=show_progress, done=safety_backup_done, keep=None):
+                messagebox.showinfo("Backup", "Backup lain sedang berjalan, coba lagi sebentar.", parent=win)
+
+        backup_btn = ttk.Button(win, text="Backup Sekarang", command=backup_now)
+        backup_btn.pack(pady=5)
+        ttk.Button(win, text="Restore Backup Terpilih", command=restore_selected).pack(pady=5)
+
+        self.on_window_reopen(win, refresh)
+        refresh()
+
+    def ask_date(self, title, prompt, parent):
+        # Minta tanggal YYYY-MM-DD; None jika dibatalkan atau formatnya salah
+        value = simpledialog.askstring(title, prompt, initialvalue=date.today().isoformat(), parent=parent)
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value.strip(), "%Y-%m-%d").date().isoformat()
+        except ValueError:
+            messagebox.showerror("Error", "Format tanggal harus YYYY-MM-DD.", parent=parent)
+            return None
 
     def new_window(self, title):
+        # Satu jendela per halaman (title); dicatat agar bisa dipakai ulang lewat show_existing_window
         win = tk.Toplevel(self.root)
         win.title(title)
         win.geometry(WINDOW_GEOMETRY)
         win.configure(bg=WINDOW_BG_COLOR)
+        self.windows[title] = win
+        win.bind("<Destroy>", lambda event: self.forget_window(title, win) if event.widget is win else None, add="+")
         return win
 
+    def show_existing_window(self, title):
+        """
+        Jika halaman sudah terbuka: bawa ke depan dan jalankan fungsi refresh-nya,
+        tanpa membangun ulang widget. Mengembalikan False jika halaman perlu dibuat.
+        """
+        win = self.windows.get(title)
+        if win is None or not win.winfo_exists():
+            return False
+        win.deiconify()
+        win.lift()
+        win.focus_force()
+        refresh = self.window_refreshers.get(win)
+        if refresh:
+            refresh()
+        return True
+
+    def on_window_reopen(self, win, refresh):
+        # Dipanggil setiap kali halaman yang sudah terbuka dipilih lagi dari menu
+        self.window_refreshers[win] = refresh
+
+    def on_window_close(self, win, cleanup):
+        # Dipanggil saat jendela dihancurkan (mis. menutup figure matplotlib)
+        self.window_cleanups.setdefault(win, []).append(cleanup)
+
+    def forget_window(self, title, win):
+        for cleanup in self.window_cleanups.pop(win, []):
+            cleanup()
+        self.window_refreshers.pop(win, None)
+        if self.windows.get(title) is win:
+            del self.windows[title]
+
     def __del__(self):
         if hasattr(self, 'conn'):
-            self.cursor.close()
-            self.conn.close()
+            self.close()
 
 if __name__ == "__main__":
     root = tk.Tk()
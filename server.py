@@ -0,0 +1,581 @@
+"""
+Mode server (opsional) untuk Aplikasi Manajemen Skripsi.
+
+Menyediakan data bab, konsultasi, revisi, progress, dan chat AI Groq sebagai JSON HTTP API
+di atas asyncio, memakai skema SQLite yang sama dengan aplikasi Tk (DB_NAME). Query SQLite
+dijalankan di thread pool dengan koneksi yang di-pool (WAL, busy_timeout), sehingga banyak
+mahasiswa/dosen bisa terhubung bersamaan tanpa memblokir event loop. Jawaban chat di-stream
+sebagai NDJSON (satu objek JSON per baris, Transfer-Encoding: chunked).
+
+Endpoint:
+    GET    /api/health
+    GET    /api/chapters                      POST /api/chapters {chapter_name, target_date}
+    PATCH  /api/chapters/<id> {status?, target_date?}
+    DELETE /api/chapters/<id>
+    GET    /api/progress
+    GET    /api/consultations[?month=YYYY-MM] POST /api/consultations {date, lecturer, chapter_id, force?}
+    DELETE /api/consultations/<id>
+    GET    /api/revisions[?chapter_id=<id>]   POST /api/revisions {chapter_id, notes}
+    DELETE /api/revisions/<id>
+    GET    /api/chat/<chapter_id>[?before_id=<id>]
+    POST   /api/chat {chapter_id, message}    -> {"thread_id"}, {"delta"}..., {"done"}
+
+Secara default server hanya mendengarkan 127.0.0.1. Untuk membuka ke jaringan (LAN), set
+SKRIPSI_SERVER_TOKEN; setiap request /api/ (kecuali /api/health) lalu wajib membawa header
+"Authorization: Bearer <token>". Tanpa token, --host selain loopback ditolak.
+
+Contoh:
+    python server.py --port 8765
+    curl -N -X POST http://127.0.0.1:8765/api/chat -d '{"chapter_id": 1, "message": "Apakah sitasi saya konsisten?"}'
+"""
+import argparse
+import asyncio
+import hmac
+import ipaddress
+import json
+import os
+import queue
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import finalAI
+
+SERVER_HOST = os.getenv("SKRIPSI_SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SKRIPSI_SERVER_PORT", "8765"))
+SERVER_TOKEN = os.getenv("SKRIPSI_SERVER_TOKEN")  # token bersama; wajib jika host bukan loopback
+SERVER_POOL_SIZE = int(os.getenv("SKRIPSI_SERVER_POOL_SIZE", "4"))  # koneksi SQLite = thread query
+SERVER_BUSY_TIMEOUT_MS = 5000  # writer menunggu writer lain, bukan langsung "database is locked"
+SERVER_MAX_HEADER_BYTES = 64 * 1024
+SERVER_MAX_BODY_BYTES = 1024 * 1024
+SERVER_KEEPALIVE_SECONDS = 30
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Pool koneksi SQLite ---
+
+class DatabaseSession(finalAI.ThesisDatabase):
+    """
+    Satu koneksi SQLite di pool. Operasi data (load_progress, get_chat_thread,
+    find_similar_revisions, ...) berasal dari ThesisDatabase yang juga dipakai aplikasi Tk.
+    """
+
+    def __init__(self, db_path):
+        conn = finalAI.traced_connection(sqlite3.connect(db_path, check_same_thread=False))
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA busy_timeout = {SERVER_BUSY_TIMEOUT_MS}")
+        super().__init__(conn)
+
+
+class ConnectionPool:
+    """
+    Pool koneksi SQLite tetap berukuran `size`, dipakai dari event loop lewat
+    `await pool.run(fungsi, *args)`: fungsi(session, *args) dijalankan di thread pool
+    dengan satu sesi pinjaman; transaksi yang tertinggal di-rollback saat error.
+    """
+
+    def __init__(self, db_path=finalAI.DB_NAME, size=SERVER_POOL_SIZE):
+        self.size = size
+        self.sessions = queue.Queue()
+        first = DatabaseSession(db_path)
+        first.create_tables()  # skema dan migrasi cukup sekali, sebelum koneksi lain dibuka
+        self.sessions.put(first)
+        for _ in range(size - 1):
+            self.sessions.put(DatabaseSession(db_path))
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="db")
+
+    def _call(self, fn, args):
+        session = self.sessions.get()
+        try:
+            return fn(session, *args)
+        except BaseException:
+            session.conn.rollback()
+            raise
+        finally:
+            self.sessions.put(session)
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._call, fn, args)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        while not self.sessions.empty():
+            self.sessions.get().close()
+
+
+# --- Operasi database (dijalankan di thread pool) ---
+
+def parse_date(value, field="date"):
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise HTTPError(400, f"'{field}' harus berformat YYYY-MM-DD.")
+
+def require_chapter(db, chapter_id):
+    db.cursor.execute("SELECT chapter_name FROM chapters WHERE id = ?", (chapter_id,))
+    row = db.cursor.fetchone()
+    if row is None:
+        raise HTTPError(404, f"Bab {chapter_id} tidak ditemukan.")
+    return row[0]
+
+def chapter_dict(row):
+    return dict(zip(("id", "chapter_name", "target_date", "status"), row))
+
+def list_chapters(db):
+    db.cursor.execute(finalAI.SQL_REFRESH_CHAPTERS, (finalAI.WORKSPACE,))
+    return [chapter_dict(row) for row in db.cursor.fetchall()]
+
+def create_chapter(db, chapter_name, target_date):
+    # Keunikan dijaga indeks unik (workspace, chapter_name), jadi POST bersamaan tidak bisa
+    # sama-sama lolos seperti pada pola SELECT-lalu-INSERT.
+    try:
+        db.cursor.execute(
+            "INSERT INTO chapters (chapter_name, target_date, status, workspace) VALUES (?, ?, 'Belum Selesai', ?)",
+            (chapter_name, target_date, finalAI.WORKSPACE)
+        )
+    except sqlite3.IntegrityError:
+        db.conn.rollback()
+        raise HTTPError(409, f"Bab '{chapter_name}' sudah ada.")
+    db.conn.commit()
+    return chapter_dict((db.cursor.lastrowid, chapter_name, target_date, "Belum Selesai"))
+
+def update_chapter(db, chapter_id, changes):
+    require_chapter(db, chapter_id)
+    if changes:
+        assignments = ", ".join(f"{column} = ?" for column in changes)
+        db.cursor.execute(f"UPDATE chapters SET {assignments} WHERE id = ?", list(changes.values()) + [chapter_id])
+        db.conn.commit()
+    db.cursor.execute("SELECT id, chapter_name, target_date, status FROM chapters WHERE id = ?", (chapter_id,))
+    return chapter_dict(db.cursor.fetchone())
+
+def delete_row(db, table, row_id):
+    # Hapus satu baris chapters/consultations/revisions; anaknya ikut terhapus (ON DELETE CASCADE)
+    db.cursor.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+    if not db.cursor.rowcount:
+        db.conn.rollback()
+        raise HTTPError(404, f"Data {row_id} tidak ditemukan.")
+    db.conn.commit()
+    db.collect_attachment_garbage()
+    return {"deleted": row_id}
+
+def load_progress(db):
+    done, not_done, overdue = db.load_progress()
+    return {"done": done, "not_done": not_done, "overdue": overdue, "workspace": finalAI.WORKSPACE}
+
+def list_consultations(db, month=None):
+    if month:
+        # Range tanggal satu bulan memakai idx_consultations_date
+        year, month_number = map(int, month.split("-"))
+        end = f"{year + month_number // 12:04d}-{month_number % 12 + 1:02d}-01"
+        db.cursor.execute(finalAI.SQL_REFRESH_CONSULTATIONS_RANGE, (f"{year:04d}-{month_number:02d}-01", end))
+    else:
+        db.cursor.execute(finalAI.SQL_REFRESH_CONSULTATIONS)
+    return [dict(zip(("id", "date", "lecturer", "chapter_name"), row)) for row in db.cursor.fetchall()]
+
+def create_consultation(db, consult_date, lecturer, chapter_id, force):
+    require_chapter(db, chapter_id)
+    conflict = db.find_consultation_conflict(lecturer, consult_date)
+    if conflict and not force:
+        raise HTTPError(409, f"{conflict[1]} sudah punya jadwal pada {conflict[0]} (Bab: {conflict[2]}). "
+                             f"Kirim ulang dengan \"force\": true untuk tetap menyimpan.")
+    db.cursor.execute("INSERT INTO consultations (date, lecturer, chapter_id) VALUES (?, ?, ?)",
+                      (consult_date, lecturer, chapter_id))
+    db.conn.commit()
+    return {"id": db.cursor.lastrowid, "date": consult_date, "lecturer": lecturer, "chapter_id": chapter_id}
+
+def list_revisions(db, chapter_id=None):
+    if chapter_id is not None:
+        db.cursor.execute(finalAI.SQL_REFRESH_REVISIONS_BY_CHAPTER, (chapter_id,))
+    else:
+        db.cursor.execute(finalAI.SQL_REFRESH_REVISIONS)
+    return [dict(zip(("id", "chapter_name", "notes", "date"), row)) for row in db.cursor.fetchall()]
+
+def create_revision(db, chapter_id, notes):
+    require_chapter(db, chapter_id)
+    similar = db.find_similar_revisions(notes)
+    db.cursor.execute("INSERT INTO revisions (notes, date, chapter_id) VALUES (?, DATE('now'), ?)", (notes, chapter_id))
+    revision_id = db.cursor.lastrowid
+    db.index_revision_note(revision_id, chapter_id, notes)
+    db.conn.commit()
+    return {
+        "id": revision_id,
+        "similar": [
+            {"id": other_id, "chapter_name": name, "date": revision_date, "notes": other_notes,
+             "similarity": round(similarity, 3)}
+            for similarity, other_id, name, revision_date, other_notes in similar
+        ],
+    }
+
+def load_chat_page(db, chapter_id, before_id=None):
+    require_chapter(db, chapter_id)
+    document = db.get_latest_document()
+    thread_id = db.get_chat_thread(chapter_id, document["id"] if document else None, create=False)
+    if thread_id is None:
+        return {"thread_id": None, "messages": []}
+    rows = db.load_chat_messages(thread_id, before_id=before_id)
+    return {"thread_id": thread_id,
+            "messages": [{"id": message_id, "role": role, "content": content} for message_id, role, content in rows]}
+
+def prepare_chat(db, chapter_id, message):
+    """
+    Siapkan satu giliran chat seperti jendela chat Tk untuk thread (bab, versi dokumen
+    terbaru): kembalikan jawaban lokal (cek sitasi) atau pesan untuk Groq beserta history
+    thread. Pesan user baru disimpan bersama jawabannya (save_reply), sehingga stream yang
+    gagal atau diputus klien tidak meninggalkan pertanyaan tanpa jawaban di thread.
+    """
+    chapter_name = require_chapter(db, chapter_id)
+    document = db.get_latest_document()
+    skripsi_text = db.load_document_text(document["id"]) if document else ""
+    if not skripsi_text:
+        raise HTTPError(409, "Skripsi belum diupload.")
+    thread_id = db.get_chat_thread(chapter_id, document["id"])
+    history = [
+        {"role": role, "content": content}
+        for _, role, content in db.load_chat_messages(thread_id, limit=finalAI.CHAT_CONTEXT_MESSAGES)
+    ]
+    if finalAI.is_citation_question(message):
+        return {"thread_id": thread_id,
+                "local_reply": finalAI.format_citation_report(finalAI.check_citations(skripsi_text))}
+    chapter_text = db.get_chapter_text(document["id"], chapter_id, skripsi_text)
+    document_summary, chapter_summary = db.get_document_summaries(document["id"], chapter_id)
+    prompt = finalAI.build_chat_prompt(chapter_name, skripsi_text, message, chapter_text=chapter_text,
+                                       document_summary=document_summary, chapter_summary=chapter_summary)
+    messages = [{"role": "system", "content": "okey."}] + history + [{"role": "user", "content": prompt}]
+    return {"thread_id": thread_id, "messages": messages}
+
+def save_reply(db, thread_id, message, reply):
+    return db.add_chat_exchange(thread_id, message, reply)
+
+
+# --- HTTP di atas asyncio ---
+
+class Request:
+    def __init__(self, method, target, headers, body):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path.rstrip("/") or "/"
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Body harus JSON.")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Body harus objek JSON.")
+        return data
+
+    def int_param(self, data, name, required=True):
+        value = data.get(name)
+        if value is None and not required:
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"'{name}' harus berupa angka.")
+
+    def text_param(self, data, name):
+        value = str(data.get(name) or "").strip()
+        if not value:
+            raise HTTPError(400, f"'{name}' wajib diisi.")
+        return value
+
+
+class StreamResponse:
+    """Respons NDJSON ber-chunk; `events` adalah async generator objek JSON."""
+
+    def __init__(self, events):
+        self.events = events
+
+
+class ThesisServer:
+    """Server JSON HTTP/1.1 (keep-alive) untuk data skripsi dan chat AI."""
+
+    def __init__(self, db_path=finalAI.DB_NAME, pool_size=SERVER_POOL_SIZE, token=SERVER_TOKEN):
+        self.pool = ConnectionPool(db_path, pool_size)
+        self.token = token
+        self.ai_client = None
+        self.server = None
+        self.routes = [
+            ("GET", r"/api/health", self.health),
+            ("GET", r"/api/chapters", self.get_chapters),
+            ("POST", r"/api/chapters", self.post_chapter),
+            ("PATCH", r"/api/chapters/(\d+)", self.patch_chapter),
+            ("DELETE", r"/api/chapters/(\d+)", self.delete_handler("chapters")),
+            ("GET", r"/api/progress", self.get_progress),
+            ("GET", r"/api/consultations", self.get_consultations),
+            ("POST", r"/api/consultations", self.post_consultation),
+            ("DELETE", r"/api/consultations/(\d+)", self.delete_handler("consultations")),
+            ("GET", r"/api/revisions", self.get_revisions),
+            ("POST", r"/api/revisions", self.post_revision),
+            ("DELETE", r"/api/revisions/(\d+)", self.delete_handler("revisions")),
+            ("GET", r"/api/chat/(\d+)", self.get_chat),
+            ("POST", r"/api/chat", self.post_chat),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in self.routes]
+
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        self.server = await asyncio.start_server(self.handle_client, host, port, limit=SERVER_MAX_HEADER_BYTES)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.ai_client:
+            await self.ai_client.close()
+        self.pool.close()
+
+    # --- Handler ---
+
+    async def health(self, request):
+        return 200, {"status": "ok", "pool_size": self.pool.size}
+
+    async def get_chapters(self, request):
+        return 200, await self.pool.run(list_chapters)
+
+    async def post_chapter(self, request):
+        data = request.json()
+        chapter_name = request.text_param(data, "chapter_name")
+        target_date = parse_date(data.get("target_date"), "target_date")
+        return 201, await self.pool.run(create_chapter, chapter_name, target_date)
+
+    async def patch_chapter(self, request, chapter_id):
+        data = request.json()
+        changes = {}
+        if "status" in data:
+            if data["status"] not in ("Selesai", "Belum Selesai"):
+                raise HTTPError(400, "'status' harus 'Selesai' atau 'Belum Selesai'.")
+            changes["status"] = data["status"]
+        if "target_date" in data:
+            changes["target_date"] = parse_date(data["target_date"], "target_date")
+        return 200, await self.pool.run(update_chapter, int(chapter_id), changes)
+
+    def delete_handler(self, table):
+        async def handler(request, row_id):
+            return 200, await self.pool.run(delete_row, table, int(row_id))
+        return handler
+
+    async def get_progress(self, request):
+        return 200, await self.pool.run(load_progress)
+
+    async def get_consultations(self, request):
+        month = request.query.get("month")
+        if month and not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", month):
+            raise HTTPError(400, "'month' harus berformat YYYY-MM.")
+        return 200, await self.pool.run(list_consultations, month)
+
+    async def post_consultation(self, request):
+        data = request.json()
+        consult_date = parse_date(data.get("date"))
+        lecturer = request.text_param(data, "lecturer")
+        chapter_id = request.int_param(data, "chapter_id")
+        return 201, await self.pool.run(create_consultation, consult_date, lecturer, chapter_id,
+                                        bool(data.get("force")))
+
+    async def get_revisions(self, request):
+        chapter_id = request.int_param(request.query, "chapter_id", required=False)
+        return 200, await self.pool.run(list_revisions, chapter_id)
+
+    async def post_revision(self, request):
+        data = request.json()
+        return 201, await self.pool.run(create_revision, request.int_param(data, "chapter_id"),
+                                        request.text_param(data, "notes"))
+
+    async def get_chat(self, request, chapter_id):
+        before_id = request.int_param(request.query, "before_id", required=False)
+        return 200, await self.pool.run(load_chat_page, int(chapter_id), before_id)
+
+    async def post_chat(self, request):
+        data = request.json()
+        chapter_id = request.int_param(data, "chapter_id")
+        message = request.text_param(data, "message")
+        turn = await self.pool.run(prepare_chat, chapter_id, message)
+        if self.ai_client is None and "local_reply" not in turn:
+            self.ai_client = finalAI.AsyncGroq(api_key=finalAI.GROQ_API_KEY, max_retries=0)
+
+        async def events():
+            yield {"thread_id": turn["thread_id"]}
+            if "local_reply" in turn:
+                reply = turn["local_reply"]
+                yield {"delta": reply}
+            else:
+                parts = []
+                try:
+                    async for delta in finalAI.stream_chat_async(self.ai_client, turn["messages"]):
+                        parts.append(delta)
+                        yield {"delta": delta}
+                except Exception as e:
+                    yield {"error": f"Terjadi error saat menghubungi AI: {e}"}
+                    return
+                reply = "".join(parts) or "Tidak ada jawaban dari AI."
+            message_id = await self.pool.run(save_reply, turn["thread_id"], message, reply)
+            yield {"done": True, "message_id": message_id}
+
+        return 200, StreamResponse(events())
+
+    # --- Protokol ---
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), SERVER_KEEPALIVE_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.send_json(writer, 431, {"error": "Header terlalu besar."}, keep_alive=False)
+                    return
+                try:
+                    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                    method, target, version = request_line.split(" ", 2)
+                    headers = {}
+                    for line in header_lines:
+                        if line:
+                            key, _, value = line.partition(":")
+                            headers[key.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError("Content-Length negatif")
+                except ValueError:
+                    await self.send_json(writer, 400, {"error": "Request tidak valid."}, keep_alive=False)
+                    return
+                if length > SERVER_MAX_BODY_BYTES:
+                    await self.send_json(writer, 413, {"error": "Body terlalu besar."}, keep_alive=False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.dispatch(writer, Request(method.upper(), target, headers, body), keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def authorized(self, request):
+        if not self.token or request.path == "/api/health":
+            return True
+        # compare_digest: waktu perbandingan tidak membocorkan panjang prefiks yang cocok
+        supplied = request.headers.get("authorization", "").encode("latin-1")
+        return hmac.compare_digest(supplied, f"Bearer {self.token}".encode("utf-8"))
+
+    async def dispatch(self, writer, request, keep_alive):
+        if not self.authorized(request):
+            await self.send_json(writer, 401, {"error": "Token tidak valid."}, keep_alive)
+            return
+        allowed = False
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if not match:
+                continue
+            allowed = True
+            if method != request.method:
+                continue
+            try:
+                with finalAI.trace_span("http", f"{request.method} {pattern.pattern}"):
+                    status, payload = await handler(request, *match.groups())
+            except HTTPError as e:
+                await self.send_json(writer, e.status, {"error": str(e)}, keep_alive)
+            except Exception as e:
+                await self.send_json(writer, 500, {"error": str(e)}, keep_alive)
+            else:
+                if isinstance(payload, StreamResponse):
+                    await self.send_stream(writer, status, payload.events, keep_alive)
+                else:
+                    await self.send_json(writer, status, payload, keep_alive)
+            return
+        if allowed:
+            await self.send_json(writer, 405, {"error": "Method tidak didukung."}, keep_alive)
+        else:
+            await self.send_json(writer, 404, {"error": "Endpoint tidak ditemukan."}, keep_alive)
+
+    @staticmethod
+    def response_head(status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        lines += [f"{key}: {value}" for key, value in headers.items()]
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def send_json(self, writer, status, payload, keep_alive=True):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(self.response_head(status, {
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": len(data),
+        }, keep_alive) + data)
+        await writer.drain()
+
+    async def send_stream(self, writer, status, events, keep_alive=True):
+        writer.write(self.response_head(status, {
+            "Content-Type": "application/x-ndjson; charset=utf-8",
+            "Transfer-Encoding": "chunked",
+            "Cache-Control": "no-cache",
+        }, keep_alive))
+        def write_event(event):
+            line = json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n"
+            writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+
+        try:
+            async for event in events:
+                write_event(event)
+                await writer.drain()  # klien yang terputus menghentikan stream (dan request Groq)
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # Header 200 sudah terkirim: error dilaporkan sebagai baris terakhir stream
+            write_event({"error": str(e)})
+        finally:
+            await events.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def serve(host, port, db_path, pool_size):
+    server = ThesisServer(db_path, pool_size)
+    port = await server.start(host, port)
+    print(f"Server API skripsi berjalan di http://{host}:{port} (pool {pool_size} koneksi, db {db_path})")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server JSON HTTP API Aplikasi Manajemen Skripsi")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--db", default=finalAI.DB_NAME)
+    parser.add_argument("--pool-size", type=int, default=SERVER_POOL_SIZE)
+    args = parser.parse_args(argv)
+    if not SERVER_TOKEN and not is_loopback(args.host):
+        # API tidak punya akun pengguna; tanpa token siapa pun di jaringan bisa membaca/menghapus data
+        parser.error(f"--host {args.host} membuka API ke jaringan; set SKRIPSI_SERVER_TOKEN terlebih dahulu.")
+    try:
+        asyncio.run(serve(args.host, args.port, args.db, args.pool_size))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())